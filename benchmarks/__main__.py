@@ -0,0 +1,137 @@
+"""Command line for the benchmarks: ``python -m benchmarks run|compare|list|sessions``"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks import harness, suite  # noqa: F401  (importing suite registers the benchmarks)
+
+LATEST = harness.RESULTS_DIR / "latest.json"
+BASELINE = harness.RESULTS_DIR / "baseline.json"
+
+
+def _run(args: argparse.Namespace) -> int:
+    benchmarks = harness.select(args.k, quick=args.quick)
+    if not benchmarks:
+        print("No benchmarks match", file=sys.stderr)
+        return 2
+    min_time, repeat, max_time = (0.05, 3, 1.0) if args.quick else (args.min_time, args.repeat, args.max_time)
+
+    def progress(timing: harness.Timing) -> None:
+        print(f"{timing.name}: {harness.format_seconds(timing.median)}", file=sys.stderr, flush=True)
+
+    def skipped(bench: harness.Benchmark, reason: str) -> None:
+        print(f"{bench.name}: skipped ({reason})", file=sys.stderr, flush=True)
+
+    timings = list(harness.run(benchmarks, min_time, repeat, max_time, progress, skipped))
+    path = harness.save_results(timings, BASELINE if args.save_baseline else args.output)
+    print(harness.format_timings(timings))
+    print(f"\nSaved {len(timings)} results to {path}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    comparisons = harness.compare(
+        harness.load_results(args.baseline), harness.load_results(args.current), args.threshold, args.stat
+    )
+    print(harness.format_comparison(comparisons))
+    regressions = [c.name for c in comparisons if c.status == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions over {args.threshold:.0%}")
+    return 0
+
+
+def _sessions(args: argparse.Namespace) -> int:
+    from benchmarks import sessions
+
+    modes = sessions.SESSION_MODES if args.mode == "both" else (args.mode,)
+    reports = []
+    for mode in modes:
+        for count in args.sessions:
+            report = sessions.run(count, args.iterations, mode, args.initial, args.seed, args.think_ms / 1000)
+            print(sessions.format_report([report]) + "\n", flush=True)
+            reports.append(report)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps([report.to_dict() for report in reports], indent=2) + "\n")
+        print(f"Saved {len(reports)} runs to {args.output}")
+    failed = [report for report in reports if report.integrity_errors]
+    if failed:
+        print(f"Vault integrity errors in {len(failed)} of {len(reports)} runs")
+        return 1
+    return 0
+
+
+def _sessions_list(value: str) -> List[int]:
+    return [int(count) for count in value.split(",")]
+
+
+def _list(args: argparse.Namespace) -> int:
+    for bench in harness.select(args.k, quick=args.quick):
+        print(f"{bench.name}{' (slow)' if bench.slow else ''}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser with run, compare, sessions and list subcommands."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Riff Raff benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    def add_selection(command: argparse.ArgumentParser) -> None:
+        command.add_argument("-k", action="append", default=[], metavar="GLOB",
+                             help="Only benchmarks matching the glob, e.g. 'vault.*' (repeatable)")
+        command.add_argument("--quick", action="store_true",
+                             help="Skip slow benchmarks (1M-entry vault) and take fewer, shorter samples")
+
+    command = commands.add_parser("run", help="Time the benchmarks and save the results as JSON")
+    add_selection(command)
+    command.add_argument("-o", "--output", type=Path, default=LATEST, help="Results file (default: %(default)s)")
+    command.add_argument("--save-baseline", action="store_true", help=f"Write the results to {BASELINE} instead")
+    command.add_argument("--min-time", type=float, default=0.2, help="Seconds per sample (default: %(default)s)")
+    command.add_argument("--repeat", type=int, default=5, help="Samples per benchmark (default: %(default)s)")
+    command.add_argument("--max-time", type=float, default=5.0,
+                         help="Seconds of samples before slow benchmarks stop early (default: %(default)s)")
+    command.set_defaults(handler=_run)
+
+    command = commands.add_parser("compare", help="Flag regressions of a run against a baseline")
+    command.add_argument("current", nargs="?", type=Path, default=LATEST, help="Results file (default: %(default)s)")
+    command.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline file (default: %(default)s)")
+    command.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                         help="Slowdown flagged as a regression, as a fraction (default: %(default)s)")
+    command.add_argument("--stat", choices=harness.STATISTICS, default="min",
+                         help="Statistic to compare (default: %(default)s)")
+    command.set_defaults(handler=_compare)
+
+    command = commands.add_parser(
+        "sessions", help="Simulate concurrent app sessions; report latency and vault integrity"
+    )
+    command.add_argument("--sessions", type=_sessions_list, default=[1, 8, 32], metavar="N[,N...]",
+                         help="Concurrent session counts to run (default: 1,8,32)")
+    command.add_argument("--iterations", type=int, default=20, help="Clicks per session (default: %(default)s)")
+    command.add_argument("--mode", choices=("thread", "process", "both"), default="thread",
+                         help="Run sessions as threads, processes or both (default: %(default)s)")
+    command.add_argument("--initial", type=int, default=100, help="Vault entries before the run (default: %(default)s)")
+    command.add_argument("--think-ms", type=float, default=0.0, help="Pause between a session's clicks")
+    command.add_argument("--seed", type=int, default=0, help="Seed of the sessions' settings")
+    command.add_argument("-o", "--output", type=Path, help="Also save the reports as JSON")
+    command.set_defaults(handler=_sessions)
+
+    command = commands.add_parser("list", help="List the benchmarks")
+    add_selection(command)
+    command.set_defaults(handler=_list)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks command line; returns the exit status."""
+    args = build_parser().parse_args(argv)
+    status: int = args.handler(args)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""Benchmark registry, timer, result files and baseline comparison"""
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_THRESHOLD = 0.10  # Flag a benchmark 10% slower than its baseline
+STATISTICS = ("min", "median", "mean")
+
+# A setup function prepares state and returns the call to time
+Setup = Callable[[], Callable[[], Any]]
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when the benchmark cannot run here (e.g. a missing dependency)."""
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """One registered benchmark."""
+
+    name: str
+    setup: Setup
+    group: str
+    slow: bool = False  # Skipped by quick runs
+
+
+_REGISTRY: Dict[str, Benchmark] = {}
+
+
+def register(name: str, setup: Setup, group: str, slow: bool = False) -> None:
+    """Add a benchmark (``setup`` returns the zero-argument call to time).
+
+    Raises:
+        ValueError: If the name is already registered
+    """
+    if name in _REGISTRY:
+        raise ValueError(f"Invalid benchmark name: {name}. Must be unique")
+    _REGISTRY[name] = Benchmark(name, setup, group, slow)
+
+
+def benchmark(name: str, group: str, slow: bool = False) -> Callable[[Setup], Setup]:
+    """Decorator form of ``register``."""
+    def decorate(setup: Setup) -> Setup:
+        register(name, setup, group, slow)
+        return setup
+
+    return decorate
+
+
+def select(patterns: Sequence[str] = (), quick: bool = False) -> List[Benchmark]:
+    """Registered benchmarks matching any glob pattern (all if none), in order.
+
+    Brackets match literally, so ``vault.*[1000]`` selects the 1k-entry vault.
+    """
+    patterns = [pattern.replace("[", "[[]") for pattern in patterns]
+    return [
+        bench for bench in _REGISTRY.values()
+        if (not patterns or any(fnmatch.fnmatchcase(bench.name, p) for p in patterns))
+        and not (quick and bench.slow)
+    ]
+
+
+@dataclass
+class Timing:
+    """Per-call seconds of one benchmark."""
+
+    name: str
+    group: str
+    loops: int  # Calls per sample
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update({stat: getattr(self, stat) for stat in STATISTICS})
+        return data
+
+
+def measure(
+    call: Callable[[], Any],
+    min_time: float = 0.2,
+    repeat: int = 5,
+    max_time: float = 5.0
+) -> Tuple[int, List[float]]:
+    """Time ``call`` like ``timeit``: calibrate the loop count, then sample.
+
+    The loop count grows until one sample takes ``min_time``; calls slower
+    than ``max_time / repeat`` get fewer samples, so huge inputs stay
+    affordable.
+
+    Returns:
+        Calls per sample and the per-call seconds of each sample
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            call()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        # Jump close to the target, growing at least 2x and at most 100x a step
+        loops = min(loops * 100, max(loops * 2, int(loops * min_time / max(elapsed, 1e-9))))
+
+    samples = [elapsed / loops]  # The calibration run counts
+    for _ in range(min(repeat, max(1, int(max_time / elapsed))) - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            call()
+        samples.append((time.perf_counter() - start) / loops)
+    return loops, samples
+
+
+def run(
+    benchmarks: Sequence[Benchmark],
+    min_time: float = 0.2,
+    repeat: int = 5,
+    max_time: float = 5.0,
+    progress: Optional[Callable[[Timing], None]] = None,
+    skipped: Optional[Callable[[Benchmark, str], None]] = None
+) -> Iterator[Timing]:
+    """Set up and time each benchmark in turn (see ``measure`` for the timing arguments).
+
+    Benchmarks whose setup raises ``SkipBenchmark`` are passed to ``skipped``
+    with the reason and left out of the results.
+    """
+    for bench in benchmarks:
+        try:
+            call = bench.setup()
+        except SkipBenchmark as e:
+            if skipped is not None:
+                skipped(bench, str(e))
+            continue
+        loops, samples = measure(call, min_time, repeat, max_time)
+        timing = Timing(bench.name, bench.group, loops, samples)
+        if progress is not None:
+            progress(timing)
+        yield timing
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=RESULTS_DIR.parent
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def save_results(timings: Sequence[Timing], path: Path) -> Path:
+    """Write timings and the machine they ran on to a JSON file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "argv": sys.argv[1:],
+        "benchmarks": {timing.name: timing.to_dict() for timing in timings},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    return path
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Benchmark name -> timing dict from a results file."""
+    results: Dict[str, Dict[str, Any]] = json.loads(Path(path).read_text())["benchmarks"]
+    return results
+
+
+@dataclass
+class Comparison:
+    """One benchmark in the baseline, the current run, or both."""
+
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+    threshold: float
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.baseline is None or self.current is None or self.baseline <= 0:
+            return None
+        return self.current / self.baseline
+
+    @property
+    def status(self) -> str:
+        if self.baseline is None:
+            return "new"
+        if self.current is None:
+            return "missing"
+        if self.ratio is None:
+            return "ok"
+        if self.ratio > 1 + self.threshold:
+            return "REGRESSION"
+        if self.ratio < 1 / (1 + self.threshold):
+            return "faster"
+        return "ok"
+
+
+def compare(
+    baseline: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    stat: str = "min"
+) -> List[Comparison]:
+    """Compare two result sets benchmark by benchmark.
+
+    Args:
+        baseline: Timings from ``load_results``
+        current: Timings from ``load_results``
+        threshold: Relative slowdown flagged as a regression (0.1 = 10%)
+        stat: Statistic to compare ("min", "median" or "mean")
+
+    Raises:
+        ValueError: If stat or threshold is invalid
+    """
+    if stat not in STATISTICS:
+        raise ValueError(f"Invalid stat: {stat}. Must be one of {', '.join(STATISTICS)}")
+    if threshold < 0:
+        raise ValueError(f"Invalid threshold: {threshold}. Must be at least 0")
+    names = list(baseline) + [name for name in current if name not in baseline]
+    return [
+        Comparison(
+            name,
+            baseline[name][stat] if name in baseline else None,
+            current[name][stat] if name in current else None,
+            threshold,
+        )
+        for name in names
+    ]
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    """Seconds with a readable unit (ns to s)."""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_timings(timings: Sequence[Timing]) -> str:
+    """Table of per-call times."""
+    width = max([len(timing.name) for timing in timings] + [9])
+    lines = [f"{'benchmark':<{width}} {'min':>10} {'median':>10} {'loops':>8} {'samples':>8}"]
+    for timing in timings:
+        lines.append(
+            f"{timing.name:<{width}} {format_seconds(timing.min):>10} {format_seconds(timing.median):>10} "
+            f"{timing.loops:>8} {len(timing.samples):>8}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(comparisons: Sequence[Comparison]) -> str:
+    """Table of baseline vs current time per benchmark."""
+    width = max([len(c.name) for c in comparisons] + [9])
+    lines = [f"{'benchmark':<{width}} {'baseline':>10} {'current':>10} {'change':>8}  status"]
+    for c in comparisons:
+        change = f"{(c.ratio - 1) * 100:+.1f}%" if c.ratio is not None else "-"
+        lines.append(
+            f"{c.name:<{width}} {format_seconds(c.baseline):>10} {format_seconds(c.current):>10} "
+            f"{change:>8}  {c.status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,276 @@
+"""Load harness: many simulated app sessions against the real modules
+
+Each session repeats what one user of ``streamlit_app.py`` does per
+click: generate, append to its history, save to the vault
+(``append_lyrics``, like the app), load the vault and export it as JSON
+and text.
+Sessions run as threads (like Streamlit's script threads in one server)
+or as processes (like several servers on one box) and all share one vault
+file, so races in ``vault_manager`` show up as integrity errors:
+
+- torn reads: a load that hit a half-written vault file
+- lost updates: entries whose save completed but that are missing from
+  the final vault (another session's save overwrote them)
+- duplicates, and a final vault that no longer parses
+
+Every saved entry carries a ``load_test`` tag (``s<session>-i<iteration>``)
+so the final vault can be checked entry by entry.
+"""
+import functools
+import json
+import math
+import random
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.suite import PERSONAS, PERSONAS_DIR, THEMES, vault_entries
+from src.lyrics.generator import MODES, LyricGenerator
+from src.lyrics.history import GenerationHistory, HistoryEntry
+from vault_manager import append_lyrics, export_json, export_text, load_lyrics, save_lyrics
+
+OPERATIONS = ("generate", "history", "save", "load", "export")
+SESSION_MODES = ("thread", "process")
+DEFAULT_SESSIONS = (1, 8, 32)
+DEFAULT_ITERATIONS = 20
+DEFAULT_INITIAL = 100  # Vault entries before the run
+PERCENTILES = (50, 95, 99)
+
+_generator: Optional[LyricGenerator] = None  # One per process, shared by its sessions like the app's
+
+
+def _shared_generator() -> LyricGenerator:
+    global _generator
+    if _generator is None:
+        _generator = LyricGenerator(PERSONAS_DIR)
+    return _generator
+
+
+@dataclass
+class SessionResult:
+    """What one session did."""
+
+    session: int
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: {op: [] for op in OPERATIONS})
+    errors: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(OPERATIONS, 0))
+    torn_reads: int = 0
+    saved: List[str] = field(default_factory=list)  # Tags of entries whose save completed
+    completed: int = 0  # Iterations that ran every step
+
+
+def run_session(
+    session: int,
+    iterations: int,
+    vault_path: str,
+    spill_dir: str,
+    seed: int = 0,
+    think: float = 0.0
+) -> SessionResult:
+    """Run one session's clicks (top-level, so process pools can pickle it)."""
+    generator = _shared_generator()
+    history = GenerationHistory(Path(spill_dir) / f"session-{session}.jsonl")
+    rng = random.Random(seed * 100_003 + session)
+    result = SessionResult(session)
+
+    def step(op: str, call: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            value = call()
+        except json.JSONDecodeError:
+            result.torn_reads += 1
+            result.errors[op] += 1
+            raise
+        except Exception:
+            result.errors[op] += 1
+            raise
+        result.latencies[op].append(time.perf_counter() - start)
+        return value
+
+    def export(lyrics: Any) -> None:
+        export_json(lyrics)
+        export_text(lyrics)
+
+    for i in range(iterations):
+        tag = f"s{session}-i{i}"
+        persona: str = rng.choice(PERSONAS)
+        theme: str = rng.choice(THEMES)
+        mode: str = rng.choice(MODES)
+        flex_level = rng.randint(1, 10)
+        nonsense = rng.randint(0, 10)
+
+        try:
+            text = step("generate", functools.partial(
+                generator.generate, persona, theme, mode, flex_level, nonsense, seed=rng.randrange(2 ** 31)
+            ))
+            generation: Dict[str, Any] = {
+                'text': text, 'persona': persona, 'theme': theme, 'mode': mode,
+                'flex_level': flex_level, 'nonsense': nonsense, 'timestamp': datetime.now().isoformat(),
+            }
+            step("history", functools.partial(history.append, HistoryEntry.from_generation(generation)))
+            entry = {**generation, 'timestamp': datetime.now().isoformat(), 'load_test': tag}
+            step("save", functools.partial(append_lyrics, entry, vault_path))
+            result.saved.append(tag)
+            lyrics = step("load", functools.partial(load_lyrics, vault_path))
+            step("export", functools.partial(export, lyrics))
+        except Exception:
+            continue  # Counted by step; the user clicks again
+        result.completed += 1
+        if think:
+            time.sleep(think)
+    history.clear()
+    return result
+
+
+@dataclass
+class LoadReport:
+    """One run of ``sessions`` concurrent sessions."""
+
+    mode: str
+    sessions: int
+    iterations: int
+    elapsed: float
+    latencies: Dict[str, List[float]]
+    errors: Dict[str, int]
+    completed: int
+    saves: int  # Saves that completed
+    torn_reads: int
+    lost_updates: int  # Completed saves missing from the final vault
+    seed_entries_lost: int  # Pre-run entries missing from the final vault
+    duplicates: int
+    final_valid: bool  # The final vault parses as a list
+    final_size: int
+
+    @property
+    def throughput(self) -> float:
+        """Completed session iterations (clicks through every step) per second."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def integrity_errors(self) -> int:
+        return (
+            self.torn_reads + self.lost_updates + self.seed_entries_lost + self.duplicates
+            + (0 if self.final_valid else 1)
+        )
+
+    def percentile(self, op: str, q: float) -> float:
+        """Latency percentile of one operation in milliseconds (nearest rank)."""
+        values = sorted(self.latencies[op])
+        if not values:
+            return float("nan")
+        rank = max(1, math.ceil(len(values) * q / 100))
+        return values[rank - 1] * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: value for name, value in asdict(self).items() if name != "latencies"}
+        data["throughput"] = self.throughput
+        data["integrity_errors"] = self.integrity_errors
+        data["operations"] = {
+            op: {
+                "count": len(self.latencies[op]),
+                "errors": self.errors[op],
+                **{f"p{q}_ms": self.percentile(op, q) for q in PERCENTILES},
+            }
+            for op in OPERATIONS
+        }
+        return data
+
+
+def _executor(mode: str, sessions: int) -> Executor:
+    if mode not in SESSION_MODES:
+        raise ValueError(f"Invalid mode: {mode}. Must be one of {', '.join(SESSION_MODES)}")
+    return ThreadPoolExecutor(sessions) if mode == "thread" else ProcessPoolExecutor(sessions)
+
+
+def run(
+    sessions: int,
+    iterations: int = DEFAULT_ITERATIONS,
+    mode: str = "thread",
+    initial: int = DEFAULT_INITIAL,
+    seed: int = 0,
+    think: float = 0.0,
+    work_dir: Optional[str] = None
+) -> LoadReport:
+    """Run ``sessions`` concurrent sessions on a fresh vault and check it afterwards.
+
+    Args:
+        sessions: Concurrent sessions
+        iterations: Clicks per session
+        mode: "thread" or "process"
+        initial: Entries in the vault before the run
+        seed: Seed of the sessions' settings
+        think: Seconds each session waits between clicks
+        work_dir: Where the vault and history spills go (default: a temporary directory)
+
+    Raises:
+        ValueError: If mode is invalid or sessions is not positive
+    """
+    if sessions < 1:
+        raise ValueError(f"Invalid sessions: {sessions}. Must be at least 1")
+    with tempfile.TemporaryDirectory(prefix="riff-raff-sessions-", dir=work_dir) as tmp_dir:
+        vault_path = str(Path(tmp_dir) / "vault.json")
+        seeded = vault_entries(initial)
+        save_lyrics(seeded, vault_path)
+
+        with _executor(mode, sessions) as pool:
+            start = time.perf_counter()
+            futures = [
+                pool.submit(run_session, session, iterations, vault_path, tmp_dir, seed, think)
+                for session in range(sessions)
+            ]
+            results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+
+        try:
+            final = load_lyrics(vault_path)
+            final_valid = isinstance(final, list)
+        except json.JSONDecodeError:
+            final, final_valid = [], False
+    final = final if final_valid else []
+
+    tags = [entry.get('load_test') for entry in final if isinstance(entry, dict)]
+    present = set(tags) - {None}
+    saved = [tag for result in results for tag in result.saved]
+    return LoadReport(
+        mode=mode,
+        sessions=sessions,
+        iterations=iterations,
+        elapsed=elapsed,
+        latencies={op: [x for result in results for x in result.latencies[op]] for op in OPERATIONS},
+        errors={op: sum(result.errors[op] for result in results) for op in OPERATIONS},
+        completed=sum(result.completed for result in results),
+        saves=len(saved),
+        torn_reads=sum(result.torn_reads for result in results),
+        lost_updates=sum(tag not in present for tag in saved),
+        seed_entries_lost=max(0, initial - tags.count(None)) if final_valid else initial,
+        duplicates=len(tags) - len(present) - tags.count(None),
+        final_valid=final_valid,
+        final_size=len(final),
+    )
+
+
+def format_report(reports: Sequence[LoadReport]) -> str:
+    """Per-operation latency table and integrity summary of each run."""
+    lines = []
+    for report in reports:
+        lines.append(
+            f"{report.sessions} {report.mode} session(s) x {report.iterations} clicks: "
+            f"{report.throughput:.1f} clicks/s over {report.elapsed:.2f}s"
+        )
+        lines.append(f"  {'operation':<10} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for op in OPERATIONS:
+            lines.append(
+                f"  {op:<10} {len(report.latencies[op]):>7} {report.errors[op]:>7} "
+                + " ".join(f"{report.percentile(op, q):>9.2f}" for q in PERCENTILES)
+            )
+        lines.append(
+            f"  vault: {report.saves} saves, {report.final_size} entries at the end; "
+            f"torn reads {report.torn_reads}, lost updates {report.lost_updates}, "
+            f"seed entries lost {report.seed_entries_lost}, duplicates {report.duplicates}, "
+            f"final file {'ok' if report.final_valid else 'CORRUPT'}"
+        )
+        lines.append("")
+    return "\n".join(lines).rstrip()
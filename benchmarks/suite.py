@@ -0,0 +1,211 @@
+"""The benchmarks: generation, personas, vault, MIDI and the FX chain
+
+Each benchmark's setup builds its inputs outside the timed call. Vault
+benchmarks run at ``VAULT_SIZES`` entries; the largest size is marked
+slow and skipped by ``--quick`` runs. Heavy dependencies (mido, numpy and
+the FX chain) are imported by the setups that need them.
+"""
+import contextlib
+import io
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.harness import SkipBenchmark, benchmark, register
+from src.lyrics.generator import MODES, GenerationRequest, LyricGenerator
+from src.personas.vocab_loader import PersonaVocabLoader
+from vault_manager import load_lyrics, save_lyrics
+
+ROOT = Path(__file__).resolve().parent.parent
+PERSONAS_DIR = str(ROOT / "personas")
+PERSONAS = ("Neon Alien", "Beach Riff", "Snakeskin Tycoon", "Retro Arcade Savage")
+THEMES = ("Fashion", "Flexing", "Snacks", "Sci-Fi")
+BATCH_SIZE = 100
+VAULT_SIZES = (1_000, 100_000, 1_000_000)
+SLOW_VAULT_SIZE = 1_000_000
+MIDI_BARS = (4, 64)
+FX_SECONDS = 5.0
+FX_SAMPLE_RATE = 44100
+
+_tmp = tempfile.TemporaryDirectory(prefix="riff-raff-bench-")  # Removed at exit
+
+
+def _scratch(name: str) -> str:
+    return str(Path(_tmp.name) / name)
+
+
+# Generation
+
+
+@benchmark("lyrics.generate_bars", group="generation")
+def _generate_bars() -> Callable[[], Any]:
+    generator = LyricGenerator(PERSONAS_DIR)
+    generator.generate_bars("Neon Alien", "Fashion", seed=1)  # Warm the persona cache
+    return lambda: generator.generate_bars("Neon Alien", "Fashion", 9, 9, seed=1)
+
+
+@benchmark("lyrics.generate_hook", group="generation")
+def _generate_hook() -> Callable[[], Any]:
+    generator = LyricGenerator(PERSONAS_DIR)
+    return lambda: generator.generate_hook("Beach Riff", "Snacks", 9, 9, seed=1)
+
+
+@benchmark(f"lyrics.generate_batch[{BATCH_SIZE}]", group="generation")
+def _generate_batch() -> Callable[[], Any]:
+    generator = LyricGenerator(PERSONAS_DIR)
+    requests = [
+        GenerationRequest(PERSONAS[i % 4], THEMES[i % 4], MODES[i % 2], 9, 9, seed=i)
+        for i in range(BATCH_SIZE)
+    ]
+    generator.generate_batch(requests)
+    return lambda: generator.generate_batch(requests)
+
+
+# Personas
+
+
+@benchmark("personas.load_persona[cold]", group="personas")
+def _load_persona_cold() -> Callable[[], Any]:
+    return lambda: PersonaVocabLoader(PERSONAS_DIR).load_persona("Neon Alien")
+
+
+@benchmark("personas.load_persona[warm]", group="personas")
+def _load_persona_warm() -> Callable[[], Any]:
+    loader = PersonaVocabLoader(PERSONAS_DIR)
+    loader.load_persona("Neon Alien")
+    return lambda: loader.load_persona("Neon Alien")
+
+
+# Vault
+
+
+def vault_entries(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``count`` vault entries shaped like the app's, cheap to build at 1M."""
+    rng = random.Random(seed)
+    generator = LyricGenerator(PERSONAS_DIR)
+    texts = [
+        generator.generate(PERSONAS[i % 4], THEMES[i % 4], MODES[i % 2], seed=i)
+        for i in range(min(count, 256))
+    ]
+    return [
+        {
+            'text': texts[i % len(texts)],
+            'persona': PERSONAS[i % 4],
+            'theme': THEMES[rng.randrange(4)],
+            'mode': MODES[i % 2],
+            'flex_level': rng.randint(1, 10),
+            'nonsense': rng.randint(0, 10),
+            'timestamp': f"2024-01-01T00:00:{i % 60:02d}.{i:06d}",
+        }
+        for i in range(count)
+    ]
+
+
+def query_vault(lyrics: List[Dict[str, Any]], persona: str, text: str) -> List[Dict[str, Any]]:
+    """The filter a vault search does: one persona, case-insensitive text match."""
+    needle = text.lower()
+    return [entry for entry in lyrics if entry['persona'] == persona and needle in entry['text'].lower()]
+
+
+def _register_vault(size: int) -> None:
+    slow = size >= SLOW_VAULT_SIZE
+    entries: List[Dict[str, Any]] = []
+    path = _scratch(f"vault_{size}.json")
+
+    def prepare() -> None:
+        # Shared by the three benchmarks of this size; built on first use
+        if not entries:
+            entries.extend(vault_entries(size))
+            save_lyrics(entries, path)
+
+    def save() -> Callable[[], Any]:
+        prepare()
+        target = _scratch(f"vault_{size}_save.json")
+        return lambda: save_lyrics(entries, target)
+
+    def load() -> Callable[[], Any]:
+        prepare()
+        return lambda: load_lyrics(path)
+
+    def query() -> Callable[[], Any]:
+        prepare()
+        return lambda: query_vault(entries, "Neon Alien", "drip")
+
+    register(f"vault.save[{size}]", save, group="vault", slow=slow)
+    register(f"vault.load[{size}]", load, group="vault", slow=slow)
+    register(f"vault.query[{size}]", query, group="vault", slow=slow)
+
+
+for _size in VAULT_SIZES:
+    _register_vault(_size)
+
+
+# MIDI
+
+
+def _register_midi(bars: int) -> None:
+    def setup() -> Callable[[], Any]:
+        from midi_generator import MIDO_AVAILABLE, generate_midi
+
+        if not MIDO_AVAILABLE:
+            raise SkipBenchmark("needs mido installed (pip install mido)")
+        lyrics = LyricGenerator(PERSONAS_DIR).generate_bars("Neon Alien", "Fashion", seed=1, num_bars=bars)
+        path = _scratch(f"bars_{bars}.mid")
+
+        def render() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):  # generate_midi prints the path
+                generate_midi(lyrics, path)
+
+        return render
+
+    register(f"midi.generate_midi[{bars} bars]", setup, group="midi")
+
+
+for _bars in MIDI_BARS:
+    _register_midi(_bars)
+
+
+# FX chain
+
+
+def synthetic_take(seconds: float = FX_SECONDS, sample_rate: int = FX_SAMPLE_RATE):
+    """A sung vowel with vibrato (mono float32), like the test suite's take."""
+    import numpy as np
+
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    f0 = 220.0 * 2 ** (0.3 * np.sin(2 * np.pi * 5 * t) / 12)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    y = sum(np.sin(k * phase) / k for k in range(1, 6))
+    return (0.3 * y * np.hanning(t.size)).astype(np.float32)
+
+
+def _fx(**options: Any):
+    from src.fx.pipeline import HookFX
+
+    return HookFX(sample_rate=FX_SAMPLE_RATE, master=True, cache_dir=None, **options)
+
+
+@benchmark(f"fx.chain[{FX_SECONDS:g}s]", group="fx")
+def _fx_chain() -> Callable[[], Any]:
+    fx, y = _fx(), synthetic_take()
+    return lambda: fx.process(y)
+
+
+def _register_fx_stage(stage: str) -> None:
+    def setup() -> Callable[[], Any]:
+        import numpy as np
+
+        fx, y = _fx(), synthetic_take()
+
+        def render():
+            node = fx.build_node(stage)
+            return np.concatenate([node.process(y), node.flush()])
+
+        return render
+
+    register(f"fx.stage.{stage}[{FX_SECONDS:g}s]", setup, group="fx")
+
+
+for _stage in ("normalize", "pitch", "double", "reverb", "master"):
+    _register_fx_stage(_stage)
@@ -1,52 +1,70 @@
 # Melody/MIDI creation from lyrics
 """MIDI generation from lyrics with simple beat patterns."""
+import importlib.util
 import random
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Mapping, Optional, Sequence
 
-try:
-    import mido
-    from mido import Message, MidiFile, MidiTrack
-    MIDO_AVAILABLE = True
-except ImportError:
-    MIDO_AVAILABLE = False
-    print("Warning: mido not installed. MIDI generation will be simulated.")
+from src.metrics import timed
+from src.profiling import profiled
 
+if TYPE_CHECKING:
+    from mido import MidiTrack
 
-def get_note_from_word(word: str, base_note: int = 60) -> int:
+# mido is imported on first use, so text-only callers never load it
+MIDO_AVAILABLE = importlib.util.find_spec("mido") is not None
+
+
+def get_note_from_word(word: str, base_note: int = 60, scale: Optional[Sequence[int]] = None) -> int:
     """Generate a MIDI note number based on a word.
 
     Args:
         word: Input word to generate note from
         base_note: Base MIDI note (default: 60 = Middle C)
+        scale: Optional semitone offsets above ``base_note`` to pick from
+            (e.g. a take's key); defaults to all 12 semitones
 
     Returns:
         MIDI note number (0-127)
     """
     # Simple hash-based note generation
     hash_val = sum(ord(c) for c in word.lower())
+    if scale:
+        return base_note + scale[hash_val % len(scale)]
     offset = hash_val % 12  # Stay within one octave
     return base_note + offset
 
 
-def create_simple_beat(tempo: int = 120, num_bars: int = 4) -> Optional[MidiTrack]:
+def create_simple_beat(
+    tempo: float = 120,
+    num_bars: int = 4,
+    pattern: Optional[Mapping[int, Sequence[int]]] = None
+) -> Optional["MidiTrack"]:
     """Create a simple drum/beat track.
 
     Args:
         tempo: Tempo in BPM
         num_bars: Number of bars to generate
+        pattern: Optional step pattern mapping drum note to per-step velocities
+            (0 = rest), e.g. from ``Groove.beat_pattern()``. Defaults to a
+            basic kick/snare/hi-hat 4/4 beat.
 
     Returns:
         MIDI track with drum pattern, or None if mido not available
     """
     if not MIDO_AVAILABLE:
         return None
+    from mido import Message, MetaMessage, MidiTrack
 
     track = MidiTrack()
 
     # Set tempo (microseconds per beat)
     tempo_value = int(60000000 / tempo)
-    track.append(mido.MetaMessage('set_tempo', tempo=tempo_value))
+    track.append(MetaMessage('set_tempo', tempo=tempo_value))
+
+    if pattern is not None:
+        _append_step_pattern(track, pattern, num_bars)
+        return track
 
     # Simple 4/4 beat pattern
     # MIDI channel 9 (index 10) is reserved for drums
@@ -58,8 +76,9 @@ def create_simple_beat(tempo: int = 120, num_bars: int = 4) -> Optional[MidiTrac
     ticks_per_bar = ticks_per_beat * 4
 
     for bar in range(num_bars):
-        # Beat 1: Kick + Hi-hat
-        track.append(Message('note_on', channel=9, note=kick, velocity=100, time=0))
+        # Beat 1: Kick + Hi-hat (after the rest of the previous bar's beat 4)
+        bar_gap = 0 if bar == 0 else ticks_per_beat - ticks_per_beat // 4
+        track.append(Message('note_on', channel=9, note=kick, velocity=100, time=bar_gap))
         track.append(Message('note_on', channel=9, note=hihat, velocity=80, time=0))
         track.append(Message('note_off', channel=9, note=kick, velocity=0, time=ticks_per_beat // 4))
         track.append(Message('note_off', channel=9, note=hihat, velocity=0, time=0))
@@ -85,11 +104,53 @@ def create_simple_beat(tempo: int = 120, num_bars: int = 4) -> Optional[MidiTrac
     return track
 
 
+def _append_step_pattern(
+    track: "MidiTrack",
+    pattern: Mapping[int, Sequence[int]],
+    num_bars: int,
+    ticks_per_beat: int = 480
+) -> None:
+    """Append a repeating one-bar step pattern to a drum track.
+
+    Args:
+        track: Track to append to
+        pattern: Mapping of drum note to per-step velocities (0 = rest)
+        num_bars: Number of bars to generate
+        ticks_per_beat: MIDI resolution
+    """
+    from mido import Message
+
+    num_steps = max((len(steps) for steps in pattern.values()), default=16)
+    step_ticks = ticks_per_beat * 4 // num_steps
+    pending = 0  # Ticks since the last message
+
+    for _ in range(num_bars):
+        for step in range(num_steps):
+            hits = [
+                (note, steps[step]) for note, steps in pattern.items()
+                if step < len(steps) and steps[step] > 0
+            ]
+            if not hits:
+                pending += step_ticks
+                continue
+            for i, (note, velocity) in enumerate(hits):
+                track.append(Message('note_on', channel=9, note=note, velocity=min(int(velocity), 127),
+                                     time=pending if i == 0 else 0))
+            for i, (note, _) in enumerate(hits):
+                track.append(Message('note_off', channel=9, note=note, velocity=0,
+                                     time=step_ticks if i == 0 else 0))
+            pending = 0
+
+
+@timed("midi.generate_midi")
+@profiled("midi.generate_midi")
 def generate_midi(
     lyrics: str,
     output_path: str = "output.mid",
-    tempo: int = 120,
-    base_note: int = 60
+    tempo: float = 120,
+    base_note: int = 60,
+    pattern: Optional[Mapping[int, Sequence[int]]] = None,
+    scale: Optional[Sequence[int]] = None
 ) -> str:
     """Generate MIDI file from lyrics.
 
@@ -98,6 +159,8 @@ def generate_midi(
         output_path: Path to save the MIDI file
         tempo: Tempo in BPM (default: 120)
         base_note: Base MIDI note (default: 60 = Middle C)
+        pattern: Optional drum step pattern for the beat track (see ``create_simple_beat``)
+        scale: Optional semitone offsets above ``base_note`` the melody stays on
 
     Returns:
         Path to the generated MIDI file
@@ -105,6 +168,7 @@ def generate_midi(
     if not MIDO_AVAILABLE:
         print(f"MIDI generation simulated for lyrics: {lyrics[:50]}...")
         return "midi_file.mid"
+    from mido import Message, MetaMessage, MidiFile, MidiTrack
 
     # Create MIDI file
     mid = MidiFile()
@@ -115,7 +179,7 @@ def generate_midi(
 
     # Set tempo
     tempo_value = int(60000000 / tempo)
-    melody_track.append(mido.MetaMessage('set_tempo', tempo=tempo_value))
+    melody_track.append(MetaMessage('set_tempo', tempo=tempo_value))
 
     # Parse lyrics and generate notes
     words = lyrics.split()
@@ -124,7 +188,7 @@ def generate_midi(
 
     for i, word in enumerate(words):
         # Generate note from word
-        note = get_note_from_word(word, base_note)
+        note = get_note_from_word(word, base_note, scale)
 
         # Add some variation
         velocity = random.randint(70, 100)
@@ -141,7 +205,7 @@ def generate_midi(
 
     # Create beat track
     num_bars = max(1, len(words) // 4)
-    beat_track = create_simple_beat(tempo, num_bars)
+    beat_track = create_simple_beat(tempo, num_bars, pattern)
     if beat_track:
         mid.tracks.append(beat_track)
 
@@ -154,6 +218,40 @@ def generate_midi(
     return str(output_path)
 
 
+def generate_midi_for_take(
+    lyrics: str,
+    take_path: str,
+    output_path: str = "output.mid",
+    pattern: Optional[Mapping[int, Sequence[int]]] = None
+) -> str:
+    """Generate MIDI from lyrics at the tempo and in the key of a vocal take.
+
+    The take is analyzed once (see ``src.fx.analysis.analyze_file``); the
+    result is cached next to it, so later calls skip the audio entirely.
+
+    Args:
+        lyrics: Input lyrics text
+        take_path: Recorded vocal the beat and melody should line up with
+        output_path: Path to save the MIDI file
+        pattern: Optional drum step pattern for the beat track
+
+    Returns:
+        Path to the generated MIDI file
+    """
+    from src.fx.analysis import analyze_file
+    from src.fx.cache import DecodeCache
+
+    analysis = analyze_file(take_path, DecodeCache())
+    return generate_midi(
+        lyrics,
+        output_path,
+        tempo=analysis.tempo or 120,
+        base_note=analysis.base_note,
+        pattern=pattern,
+        scale=analysis.scale_intervals,
+    )
+
+
 def generate_midi_from_bars(
     bars: List[str],
     output_path: str = "output.mid",
@@ -0,0 +1,145 @@
+"""Micro-batching of concurrent requests into one call"""
+import asyncio
+from typing import Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT = 0.002  # Seconds the first request of a batch waits for company
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collects requests arriving close together and runs them as one batch.
+
+    ``submit`` queues an item and awaits its result. A single collector
+    task takes the first queued item, gathers whatever else arrives within
+    ``max_wait`` (up to ``max_batch`` items), and runs ``fn`` on the whole
+    batch in a worker thread, so the event loop keeps accepting requests
+    while a batch is generated. Under load, batches fill up without
+    waiting; a lone request pays at most ``max_wait`` of extra latency.
+    If ``fn`` raises, the batch's items are retried one at a time, so a
+    bad item fails only its own request.
+
+    Example:
+        batcher = MicroBatcher(generator.generate_batch)
+        batcher.start()
+        text = await batcher.submit(GenerationRequest("Neon Alien", "Fashion"))
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[T]], Sequence[R]],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait: float = DEFAULT_MAX_WAIT
+    ):
+        """Initialize the batcher.
+
+        Args:
+            fn: Batch function; returns one result per item, in order
+            max_batch: Most items per call of ``fn``
+            max_wait: Seconds to wait for more items once one arrived
+
+        Raises:
+            ValueError: If max_batch is not positive
+        """
+        if max_batch < 1:
+            raise ValueError(f"Invalid max_batch: {max_batch}. Must be at least 1")
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0  # Calls of ``fn`` so far
+        self.items = 0  # Items processed so far
+        self._queue: "asyncio.Queue[Tuple[T, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the collector task (call from inside the event loop)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def close(self) -> None:
+        """Stop collecting; requests still queued fail with ``CancelledError``."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def submit(self, item: T) -> R:
+        """Queue one item and wait for its result.
+
+        Raises:
+            Exception: Whatever ``fn`` raised for the item
+        """
+        future: "asyncio.Future[R]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _next_batch(self) -> List[Tuple[T, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            live = [(item, future) for item, future in batch if not future.cancelled()]
+            if not live:
+                continue
+            items = [item for item, _ in live]
+            try:
+                results = await loop.run_in_executor(None, self.fn, items)
+            except Exception as e:
+                if len(live) == 1:
+                    logger.error("Batch of 1 failed: %s", e)
+                    outcomes: List[Tuple[Optional[R], Optional[Exception]]] = [(None, e)]
+                else:
+                    logger.warning("Batch of %d failed (%s), retrying its items one by one", len(live), e)
+                    outcomes = await loop.run_in_executor(None, self._run_each, items)
+            else:
+                self.batches += 1
+                self.items += len(live)
+                outcomes = [(result, None) for result in results]
+            for (_, future), (result, error) in zip(live, outcomes, strict=True):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _run_each(self, items: List[T]) -> List[Tuple[Optional[R], Optional[Exception]]]:
+        # Runs in the worker thread after a failed batch: one call per item
+        outcomes: List[Tuple[Optional[R], Optional[Exception]]] = []
+        for item in items:
+            try:
+                outcomes.append((self.fn([item])[0], None))
+            except Exception as e:
+                logger.error("Batch item failed: %s", e)
+                outcomes.append((None, e))
+                continue
+            self.batches += 1
+            self.items += 1
+        return outcomes
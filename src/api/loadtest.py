@@ -0,0 +1,230 @@
+"""Load test for the generation API: throughput and latency per concurrency level"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.api.server import DEFAULT_HOST, DEFAULT_PORT
+
+DEFAULT_LEVELS = (1, 4, 16, 64)
+DEFAULT_REQUESTS = 1000  # Per concurrency level
+STARTUP_TIMEOUT = 30.0
+
+PAYLOADS: Dict[str, Dict[str, Any]] = {
+    "bars": {"persona": "Neon Alien", "theme": "Fashion", "flex": 8, "chaos": 6},
+    "hook": {"persona": "Beach Riff", "theme": "Snacks", "flex": 9, "chaos": 9},
+    "batch": {"requests": [
+        {"persona": "Neon Alien", "theme": "Sci-Fi", "mode": "4-Bar Verse"},
+        {"persona": "Snakeskin Tycoon", "theme": "Flexing", "mode": "Hook Generator"},
+    ] * 4},
+}
+
+
+@dataclass
+class LevelResult:
+    """Outcome of one concurrency level."""
+
+    concurrency: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)  # Seconds, successful requests only
+    errors: int = 0
+    batches: int = 0  # Server batches during the level (0 if unknown)
+    generated: int = 0  # Server generations during the level
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Latency percentile in milliseconds."""
+        return float(np.percentile(self.latencies, q) * 1000) if self.latencies else float("nan")
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 client connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: Optional[Any] = None) -> Tuple[int, Any]:
+        """Send one request and read the JSON response.
+
+        Returns:
+            Status code and decoded body (text for non-JSON responses)
+        """
+        if self._writer is None or self._reader is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        reader = self._reader
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+        )
+        await self._writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        payload = await reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            self.close()
+        if not payload:
+            return status, None
+        if headers.get("content-type", "").startswith("application/json"):
+            return status, json.loads(payload)
+        return status, payload.decode("utf-8")
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+
+async def run_level(
+    host: str,
+    port: int,
+    concurrency: int,
+    requests: int,
+    endpoint: str = "bars"
+) -> LevelResult:
+    """Send ``requests`` requests from ``concurrency`` concurrent clients."""
+    body = PAYLOADS[endpoint]
+    remaining = requests
+    latencies: List[float] = []
+    errors = 0
+
+    async def client() -> None:
+        nonlocal remaining, errors
+        connection = Connection(host, port)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    status, _ = await connection.request("POST", f"/{endpoint}", body)
+                except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                    errors += 1
+                    connection.close()
+                    continue
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        finally:
+            connection.close()
+
+    health = Connection(host, port)
+    _, before = await health.request("GET", "/health")
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    _, after = await health.request("GET", "/health")
+    health.close()
+
+    return LevelResult(
+        concurrency=concurrency,
+        elapsed=elapsed,
+        latencies=latencies,
+        errors=errors,
+        batches=after["batches"] - before["batches"],
+        generated=after["generated"] - before["generated"],
+    )
+
+
+async def run(
+    host: str,
+    port: int,
+    levels: Sequence[int] = DEFAULT_LEVELS,
+    requests: int = DEFAULT_REQUESTS,
+    endpoint: str = "bars"
+) -> List[LevelResult]:
+    """Run every concurrency level in turn (after a short warm-up)."""
+    await run_level(host, port, 1, min(requests, 20), endpoint)
+    return [await run_level(host, port, level, requests, endpoint) for level in levels]
+
+
+def format_report(results: Sequence[LevelResult]) -> str:
+    """Table of throughput, latency and batch size per level."""
+    lines = [f"{'clients':>8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'avg batch':>10}"]
+    for result in results:
+        batch = result.generated / result.batches if result.batches else float("nan")
+        lines.append(
+            f"{result.concurrency:>8} {result.requests_per_second:>10.1f} {result.percentile(50):>9.2f} "
+            f"{result.percentile(99):>9.2f} {result.errors:>7} {batch:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((DEFAULT_HOST, 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def spawn_server(port: int) -> subprocess.Popen:
+    """Start a local API server in a subprocess and wait until it answers.
+
+    Raises:
+        RuntimeError: If the server does not come up in time
+    """
+    process = subprocess.Popen([sys.executable, "-m", "src.api.server", "--port", str(port)])
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with code {process.returncode}")
+        try:
+            socket.create_connection((DEFAULT_HOST, port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"API server did not start within {STARTUP_TIMEOUT}s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Load test a running API server, or a local one started for the run."""
+    parser = argparse.ArgumentParser(description="Load test the Riff Raff generation API")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Server host (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Server port (default: {DEFAULT_PORT})")
+    parser.add_argument("--spawn", action="store_true", help="Start a local server on a free port for the run")
+    parser.add_argument(
+        "--levels", default=",".join(map(str, DEFAULT_LEVELS)),
+        help="Comma-separated concurrency levels (default: %(default)s)"
+    )
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Requests per level")
+    parser.add_argument("--endpoint", choices=sorted(PAYLOADS), default="bars", help="Endpoint to load")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.levels.split(",")]
+    host, port, server = args.host, args.port, None
+    if args.spawn:
+        host, port = DEFAULT_HOST, _free_port()
+        server = spawn_server(port)
+    try:
+        results = asyncio.run(run(host, port, levels, args.requests, args.endpoint))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(f"POST /{args.endpoint} against http://{host}:{port}, {args.requests} requests per level")
+    print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
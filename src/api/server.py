@@ -0,0 +1,338 @@
+"""Headless HTTP API for lyric generation (stdlib asyncio, JSON in and out)"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import tempfile
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.api.batching import DEFAULT_MAX_BATCH, DEFAULT_MAX_WAIT, MicroBatcher
+from src.lyrics.generator import MODES, GenerationRequest, LyricGenerator
+from src.metrics import enable_metrics, prometheus_text
+from src.utils import Config, configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_VAULT_PATH = "data/saved_lyrics.json"
+MAX_BODY_BYTES = 1 << 20
+MAX_HEADER_LINES = 100
+MAX_BATCH_REQUESTS = 500
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class APIError(Exception):
+    """Error answered with an HTTP status and a JSON ``{"error": ...}`` body."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_field(body: Dict[str, Any], name: str, default: int, low: int, high: int) -> int:
+    value = body.get(name, default)
+    if not isinstance(value, int) or isinstance(value, bool) or not low <= value <= high:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"Invalid {name}: {value!r}. Must be an integer from {low} to {high}")
+    return value
+
+
+def _str_field(body: Dict[str, Any], name: str, default: Optional[str] = None) -> str:
+    value = body.get(name, default)
+    if not isinstance(value, str) or not value:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"Missing or invalid {name}: must be a non-empty string")
+    return value
+
+
+def parse_request(body: Dict[str, Any], mode: Optional[str] = None) -> GenerationRequest:
+    """Validate the JSON settings of one generation.
+
+    Fields: ``persona``, ``theme`` (required), ``mode`` (unless fixed by the
+    endpoint), ``flex`` (1-10, default 7), ``chaos`` (0-10, default 5) and
+    ``seed`` (default: random, and echoed back so results can be reproduced).
+
+    Raises:
+        APIError: 400 if a field is missing or invalid
+    """
+    if not isinstance(body, dict):
+        raise APIError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+    mode = mode or body.get("mode", MODES[0])
+    if mode not in MODES:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"Invalid mode: {mode!r}. Must be one of {', '.join(MODES)}")
+    seed = random.randrange(2 ** 31) if body.get("seed") is None else _int_field(body, "seed", 0, 0, 2 ** 63 - 1)
+    return GenerationRequest(
+        persona=_str_field(body, "persona"),
+        theme=_str_field(body, "theme"),
+        mode=mode,
+        flex=_int_field(body, "flex", 7, 1, 10),
+        chaos=_int_field(body, "chaos", 5, 0, 10),
+        seed=seed,
+    )
+
+
+class GenerationServer:
+    """HTTP front end for ``LyricGenerator`` behind a micro-batching queue.
+
+    Endpoints (JSON unless noted):
+        GET  /health  Liveness and batching counters
+        GET  /metrics Operation timings as Prometheus text (see ``src.metrics``)
+        POST /bars    One 4-bar verse: ``{"persona", "theme", "flex", "chaos", "seed"}``
+        POST /hook    One hook, same fields
+        POST /batch   ``{"requests": [...]}``, each with a ``mode``; results in order
+        POST /midi    ``{"text", "tempo", "base_note"}`` -> base64 MIDI file
+        POST /vault   Save ``{"text", "persona", "theme", "mode", "flex_level", "nonsense"}``
+
+    Every generation, whether from /bars, /hook or /batch, goes through one
+    ``MicroBatcher``, so concurrent clients share ``generate_batch`` calls.
+    Connections are kept alive (HTTP/1.1), and vault writes are serialized.
+
+    Example:
+        server = GenerationServer(port=8000)
+        asyncio.run(server.serve_forever())
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        generator: Optional[LyricGenerator] = None,
+        vault_path: str = DEFAULT_VAULT_PATH,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait: float = DEFAULT_MAX_WAIT
+    ):
+        """Initialize the server (nothing listens until ``start``).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one; see ``port`` after ``start``)
+            generator: Lyric generator (default: a new one)
+            vault_path: Vault file written by /vault
+            max_batch: Most generations per batch
+            max_wait: Seconds a request waits for others to batch with
+        """
+        self.host = host
+        self.port = port
+        self.generator = generator or LyricGenerator()
+        self.vault_path = vault_path
+        self.batcher: MicroBatcher[GenerationRequest, str] = MicroBatcher(
+            self.generator.generate_batch, max_batch, max_wait
+        )
+        self._server: Optional[asyncio.Server] = None
+        self._routes: Dict[Tuple[str, str], Callable[[Any], Awaitable[Tuple[HTTPStatus, Any]]]] = {
+            ("GET", "/health"): self._health,
+            ("GET", "/metrics"): self._metrics,
+            ("POST", "/bars"): self._bars,
+            ("POST", "/hook"): self._hook,
+            ("POST", "/batch"): self._batch,
+            ("POST", "/midi"): self._midi,
+            ("POST", "/vault"): self._vault,
+        }
+
+    async def start(self) -> None:
+        """Start listening and batching."""
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Generation API listening on http://%s:%d", self.host, self.port)
+
+    async def close(self) -> None:
+        """Stop listening and fail requests still queued."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.close()
+
+    async def serve_forever(self) -> None:
+        """Start and serve until cancelled."""
+        await self.start()
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = await self._respond(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self,
+        request_line: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> bool:
+        keep_alive = True
+        try:
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                keep_alive = False
+                raise APIError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+            try:
+                length = int(headers.get("content-length") or 0)
+            except ValueError:
+                keep_alive = False
+                raise APIError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+            if length > MAX_BODY_BYTES:
+                keep_alive = False
+                raise APIError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body over {MAX_BODY_BYTES} bytes")
+            raw = await reader.readexactly(length) if length else b""
+
+            path = target.split("?", 1)[0]
+            route = self._routes.get((method, path))
+            if route is None:
+                if any(known == path for _, known in self._routes):
+                    raise APIError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+                raise APIError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {path}")
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError as e:
+                raise APIError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}") from e
+            status, payload = await route(body)
+        except APIError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            logger.error("Request failed: %s", e)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+        if isinstance(payload, str):
+            data, content_type = payload.encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+        else:
+            data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+        )
+        return keep_alive
+
+    async def _generate(self, request: GenerationRequest) -> Dict[str, Any]:
+        text = await self.batcher.submit(request)
+        return {"text": text, "seed": request.seed, "mode": request.mode}
+
+    async def _health(self, body: Any) -> Tuple[HTTPStatus, Any]:
+        return HTTPStatus.OK, {"status": "ok", "batches": self.batcher.batches, "generated": self.batcher.items}
+
+    async def _metrics(self, body: Any) -> Tuple[HTTPStatus, Any]:
+        return HTTPStatus.OK, prometheus_text()
+
+    async def _bars(self, body: Any) -> Tuple[HTTPStatus, Any]:
+        return HTTPStatus.OK, await self._generate(parse_request(body, "4-Bar Verse"))
+
+    async def _hook(self, body: Any) -> Tuple[HTTPStatus, Any]:
+        return HTTPStatus.OK, await self._generate(parse_request(body, "Hook Generator"))
+
+    async def _batch(self, body: Any) -> Tuple[HTTPStatus, Any]:
+        items = body.get("requests") if isinstance(body, dict) else None
+        if not isinstance(items, list) or not items:
+            raise APIError(HTTPStatus.BAD_REQUEST, "Missing or invalid requests: must be a non-empty list")
+        if len(items) > MAX_BATCH_REQUESTS:
+            raise APIError(HTTPStatus.BAD_REQUEST, f"Too many requests: {len(items)} > {MAX_BATCH_REQUESTS}")
+        requests = [parse_request(item) for item in items]
+        results = await asyncio.gather(*(self._generate(request) for request in requests))
+        return HTTPStatus.OK, {"results": results}
+
+    async def _midi(self, body: Any) -> Tuple[HTTPStatus, Any]:
+        from midi_generator import MIDO_AVAILABLE, generate_midi
+
+        if not MIDO_AVAILABLE:
+            raise APIError(HTTPStatus.SERVICE_UNAVAILABLE, "MIDI export needs mido installed")
+        if not isinstance(body, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        text = _str_field(body, "text")
+        tempo = _int_field(body, "tempo", 120, 20, 300)
+        base_note = _int_field(body, "base_note", 60, 0, 115)
+
+        def render() -> bytes:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = generate_midi(text, str(Path(tmp_dir) / "lyrics.mid"), tempo=tempo, base_note=base_note)
+                return Path(path).read_bytes()
+
+        data = await asyncio.get_running_loop().run_in_executor(None, render)
+        return HTTPStatus.OK, {"midi": base64.b64encode(data).decode("ascii"), "bytes": len(data)}
+
+    async def _vault(self, body: Any) -> Tuple[HTTPStatus, Any]:
+        from vault_manager import append_lyrics
+
+        if not isinstance(body, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        entry = {
+            'text': _str_field(body, "text"),
+            'persona': _str_field(body, "persona", "Unknown"),
+            'theme': _str_field(body, "theme", "Unknown"),
+            'mode': _str_field(body, "mode", MODES[0]),
+            'flex_level': _int_field(body, "flex_level", 7, 1, 10),
+            'nonsense': _int_field(body, "nonsense", 5, 0, 10),
+            'timestamp': datetime.now().isoformat(),
+        }
+
+        count = await asyncio.get_running_loop().run_in_executor(None, append_lyrics, entry, self.vault_path)
+        return HTTPStatus.CREATED, {"saved": True, "vault_size": count}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the API server from the command line."""
+    parser = argparse.ArgumentParser(description="Headless Riff Raff generation API")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--vault", default=DEFAULT_VAULT_PATH, help="Vault file for POST /vault")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="Most generations per batch")
+    parser.add_argument(
+        "--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000,
+        help="Milliseconds a request waits for others to batch with"
+    )
+    parser.add_argument("--metrics", action="store_true", help="Record operation timings for GET /metrics")
+    parser.add_argument(
+        "--profile-rate", type=float, metavar="RATE",
+        help="Profile this fraction of generation, vault and MIDI calls (see src.profiling)"
+    )
+    args = parser.parse_args(argv)
+    configure_logging()
+    if args.metrics:
+        enable_metrics()
+    if args.profile_rate:
+        config = Config()
+        config.set("profiling.enabled", True)
+        config.set("profiling.sample_rate", args.profile_rate)
+
+    server = GenerationServer(
+        host=args.host,
+        port=args.port,
+        vault_path=args.vault,
+        max_batch=args.max_batch,
+        max_wait=args.max_wait_ms / 1000,
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
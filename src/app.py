@@ -1,2 +1,28 @@
 """Streamlit main entrypoint"""
-# TODO: Implement Streamlit app logic
+from src.ui.content import render_generation, render_hook_fx, render_vault
+from src.ui.layout import configure_page, init_session_state, render_footer, render_header
+from src.ui.sidebar import render_sidebar
+from src.utils import configure_logging
+
+
+def main() -> None:
+    """Compose the app.
+
+    Each section below is a Streamlit fragment (or made of fragments), so a
+    widget only reruns its own section: moving a slider doesn't touch the
+    vault, and generating doesn't re-read or re-render it. Full reruns
+    happen on first load and when the vault changes.
+    """
+    configure_logging()
+    configure_page()
+    init_session_state()
+    render_header()
+    render_sidebar()
+    render_generation()
+    render_vault()
+    render_hook_fx()
+    render_footer()
+
+
+if __name__ == "__main__":
+    main()
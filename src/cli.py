@@ -0,0 +1,154 @@
+"""``riff-raff`` command-line entry point
+
+Text generation imports only the standard library and the lyric modules;
+everything heavier (mido, numpy, the FX chain, streamlit) is imported by
+the subcommand that needs it, so ``riff-raff bars`` starts in milliseconds.
+"""
+import argparse
+import logging
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from src.utils import configure_logging
+
+DEFAULT_PERSONA = "Neon Alien"
+DEFAULT_THEME = "Fashion"
+APP_PATH = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+
+def _generate(args: argparse.Namespace, mode: str) -> None:
+    import random
+
+    from src.lyrics.generator import GenerationRequest, LyricGenerator
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 31)
+    requests = [
+        GenerationRequest(args.persona, args.theme, mode, args.flex, args.chaos, seed + i)
+        for i in range(args.count)
+    ]
+    texts = LyricGenerator(args.personas_dir).generate_batch(requests)
+    for request, text in zip(requests, texts, strict=True):
+        if args.count > 1:
+            print(f"# seed {request.seed}")
+        print(text)
+        if args.count > 1:
+            print()
+
+
+def _bars(args: argparse.Namespace) -> None:
+    _generate(args, "4-Bar Verse")
+
+
+def _hook(args: argparse.Namespace) -> None:
+    _generate(args, "Hook Generator")
+
+
+def _personas(args: argparse.Namespace) -> None:
+    from src.personas.vocab_loader import PersonaVocabLoader
+
+    for persona in PersonaVocabLoader(args.personas_dir).list_available_personas():
+        print(persona)
+
+
+def _midi(args: argparse.Namespace) -> None:
+    from midi_generator import MIDO_AVAILABLE, generate_midi, generate_midi_for_take
+
+    if not MIDO_AVAILABLE:
+        sys.exit("MIDI export needs mido installed (pip install mido)")
+    lyrics = sys.stdin.read() if args.lyrics == "-" else Path(args.lyrics).read_text()
+    if args.take:
+        generate_midi_for_take(lyrics, args.take, args.output)
+    else:
+        generate_midi(lyrics, args.output, tempo=args.tempo, base_note=args.base_note)
+
+
+def _serve(args: argparse.Namespace) -> None:
+    from src.api.server import main as serve
+
+    serve(args.args)
+
+
+def _loadtest(args: argparse.Namespace) -> None:
+    from src.api.loadtest import main as loadtest
+
+    loadtest(args.args)
+
+
+def _fx(args: argparse.Namespace) -> None:
+    from z_cavaricci_hook_fx import main as fx
+
+    fx(args.args)
+
+
+def _app(args: argparse.Namespace) -> None:
+    command = [sys.executable, "-m", "streamlit", "run", str(APP_PATH), *args.args]
+    sys.exit(subprocess.call(command))
+
+
+DELEGATED = {
+    "serve": (_serve, "Run the HTTP generation API (see serve --help)"),
+    "loadtest": (_loadtest, "Load test the HTTP generation API"),
+    "fx": (_fx, "Run the hook vocal FX chain on a take or folder"),
+    "app": (_app, "Start the Streamlit app"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser with one subcommand per tool."""
+    parser = argparse.ArgumentParser(prog="riff-raff", description="Surreal freestyle bars, hooks and hook FX")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    for name, handler, help_text in (
+        ("bars", _bars, "Generate a 4-bar verse"),
+        ("hook", _hook, "Generate a hook"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--persona", default=DEFAULT_PERSONA, help="Persona (default: %(default)s)")
+        command.add_argument("--theme", default=DEFAULT_THEME, help="Theme (default: %(default)s)")
+        command.add_argument("--flex", type=int, default=7, help="Flex level 1-10 (default: %(default)s)")
+        command.add_argument("--chaos", type=int, default=5, help="Nonsense juice 0-10 (default: %(default)s)")
+        command.add_argument("--seed", type=int, help="Seed for reproducible output")
+        command.add_argument("-n", "--count", type=int, default=1, help="Variations to print (seeds seed..seed+n-1)")
+        command.add_argument("--personas-dir", default="personas", help="Persona JSON directory")
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser("personas", help="List available personas")
+    command.add_argument("--personas-dir", default="personas", help="Persona JSON directory")
+    command.set_defaults(handler=_personas)
+
+    command = commands.add_parser("midi", help="Turn lyrics into a melody + beat MIDI file")
+    command.add_argument("lyrics", help="Lyrics text file, or - for stdin")
+    command.add_argument("-o", "--output", default="output.mid", help="MIDI file to write")
+    command.add_argument("--tempo", type=float, default=120, help="Tempo in BPM")
+    command.add_argument("--base-note", type=int, default=60, help="MIDI note of the melody's root")
+    command.add_argument("--take", help="Vocal take to take the tempo and key from instead")
+    command.set_defaults(handler=_midi)
+
+    # These hand their remaining arguments to the tool's own parser
+    for name, (handler, help_text) in DELEGATED.items():
+        commands.add_parser(name, help=help_text, add_help=False).set_defaults(handler=handler)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Console entry point (``riff-raff``)."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+
+    # Tool subcommands get everything after their name, untouched
+    command = next((i for i, token in enumerate(argv) if not token.startswith("-")), len(argv))
+    if command < len(argv) and argv[command] in DELEGATED:
+        args = parser.parse_args(argv[:command + 1])
+        args.args = argv[command + 1:]
+    else:
+        args = parser.parse_args(argv)
+        configure_logging(logging.INFO if args.verbose else logging.WARNING)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Tempo and key analysis of vocal takes, cached next to the audio"""
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from src.fx.cache import DecodeCache, file_digest
+from src.fx.io import DEFAULT_SAMPLE_RATE, load_audio
+from src.fx.pitch import KEYS, SCALES
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+ANALYSIS_VERSION = 1  # Bump when results change, so stale sidecars are recomputed
+N_FFT = 4096
+HOP_LENGTH = 512
+BATCH = 256  # STFT frames transformed per batch
+TEMPO_RANGE = (60.0, 200.0)
+TEMPO_PRIOR_BPM = 120.0
+CHROMA_RANGE_HZ = (80.0, 4000.0)
+NOTE_NAMES = ("C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B")
+
+# Krumhansl-Schmuckler key profiles, tonic first
+MAJOR_PROFILE = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+MINOR_PROFILE = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+
+
+@dataclass
+class TakeAnalysis:
+    """Tempo and key of one take."""
+
+    tempo: float  # BPM
+    key: str  # Tonic, one of ``NOTE_NAMES``
+    scale: str  # "major" or "minor" (a name in ``SCALES``)
+    key_confidence: float  # Correlation of the chroma with the best key profile
+    duration: float
+
+    @property
+    def base_note(self) -> int:
+        """MIDI note of the tonic nearest middle C (54-65)."""
+        pitch_class = KEYS[self.key]
+        return 60 + (pitch_class if pitch_class < 6 else pitch_class - 12)
+
+    @property
+    def scale_intervals(self) -> Tuple[int, ...]:
+        """Semitones above the tonic of each scale degree."""
+        return SCALES[self.scale]
+
+
+def analysis_path(audio_path: Union[str, Path]) -> Path:
+    """Sidecar file holding the analysis of a take."""
+    audio_path = Path(audio_path)
+    return audio_path.with_name(f"{audio_path.stem}.analysis.json")
+
+
+def _chroma_map(sample_rate: int) -> np.ndarray:
+    """(12, N_FFT // 2 + 1) 0/1 matrix assigning FFT bins to pitch classes."""
+    freqs = np.fft.rfftfreq(N_FFT, 1.0 / sample_rate)
+    in_range = (freqs >= CHROMA_RANGE_HZ[0]) & (freqs <= CHROMA_RANGE_HZ[1])
+    pitch_class = np.round(69.0 + 12.0 * np.log2(np.maximum(freqs, 1e-6) / 440.0)).astype(int) % 12
+    chroma: np.ndarray = (pitch_class[None, :] == np.arange(12)[:, None]) & in_range
+    return chroma.astype(np.float64)
+
+
+def spectral_features(y: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Onset envelope and mean chroma from one batched STFT pass.
+
+    Frames are transformed ``BATCH`` at a time from a strided view of the
+    signal, and both features are reduced from the same magnitude spectra
+    (log-compressed for the onset envelope), so the take is read once and
+    memory stays bounded.
+
+    Args:
+        y: Mono audio
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Onset strength per frame (spectral flux) and the 12-bin chroma profile
+    """
+    y = np.asarray(y, dtype=np.float32)
+    if y.size < N_FFT:
+        y = np.pad(y, (0, N_FFT - y.size))
+    frames = np.lib.stride_tricks.sliding_window_view(y, N_FFT)[::HOP_LENGTH]
+    window = np.hanning(N_FFT).astype(np.float32)
+    chroma_map = _chroma_map(sample_rate)
+
+    onset = np.zeros(len(frames))
+    chroma = np.zeros(12)
+    previous = None
+    for start in range(0, len(frames), BATCH):
+        batch = frames[start:start + BATCH] * window
+        magnitude = np.abs(np.fft.rfft(batch, axis=1))
+        chroma += chroma_map @ magnitude.sum(axis=0)
+        magnitude = np.log1p(1000.0 * magnitude)
+        if previous is None:
+            previous = magnitude[:1]
+        flux = np.diff(np.concatenate([previous, magnitude]), axis=0)
+        onset[start:start + len(batch)] = np.maximum(flux, 0.0).mean(axis=1)
+        previous = magnitude[-1:]
+    return onset, chroma
+
+
+def estimate_tempo(onset: np.ndarray, frame_rate: float) -> float:
+    """Tempo in BPM from the autocorrelation of an onset envelope.
+
+    Lags in ``TEMPO_RANGE`` are weighted by a log-normal prior around
+    ``TEMPO_PRIOR_BPM`` (one octave wide) to settle octave ambiguity, and
+    the best lag is refined by parabolic interpolation.
+
+    Returns:
+        Tempo in BPM, or 0.0 when there are no onsets
+    """
+    envelope = onset - onset.mean()
+    if not envelope.any():
+        return 0.0
+    size = 1 << int(np.ceil(np.log2(2 * envelope.size)))
+    spectrum = np.fft.rfft(envelope, size)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), size)[:envelope.size]
+
+    min_lag = max(1, int(np.floor(60.0 * frame_rate / TEMPO_RANGE[1])))
+    max_lag = min(envelope.size - 2, int(np.ceil(60.0 * frame_rate / TEMPO_RANGE[0])))
+    if max_lag <= min_lag:
+        return 0.0
+    lags = np.arange(min_lag, max_lag + 1)
+    prior = np.exp(-0.5 * np.log2(60.0 * frame_rate / lags / TEMPO_PRIOR_BPM) ** 2)
+    best = lags[np.argmax(autocorr[lags] * prior)]
+
+    left, centre, right = autocorr[best - 1:best + 2]
+    curvature = left - 2 * centre + right
+    offset = 0.5 * (left - right) / curvature if curvature < 0 else 0.0
+    return float(60.0 * frame_rate / (best + offset))
+
+
+def estimate_key(chroma: np.ndarray) -> Tuple[str, str, float]:
+    """Best-matching key for a chroma profile (Krumhansl-Schmuckler).
+
+    Returns:
+        Tonic name, "major" or "minor", and the correlation of the match
+        (C major with 0 confidence for a flat profile, e.g. silence)
+    """
+    if not np.ptp(chroma):
+        return NOTE_NAMES[0], "major", 0.0
+    candidates = []
+    for scale, profile in (("major", MAJOR_PROFILE), ("minor", MINOR_PROFILE)):
+        for tonic in range(12):
+            r = np.corrcoef(chroma, np.roll(profile, tonic))[0, 1]
+            candidates.append((float(r), tonic, scale))
+    r, tonic, scale = max(candidates)
+    return NOTE_NAMES[tonic], scale, r
+
+
+def analyze(y: np.ndarray, sample_rate: int = DEFAULT_SAMPLE_RATE) -> TakeAnalysis:
+    """Tempo and key of a take held in memory.
+
+    Args:
+        y: Mono audio
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        The analysis
+    """
+    onset, chroma = spectral_features(y, sample_rate)
+    key, scale, confidence = estimate_key(chroma)
+    return TakeAnalysis(
+        tempo=round(estimate_tempo(onset, sample_rate / HOP_LENGTH), 2),
+        key=key,
+        scale=scale,
+        key_confidence=round(confidence, 4),
+        duration=len(y) / sample_rate,
+    )
+
+
+def analyze_file(
+    path: Union[str, Path],
+    cache: Optional[DecodeCache] = None,
+    sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> TakeAnalysis:
+    """Analyze a take once and reuse the result while the file is unchanged.
+
+    The result is stored in ``<take>.analysis.json`` with the content hash
+    of the take; later calls return it without decoding. Decoding goes
+    through the decode cache when one is given, so analysis and the FX
+    chain share one decode.
+
+    Args:
+        path: Recording to analyze
+        cache: Decode cache (e.g. ``HookFX().cache``)
+        sample_rate: Analysis sample rate in Hz
+
+    Returns:
+        The analysis
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+
+    digest = file_digest(path)
+    sidecar = analysis_path(path)
+    if sidecar.exists():
+        try:
+            stored = json.loads(sidecar.read_text())
+            if stored.get("digest") == digest and stored.get("version") == ANALYSIS_VERSION:
+                return TakeAnalysis(**stored["analysis"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable analysis {sidecar}: {e}")
+
+    y = cache.load(path, sample_rate) if cache is not None else load_audio(path, sample_rate)
+    result = analyze(y, sample_rate)
+    try:
+        record = {"version": ANALYSIS_VERSION, "digest": digest, "analysis": asdict(result)}
+        sidecar.write_text(json.dumps(record, indent=2))
+    except OSError as e:
+        logger.warning(f"Could not store analysis of {path}: {e}")
+    logger.info(f"Analyzed {path}: {result.tempo:.1f} BPM, {result.key} {result.scale}")
+    return result
@@ -0,0 +1,173 @@
+"""Parallel batch processing of a folder of vocal takes"""
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.fx.pipeline import MIX_FILENAME, HookFX
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".aiff", ".aif", ".m4a", ".mp3")
+
+
+@dataclass
+class BatchSummary:
+    """Outcome and throughput of a batch run."""
+
+    processed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Audio seconds processed per wall-clock second."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def format(self) -> str:
+        """Human-readable one-line summary."""
+        return (
+            f"Processed {len(self.processed)} takes ({self.audio_seconds:.1f}s of audio) "
+            f"in {self.wall_seconds:.1f}s: {self.throughput:.1f}x real time "
+            f"| skipped {len(self.skipped)} up to date | failed {len(self.failed)}"
+        )
+
+
+def find_takes(input_dir: str) -> List[Path]:
+    """List audio files in a folder (non-recursive), sorted by name."""
+    return sorted(
+        p for p in Path(input_dir).iterdir()
+        if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+
+def output_dir_for(take: Path, output_root: str) -> Path:
+    """Each take gets its own output directory, named after the file (without extension)."""
+    return Path(output_root) / take.stem
+
+
+def is_up_to_date(take: Path, output_root: str, mix_filename: str = MIX_FILENAME) -> bool:
+    """Whether a take's final mix exists and is newer than the take."""
+    mix = output_dir_for(take, output_root) / mix_filename
+    return mix.exists() and mix.stat().st_mtime >= take.stat().st_mtime
+
+
+def _process_take(
+    take: str,
+    output_root: str,
+    fx_options: Dict[str, Any],
+    stream: bool,
+    previews: bool = False,
+    write_intermediates: bool = False,
+    export_stems: bool = True
+) -> float:
+    """Worker: process one take into an isolated directory.
+
+    Outputs are written to a private staging directory and moved into place
+    only when complete, so an interrupted run never leaves a take looking up
+    to date.
+
+    Returns:
+        Duration of the processed audio in seconds
+    """
+    final_dir = output_dir_for(Path(take), output_root)
+    staging = final_dir.with_name(f".{final_dir.name}.partial-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    fx = HookFX(**fx_options)
+    process = fx.process_stream if stream else fx.process_file
+    try:
+        duration = process(
+            take, str(staging), write_intermediates=write_intermediates, export_stems=export_stems,
+            previews=previews
+        ).duration
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(staging, final_dir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return duration
+
+
+def process_batch(
+    input_dir: str,
+    output_root: str = "output",
+    workers: Optional[int] = None,
+    fx_options: Optional[Dict[str, Any]] = None,
+    stream: bool = False,
+    force: bool = False,
+    previews: bool = False,
+    write_intermediates: bool = False,
+    export_stems: bool = True
+) -> BatchSummary:
+    """Process every take in a folder across a process pool.
+
+    With a ``cache_dir`` in ``fx_options``, workers decode through the
+    ``HookFX`` decode cache, so the first batch run warms it and later runs
+    with different FX settings skip decoding. Streamed
+    runs reuse cached decodes but never add to the cache.
+
+    Args:
+        input_dir: Folder of recordings
+        output_root: Parent directory; each take gets ``<output_root>/<take name>/``
+        workers: Worker processes (default: all CPU cores)
+        fx_options: Keyword arguments for ``HookFX``
+        stream: Use bounded-memory block streaming in the workers
+        force: Reprocess takes whose outputs are already up to date
+        previews: Write waveform/spectrogram sidecars next to each mix
+        write_intermediates: Also write each stage's output (01_..05_ files)
+        export_stems: Write dry/doubled/reverb stems next to each mix
+
+    Takes that would share an output directory (``take.wav`` and
+    ``take.flac``) are reported as failed instead of overwriting each other.
+
+    Returns:
+        Summary with per-take outcomes and throughput
+    """
+    fx_options = fx_options or {}
+    mix_filename = HookFX(**fx_options).mix_filename
+    summary = BatchSummary()
+    start = time.perf_counter()
+
+    takes = find_takes(input_dir)
+    names: Dict[str, List[Path]] = {}
+    for path in takes:
+        names.setdefault(path.stem, []).append(path)
+
+    pending: List[str] = []
+    for path in takes:
+        clashes = [other.name for other in names[path.stem] if other != path]
+        if clashes:
+            summary.failed.append((str(path), f"Output directory clashes with {', '.join(clashes)}"))
+        elif not force and is_up_to_date(path, output_root, mix_filename):
+            summary.skipped.append(str(path))
+        else:
+            pending.append(str(path))
+
+    Path(output_root).mkdir(parents=True, exist_ok=True)
+    if pending:
+        max_workers = min(workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(
+                    _process_take, take, output_root, fx_options, stream, previews, write_intermediates, export_stems
+                ): take
+                for take in pending
+            }
+            for future in as_completed(futures):
+                take = futures[future]
+                try:
+                    summary.audio_seconds += future.result()
+                    summary.processed.append(take)
+                except Exception as e:
+                    logger.error(f"Failed to process {take}: {e}")
+                    summary.failed.append((take, str(e)))
+
+    summary.wall_seconds = time.perf_counter() - start
+    logger.info(summary.format())
+    return summary
@@ -0,0 +1,188 @@
+"""Content-addressed cache of decoded, resampled audio"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from src.fx.io import DEFAULT_SAMPLE_RATE, load_audio
+from src.utils import get_logger, user_cache_dir
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# (path, size, mtime_ns) -> digest; hashing is cheap but not free on long takes
+_digests: Dict[Tuple[str, int, int], str] = {}
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory: ``$XDG_CACHE_HOME/riff-raff/decoded`` (``~/.cache`` if unset)."""
+    return user_cache_dir("decoded")
+
+
+def file_digest(path: Union[str, Path], chunk_size: int = 1 << 16) -> str:
+    """SHA-256 of a file's content, memoized per (path, size, mtime).
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        Hex digest
+    """
+    stat = os.stat(path)
+    memo_key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _digests:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(chunk_size):
+                sha.update(chunk)
+        _digests[memo_key] = sha.hexdigest()
+    return _digests[memo_key]
+
+
+class DecodeCache:
+    """Decoded takes stored as float32 ``.npy`` files and reopened memory-mapped.
+
+    Entries are keyed by (file content hash, sample rate, mono), so renaming
+    or copying a take still hits, and editing it misses. Each hit refreshes
+    the entry's mtime; when the cache outgrows ``max_bytes`` the least
+    recently used entries are deleted. Writes go through a temporary file
+    and ``os.replace``, so concurrent batch workers never see partial entries.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            directory: Where entries are stored (created on first write;
+                defaults to ``default_cache_dir()``)
+            max_bytes: Size bound enforced after every write
+        """
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, path: Union[str, Path], sample_rate: int = DEFAULT_SAMPLE_RATE, mono: bool = True) -> str:
+        """Cache key for a take decoded at a sample rate."""
+        return f"{file_digest(path)}-{sample_rate}-{'mono' if mono else 'multi'}"
+
+    def entry_path(self, key: str) -> Path:
+        """File holding the entry for ``key``."""
+        return self.directory / f"{key}.npy"
+
+    def get(
+        self,
+        path: Union[str, Path],
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        mono: bool = True
+    ) -> Optional[np.ndarray]:
+        """Return the cached samples for a take, or None on a miss.
+
+        Args:
+            path: Input audio file
+            sample_rate: Target sample rate in Hz
+            mono: Whether the entry is a mono downmix
+
+        Returns:
+            Read-only memory-mapped float32 samples, or None
+        """
+        entry = self.entry_path(self.key(path, sample_rate, mono))
+        try:
+            y: np.ndarray = np.load(entry, mmap_mode='r')
+            os.utime(entry)  # Mark as recently used
+        except (FileNotFoundError, ValueError):
+            return None
+        logger.debug("Decode cache hit for %s", path)
+        return y
+
+    def put(self, key: str, y: np.ndarray) -> np.ndarray:
+        """Store samples under ``key`` and evict down to the size bound.
+
+        Returns:
+            The stored samples, memory-mapped from the cache
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self.entry_path(key)
+        tmp = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            np.save(f, np.ascontiguousarray(y, dtype=np.float32))
+        os.replace(tmp, entry)
+        self.evict(keep=entry)
+        stored: np.ndarray = np.load(entry, mmap_mode='r')
+        return stored
+
+    def load(
+        self,
+        path: Union[str, Path],
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        mono: bool = True
+    ) -> np.ndarray:
+        """Decode a take through the cache.
+
+        Args:
+            path: Input audio file
+            sample_rate: Target sample rate in Hz
+            mono: Downmix to mono
+
+        Returns:
+            Read-only memory-mapped float32 samples
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Audio file not found: {path}")
+
+        cached = self.get(path, sample_rate, mono)
+        if cached is not None:
+            return cached
+        y = load_audio(path, sample_rate, mono=mono)
+        return self.put(self.key(path, sample_rate, mono), y)
+
+    def entries(self) -> Dict[Path, os.stat_result]:
+        """Current entries and their stats, skipping files removed meanwhile."""
+        stats = {}
+        for entry in self.directory.glob("*.npy"):
+            try:
+                stats[entry] = entry.stat()
+            except FileNotFoundError:
+                pass
+        return stats
+
+    def size(self) -> int:
+        """Total bytes held by the cache."""
+        return sum(s.st_size for s in self.entries().values())
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Delete least recently used entries until the cache fits ``max_bytes``.
+
+        Args:
+            keep: Entry that must survive (the one just written)
+
+        Returns:
+            Number of entries removed
+        """
+        stats = self.entries()
+        total = sum(s.st_size for s in stats.values())
+        removed = 0
+        for entry in sorted(stats, key=lambda e: stats[e].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= stats[entry].st_size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} decode cache entries ({total / 1024 ** 2:.1f} MB left)")
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for entry in self.entries():
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,139 @@
+"""Single-pass export of the mix, stems and intermediates"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("wav", "flac")
+EXPORT_LAYOUTS = ("files", "multichannel")
+FLAC_COMPRESSION = 0.5  # libsndfile compression level, 0 (fastest) to 1 (smallest)
+
+# (filename, stages): one file per target; several stages make a multichannel file
+ExportTarget = Tuple[str, Tuple[str, ...]]
+
+
+def with_format(filename: str, audio_format: str) -> str:
+    """Swap a filename's extension for an export format, e.g. ``.wav`` -> ``.flac``."""
+    return str(Path(filename).with_suffix(f".{audio_format}"))
+
+
+class StemExporter:
+    """Writes blocks of stage outputs to every target file in one pass.
+
+    Each ``write`` call takes the outputs of one run (or one streamed block)
+    and appends them to all open files. With several files, the writes run
+    concurrently on a thread pool; libsndfile encodes (and FLAC compresses)
+    with the GIL released, so the files are written in the time of the
+    slowest one rather than one after another. A multichannel target
+    interleaves its stages into a single file instead; stages whose blocks
+    run short (the limiter holds back its lookahead) are buffered so only
+    the length every channel has is written, and the rest on ``close``.
+
+    Example:
+        with StemExporter("output", [("mix.wav", ("mix",))], 44100) as export:
+            export.write({"mix": mix})
+    """
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path],
+        targets: Sequence[ExportTarget],
+        sample_rate: int,
+        audio_format: str = "wav",
+        subtype: str = "PCM_16"
+    ):
+        """Open every target for writing.
+
+        Args:
+            output_dir: Directory for the files (created if missing)
+            targets: (filename, stages) pairs; the extension of each filename
+                is replaced by ``audio_format``
+            sample_rate: Sample rate in Hz
+            audio_format: "wav" or "flac" (lossless, roughly half the size)
+            subtype: soundfile sample format
+
+        Raises:
+            ValueError: If the format is not known
+        """
+        import soundfile as sf
+
+        if audio_format not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid export format: {audio_format}. Must be one of {', '.join(EXPORT_FORMATS)}")
+
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        options = {"compression_level": FLAC_COMPRESSION} if audio_format == "flac" else {}
+
+        self.paths: Dict[str, str] = {}  # File stem -> path
+        self._files: List[Tuple[Tuple[str, ...], "sf.SoundFile"]] = []
+        self._pending: List[List[np.ndarray]] = []  # Per file, per channel: samples not written yet
+        try:
+            for filename, stages in targets:
+                path = out / with_format(filename, audio_format)
+                f = sf.SoundFile(str(path), 'w', sample_rate, len(stages), subtype=subtype, **options)
+                self._files.append((tuple(stages), f))
+                self._pending.append([np.zeros(0, dtype=np.float32) for _ in stages])
+                self.paths[path.stem] = str(path)
+        except Exception:
+            self.close()
+            raise
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if len(self._files) > 1:
+            self._pool = ThreadPoolExecutor(max_workers=len(self._files), thread_name_prefix="export")
+
+    def __enter__(self) -> "StemExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_one(self, index: int, outputs: Dict[str, np.ndarray]) -> None:
+        stages, f = self._files[index]
+        if len(stages) == 1:
+            f.write(np.clip(outputs[stages[0]], -1.0, 1.0))
+            return
+        channels = [
+            np.concatenate([held, outputs[stage]])
+            for held, stage in zip(self._pending[index], stages, strict=True)
+        ]
+        length = min(channel.size for channel in channels)
+        self._pending[index] = [channel[length:] for channel in channels]
+        if length:
+            f.write(np.clip(np.stack([channel[:length] for channel in channels], axis=1), -1.0, 1.0))
+
+    def _flush_one(self, index: int) -> None:
+        # Whatever a channel still holds at the end; shorter channels are padded with silence
+        pending = self._pending[index]
+        length = max((channel.size for channel in pending), default=0)
+        if length:
+            block = np.stack([np.pad(channel, (0, length - channel.size)) for channel in pending], axis=1)
+            self._files[index][1].write(np.clip(block, -1.0, 1.0))
+        self._pending[index] = [channel[:0] for channel in pending]
+
+    def write(self, outputs: Dict[str, np.ndarray]) -> None:
+        """Append one block of stage outputs (keyed by stage) to every file."""
+        if self._pool is None:
+            for index in range(len(self._files)):
+                self._write_one(index, outputs)
+            return
+        futures = [self._pool.submit(self._write_one, index, outputs) for index in range(len(self._files))]
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """Write what multichannel files still hold, then finish every file (and the thread pool)."""
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown()
+            self._pool = None
+        for index, (_, f) in enumerate(self._files):
+            try:
+                if not f.closed:
+                    self._flush_one(index)
+            finally:
+                f.close()
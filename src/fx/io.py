@@ -0,0 +1,129 @@
+"""Audio decode/encode helpers for the FX pipeline"""
+from pathlib import Path
+from typing import Iterator, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SAMPLE_RATE = 44100
+
+
+def load_audio(
+    path: Union[str, Path],
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    mono: bool = True
+) -> np.ndarray:
+    """Decode an audio file to float32 at the target sample rate.
+
+    WAV/FLAC/OGG are read with soundfile; other formats (m4a, mp3) fall back to
+    ffmpeg via audioread. Decoding and resampling happen exactly once.
+
+    Args:
+        path: Input audio file
+        sample_rate: Target sample rate in Hz
+        mono: Downmix to mono
+
+    Returns:
+        Float32 samples, shape (n,) when mono, else (channels, n)
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    import librosa
+
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+
+    y, _ = librosa.load(str(path), sr=sample_rate, mono=mono, dtype=np.float32)
+    logger.debug("Decoded %s: %.2fs at %d Hz", path, y.shape[-1] / sample_rate, sample_rate)
+    return y
+
+
+def write_audio(
+    path: Union[str, Path],
+    y: np.ndarray,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    subtype: str = "PCM_16"
+) -> str:
+    """Write float audio to disk, clipping to full scale.
+
+    Args:
+        path: Output file; the format is inferred from the extension
+        y: Float samples, shape (n,) or (n, channels)
+        sample_rate: Sample rate in Hz
+        subtype: soundfile subtype (default: 16-bit PCM)
+
+    Returns:
+        Path to the written file
+    """
+    import soundfile as sf
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sf.write(str(path), np.clip(y, -1.0, 1.0), sample_rate, subtype=subtype)
+    return str(path)
+
+
+def _open_for_streaming(path: Union[str, Path]):
+    import soundfile as sf
+
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+    try:
+        return sf.SoundFile(str(path))
+    except sf.LibsndfileError as e:
+        raise ValueError(
+            f"Streaming needs a soundfile-readable format (WAV/FLAC/OGG), got {path}: {e}"
+        ) from e
+
+
+def stream_length(path: Union[str, Path], sample_rate: int = DEFAULT_SAMPLE_RATE) -> int:
+    """Number of samples ``iter_blocks`` yields for a file, from its header."""
+    with _open_for_streaming(path) as f:
+        return int(round(f.frames * sample_rate / f.samplerate))
+
+
+def iter_array_blocks(y: np.ndarray, blocksize: int = 65536) -> Iterator[np.ndarray]:
+    """Yield float32 copies of consecutive blocks of an (often memory-mapped) array."""
+    for start in range(0, y.shape[0], blocksize):
+        yield np.array(y[start:start + blocksize], dtype=np.float32)
+
+
+def iter_blocks(
+    path: Union[str, Path],
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    blocksize: int = 65536
+) -> Iterator[np.ndarray]:
+    """Stream an audio file as mono float32 blocks at the target sample rate.
+
+    Resampling is done with a stateful soxr stream, so block boundaries leave
+    no seams and memory use is bounded by ``blocksize``.
+
+    Args:
+        path: Input audio file (WAV/FLAC/OGG)
+        sample_rate: Target sample rate in Hz
+        blocksize: Frames read per block
+
+    Yields:
+        Mono float32 blocks
+    """
+    with _open_for_streaming(path) as f:
+        resampler = None
+        if f.samplerate != sample_rate:
+            import soxr
+
+            resampler = soxr.ResampleStream(f.samplerate, sample_rate, 1, dtype='float32')
+
+        for block in f.blocks(blocksize, dtype='float32', always_2d=True):
+            mono = np.ascontiguousarray(block.mean(axis=1), dtype=np.float32)
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono)
+            if mono.size:
+                yield mono
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            if tail.size:
+                yield tail
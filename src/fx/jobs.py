@@ -0,0 +1,337 @@
+"""Local background job queue for the FX chain, backed by SQLite"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.fx.cache import file_digest
+from src.fx.pipeline import HookFX
+from src.utils import get_logger, user_cache_dir
+
+logger = get_logger(__name__)
+
+DEFAULT_OUTPUT_ROOT = "output/jobs"
+PROGRESS_INTERVAL = 0.25  # Seconds between progress writes from a worker
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    input_path TEXT NOT NULL,
+    options TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    owner INTEGER,  -- pid of the submitting process, then of the worker running it
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job was cancelled."""
+
+
+@dataclass
+class Job:
+    """One row of the job table."""
+
+    id: str
+    input_path: str
+    output_dir: str
+    status: str
+    progress: float = 0.0
+    paths: Dict[str, str] = field(default_factory=dict)  # File stem -> path, once done
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job will not change any more."""
+        return self.status not in ACTIVE_STATES
+
+
+def default_db_path() -> Path:
+    """Per-user job table: ``$XDG_CACHE_HOME/riff-raff/jobs.sqlite3`` (``~/.cache`` if unset)."""
+    return user_cache_dir("jobs.sqlite3")
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def job_id(input_path: str, options: Dict[str, Any]) -> str:
+    """Identity of a job: the take's content hash plus its canonical options.
+
+    Submitting the same take with the same settings again yields the same
+    id, which is how duplicate jobs are detected.
+    """
+    token = json.dumps({"take": file_digest(input_path), "options": options}, sort_keys=True)
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _run_job(db_path: str, job: str) -> None:
+    """Worker: process one job, reporting progress and honouring cancellation.
+
+    The job is rendered into a staging directory that replaces the output
+    directory only on success, like batch processing.
+    """
+    with closing(_connect(db_path)) as conn:
+        with conn:
+            claimed = conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, updated = ? WHERE id = ? AND status = ?",
+                (RUNNING, os.getpid(), time.time(), job, QUEUED),
+            ).rowcount
+        if not claimed:
+            return  # Cancelled (or taken) before it started
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job,)).fetchone()
+
+        options = json.loads(row["options"])
+        final_dir = Path(row["output_dir"])
+        staging = final_dir.with_name(f".{final_dir.name}.partial-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        last_write = 0.0
+
+        def progress(fraction: float) -> None:
+            nonlocal last_write
+            now = time.monotonic()
+            if now - last_write < PROGRESS_INTERVAL and fraction < 1.0:
+                return
+            last_write = now
+            with conn:
+                status = conn.execute("SELECT status FROM jobs WHERE id = ?", (job,)).fetchone()[0]
+                if status == CANCELLED:
+                    raise JobCancelled(job)
+                conn.execute(
+                    "UPDATE jobs SET progress = ?, updated = ? WHERE id = ?", (fraction, time.time(), job)
+                )
+
+        try:
+            fx = HookFX(**options["fx"])
+            if fx.cache is not None:
+                fx.cache.load(row["input_path"], fx.sample_rate)  # Stream any format from the decode cache
+            result = fx.process_stream(row["input_path"], str(staging), progress=progress, **options["process"])
+            shutil.rmtree(final_dir, ignore_errors=True)
+            os.replace(staging, final_dir)
+            paths = {stem: str(final_dir / Path(path).name) for stem, path in result.paths.items()}
+            with conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, progress = 1, result = ?, updated = ? WHERE id = ?",
+                    (DONE, json.dumps({"paths": paths, "duration": result.duration}), time.time(), job),
+                )
+            logger.info(f"Job {job} done: {row['input_path']} ({result.duration:.1f}s)")
+        except JobCancelled:
+            logger.info(f"Job {job} cancelled")
+        except Exception as e:
+            logger.error(f"Job {job} failed: {e}")
+            with conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ? AND status = ?",
+                    (FAILED, str(e), time.time(), job, RUNNING),
+                )
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+class JobQueue:
+    """Runs the FX chain on takes in a process pool, tracked in a SQLite table.
+
+    The app submits a take and gets a job id back straight away, then polls
+    ``status`` (a single indexed read) until the job is finished; nothing
+    heavy happens in the calling process. Workers stream the take through
+    ``HookFX.process_stream`` and write their progress to the table, which
+    also persists results across restarts. Identical submissions (same take
+    content, same settings) share one job, and ``cancel`` stops a queued or
+    running job at its next block.
+
+    Example:
+        queue = JobQueue()
+        job = queue.submit("take.m4a", {"reverb": "convolution"})
+        queue.status(job).progress     # 0.0 .. 1.0
+        queue.status(job).paths        # Output files once done
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        output_root: str = DEFAULT_OUTPUT_ROOT,
+        workers: Optional[int] = None
+    ):
+        """Open (or create) the job table.
+
+        Jobs left queued or running by a process that has since exited are
+        marked failed, so resubmitting them runs them again.
+
+        Args:
+            db_path: SQLite file holding the job table (default:
+                ``$XDG_CACHE_HOME/riff-raff/jobs.sqlite3``, see ``default_db_path``)
+            output_root: Each job writes to ``<output_root>/<job id>/``
+            workers: Worker processes (default: all CPU cores)
+        """
+        self.db_path = db_path if db_path is not None else str(default_db_path())
+        self.output_root = output_root
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(_connect(self.db_path)) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            stale = [
+                row["id"] for row in conn.execute(
+                    "SELECT id, owner FROM jobs WHERE status IN (?, ?)", ACTIVE_STATES
+                )
+                if not _pid_alive(row["owner"])
+            ]
+            conn.executemany(
+                "UPDATE jobs SET status = ?, error = 'Interrupted' WHERE id = ?",
+                [(FAILED, job) for job in stale],
+            )
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers or os.cpu_count() or 1)
+        return self._pool
+
+    def submit(
+        self,
+        input_path: str,
+        fx_options: Optional[Dict[str, Any]] = None,
+        **process_options: Any
+    ) -> str:
+        """Queue a take unless an identical job is queued, running or done.
+
+        Args:
+            input_path: Recording to process (any format the decode cache reads)
+            fx_options: Keyword arguments for ``HookFX``
+            **process_options: Keyword arguments for ``HookFX.process_stream``
+                (e.g. ``export_stems``, ``previews``)
+
+        Returns:
+            Job id
+
+        Raises:
+            FileNotFoundError: If the take doesn't exist
+            ValueError: If the FX options are invalid
+        """
+        if not Path(input_path).exists():
+            raise FileNotFoundError(f"Audio file not found: {input_path}")
+        fx_options = HookFX(**(fx_options or {})).params()  # Validates and fills defaults
+        options = {"fx": fx_options, "process": process_options}
+        job = job_id(input_path, options)
+        output_dir = str(Path(self.output_root) / job)
+        now = time.time()
+
+        with closing(_connect(self.db_path)) as conn, conn:
+            row = conn.execute("SELECT status, result FROM jobs WHERE id = ?", (job,)).fetchone()
+            if row is not None and row["status"] in ACTIVE_STATES:
+                logger.debug(f"Job {job} already {row['status']}")
+                return job
+            if row is not None and row["status"] == DONE and self._outputs_exist(row["result"]):
+                logger.debug(f"Job {job} already done")
+                return job
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, input_path, options, output_dir, status, progress, "
+                "owner, created, updated) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (job, str(input_path), json.dumps(options), output_dir, QUEUED, os.getpid(), now, now),
+            )
+        self._executor().submit(_run_job, self.db_path, job)
+        logger.info(f"Queued job {job} for {input_path}")
+        return job
+
+    @staticmethod
+    def _outputs_exist(result: Optional[str]) -> bool:
+        paths = json.loads(result)["paths"] if result else {}
+        return bool(paths) and all(Path(path).exists() for path in paths.values())
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Job:
+        result = json.loads(row["result"]) if row["result"] else {}
+        return Job(
+            id=row["id"],
+            input_path=row["input_path"],
+            output_dir=row["output_dir"],
+            status=row["status"],
+            progress=row["progress"],
+            paths=result.get("paths", {}),
+            duration=result.get("duration", 0.0),
+            error=row["error"],
+        )
+
+    def status(self, job: str) -> Job:
+        """Current state of a job.
+
+        Raises:
+            KeyError: If the job is unknown
+        """
+        with closing(_connect(self.db_path)) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown job: {job}")
+        return self._job(row)
+
+    def jobs(self) -> List[Job]:
+        """Every job, newest first."""
+        with closing(_connect(self.db_path)) as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created DESC").fetchall()
+        return [self._job(row) for row in rows]
+
+    def cancel(self, job: str) -> bool:
+        """Cancel a queued or running job.
+
+        Returns:
+            True if the job was still active
+        """
+        with closing(_connect(self.db_path)) as conn, conn:
+            cancelled = conn.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, time.time(), job, *ACTIVE_STATES),
+            ).rowcount
+        return bool(cancelled)
+
+    def wait(self, job: str, timeout: Optional[float] = None, poll: float = 0.1) -> Job:
+        """Block until a job is finished (mostly for scripts and tests).
+
+        Raises:
+            TimeoutError: If the job is still active after ``timeout`` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self.status(job)
+            if state.finished:
+                return state
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job} still {state.status} after {timeout}s")
+            time.sleep(poll)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool (queued jobs stay in the table)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._pool = None
@@ -0,0 +1,498 @@
+"""Importable hook FX pipeline: normalize -> pitch -> double -> reverb -> mix -> master"""
+import inspect
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.fx.effects import (
+    Bypass,
+    ChorusDoubler,
+    ConvolutionReverb,
+    Doubler,
+    EchoReverb,
+    Effect,
+    PeakNormalize,
+    db_to_gain,
+)
+from src.fx.cache import DecodeCache
+from src.fx.export import EXPORT_FORMATS, EXPORT_LAYOUTS, ExportTarget, StemExporter, with_format
+from src.fx.io import (
+    DEFAULT_SAMPLE_RATE,
+    iter_array_blocks,
+    iter_blocks,
+    load_audio,
+    stream_length,
+)
+from src.fx.loudness import LoudnessMeter, LoudnessNormalize, Master, measure_loudness
+from src.fx.pitch import KEYS, SCALES, PitchCorrector
+from src.fx.preview import PreviewBuilder, build_preview
+from src.metrics import timed
+from src.profiling import profiled
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+MIX_FILENAME = "Z_Cavaricci_Hook_Stylized.wav"
+# Multichannel export: the mix and the stems, one per channel, in this order
+STEMS_FILENAME = "Z_Cavaricci_Hook_Stems.wav"
+STEMS_CHANNELS = ("mix", "dry", "doubled", "reverb")
+STEM_FILENAMES = {
+    "dry": "stem_dry.wav",
+    "doubled": "stem_doubled.wav",
+    "reverb": "stem_reverb.wav",
+}
+# Stages backed by an Effect node, in chain order ("mix" sums double and reverb
+# and feeds "master")
+NODE_STAGES = ("normalize", "pitch", "double", "reverb", "master")
+# Pipeline stage whose output each stem is
+STEM_STAGES = {"dry": "pitch", "doubled": "double", "reverb": "reverb"}
+REVERB_TYPES = ("echo", "convolution")
+DOUBLER_TYPES = ("slapback", "chorus")
+NORMALIZE_TYPES = ("peak", "loudness")
+INTERMEDIATE_FILENAMES = {
+    "normalize": "01_normalized.wav",
+    "pitch": "03_pitch_corrected.wav",
+    "double": "04_doubled.wav",
+    "reverb": "05_fx_reverb.wav",
+}
+
+
+@dataclass
+class FXResult:
+    """Output of one pipeline run."""
+
+    mix: np.ndarray
+    stems: Dict[str, np.ndarray] = field(default_factory=dict)
+    sample_rate: int = DEFAULT_SAMPLE_RATE
+    intermediates: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Length of the processed audio in seconds."""
+        return self.mix.size / self.sample_rate
+
+
+@dataclass
+class StreamResult:
+    """Summary of a streamed (block-by-block) pipeline run."""
+
+    duration: float
+    sample_rate: int
+    paths: Dict[str, str] = field(default_factory=dict)  # File stem -> path
+
+
+class HookFX:
+    """Stylized hook vocal chain that keeps audio in memory as float32.
+
+    The take is decoded once; every stage operates on NumPy arrays, and files
+    are only written for the final mix, the stems, and (on request) the
+    per-stage intermediates.
+
+    Unlike the original script, which normalized the source file before
+    converting it to 44.1 kHz mono, the take is downmixed and resampled
+    first and normalized after, so the peak the chain sees sits exactly
+    ``headroom_db`` below full scale (the streamed path measures the same).
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        headroom_db: float = 0.1,
+        double_delay_ms: float = 20.0,
+        double_level_db: float = -6.0,
+        reverb_taps: Sequence[Tuple[float, float]] = EchoReverb.DEFAULT_TAPS,
+        reverb_mix_db: float = -6.0,
+        reverb: str = "echo",
+        doubler: str = "slapback",
+        ir_path: Optional[str] = None,
+        reverb_wet_db: float = -12.0,
+        chorus_voices: int = 3,
+        pitch_correction: bool = True,
+        key: str = "C",
+        scale: str = "chromatic",
+        retune_ms: float = 40.0,
+        normalize: str = "peak",
+        target_lufs: float = -16.0,
+        master: bool = False,
+        master_lufs: float = -14.0,
+        ceiling_dbtp: float = -1.0,
+        export_layout: str = "files",
+        export_format: str = "wav",
+        cache_dir: Optional[str] = None
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            sample_rate: Processing sample rate in Hz
+            headroom_db: Peak normalization headroom
+            double_delay_ms: Doubler delay
+            double_level_db: Level of the doubled copy
+            reverb_taps: (delay in ms, level in dB) echo taps
+            reverb_mix_db: Level of the reverb stem in the final mix
+            reverb: Reverb node, "echo" (two-tap echo) or "convolution"
+            doubler: Doubler node, "slapback" (single delay) or "chorus"
+            ir_path: Impulse response file for convolution reverb (generated if omitted)
+            reverb_wet_db: Convolution reverb wet level
+            chorus_voices: Number of voices for the chorus doubler
+            pitch_correction: Run the pitch correction stage (bypassed when False)
+            key: Key the vocal is corrected to
+            scale: Scale the vocal is corrected to (see ``SCALES``)
+            retune_ms: Pitch correction glide time; 0 gives the hard-tune effect
+            normalize: Input normalization, "peak" (to ``headroom_db``) or
+                "loudness" (BS.1770 integrated loudness to ``target_lufs``)
+            target_lufs: Loudness normalization target
+            master: Run the mastering stage on the mix (bypassed when False)
+            master_lufs: Integrated loudness of the master
+            ceiling_dbtp: True-peak ceiling of the master's limiter
+            export_layout: "files" (mix and each stem in its own file) or
+                "multichannel" (mix and stems as the channels of one file,
+                see ``STEMS_CHANNELS``)
+            export_format: "wav" or "flac"
+            cache_dir: Decode cache directory, so re-running a take skips
+                decoding (e.g. ``str(default_cache_dir())``); None, the
+                default, always decodes and writes nothing
+
+        Raises:
+            ValueError: If reverb, doubler, normalize, key, scale or export
+                layout/format is not known
+        """
+        if reverb not in REVERB_TYPES:
+            raise ValueError(f"Invalid reverb: {reverb}. Must be one of {', '.join(REVERB_TYPES)}")
+        if doubler not in DOUBLER_TYPES:
+            raise ValueError(f"Invalid doubler: {doubler}. Must be one of {', '.join(DOUBLER_TYPES)}")
+        if normalize not in NORMALIZE_TYPES:
+            raise ValueError(f"Invalid normalize: {normalize}. Must be one of {', '.join(NORMALIZE_TYPES)}")
+        if export_layout not in EXPORT_LAYOUTS:
+            raise ValueError(
+                f"Invalid export layout: {export_layout}. Must be one of {', '.join(EXPORT_LAYOUTS)}"
+            )
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Invalid export format: {export_format}. Must be one of {', '.join(EXPORT_FORMATS)}"
+            )
+        if key not in KEYS:
+            raise ValueError(f"Invalid key: {key}. Must be one of {', '.join(KEYS)}")
+        if scale not in SCALES:
+            raise ValueError(f"Invalid scale: {scale}. Must be one of {', '.join(SCALES)}")
+
+        self.sample_rate = sample_rate
+        self.headroom_db = headroom_db
+        self.double_delay_ms = double_delay_ms
+        self.double_level_db = double_level_db
+        self.reverb_taps = tuple(reverb_taps)
+        self.reverb_mix_db = reverb_mix_db
+        self.reverb = reverb
+        self.doubler = doubler
+        self.ir_path = ir_path
+        self.reverb_wet_db = reverb_wet_db
+        self.chorus_voices = chorus_voices
+        self.pitch_correction = pitch_correction
+        self.key = key
+        self.scale = scale
+        self.retune_ms = retune_ms
+        self.normalize = normalize
+        self.target_lufs = target_lufs
+        self.master = master
+        self.master_lufs = master_lufs
+        self.ceiling_dbtp = ceiling_dbtp
+        self.export_layout = export_layout
+        self.export_format = export_format
+        self.cache_dir = cache_dir
+        self.cache = DecodeCache(cache_dir) if cache_dir else None
+        self._ir: Optional[np.ndarray] = None
+
+    def params(self) -> Dict[str, Any]:
+        """Constructor arguments of this pipeline, e.g. to build a tweaked copy."""
+        names = inspect.signature(HookFX.__init__).parameters
+        return {name: getattr(self, name) for name in names if name != "self"}
+
+    def _impulse_response(self) -> Optional[np.ndarray]:
+        """Decode the IR file once per pipeline instance."""
+        if self.ir_path and self._ir is None:
+            if self.cache is not None:
+                self._ir = self.cache.load(self.ir_path, self.sample_rate)
+            else:
+                self._ir = load_audio(self.ir_path, self.sample_rate)
+        return self._ir
+
+    @property
+    def mix_filename(self) -> str:
+        """Name of the file the final mix is exported to."""
+        if self.export_layout == "multichannel":
+            return with_format(STEMS_FILENAME, self.export_format)
+        return with_format(MIX_FILENAME, self.export_format)
+
+    def export_targets(self, write_intermediates: bool, export_stems: bool) -> List[ExportTarget]:
+        """Files written by one run, as (filename, stages) pairs for ``StemExporter``."""
+        stems = [(name, STEM_STAGES[name]) for name in STEM_FILENAMES] if export_stems else []
+        if self.export_layout == "multichannel":
+            targets = [(STEMS_FILENAME, ("master",) + tuple(stage for _, stage in stems))]
+        else:
+            targets = [(MIX_FILENAME, ("master",))]
+            targets += [(STEM_FILENAMES[name], (stage,)) for name, stage in stems]
+        if write_intermediates:
+            targets += [(filename, (stage,)) for stage, filename in INTERMEDIATE_FILENAMES.items()]
+        return targets
+
+    def build_node(self, stage: str, level: Optional[float] = None) -> Effect:
+        """Create a fresh (stateless-at-start) node for one stage.
+
+        Args:
+            stage: One of ``NODE_STAGES``
+            level: Known level of the stage input for the level-dependent
+                stages: the peak (or, for ``normalize="loudness"``, the
+                loudness in LUFS) of the take for ``normalize``, the loudness
+                of the mix for ``master``. When omitted the node measures the
+                first block it sees
+
+        Raises:
+            ValueError: If the stage is unknown
+        """
+        if stage == "normalize":
+            if self.normalize == "loudness":
+                return LoudnessNormalize(self.target_lufs, self.sample_rate, level)
+            normalize = PeakNormalize(self.headroom_db)
+            if level is not None:
+                normalize.measure(level)
+            return normalize
+
+        if stage == "pitch":
+            if self.pitch_correction:
+                return PitchCorrector(self.key, self.scale, self.retune_ms, self.sample_rate)
+            return Bypass()
+
+        if stage == "double":
+            if self.doubler == "chorus":
+                return ChorusDoubler(
+                    self.chorus_voices, self.double_delay_ms, level_db=self.double_level_db,
+                    sample_rate=self.sample_rate
+                )
+            return Doubler(self.double_delay_ms, self.double_level_db, self.sample_rate)
+
+        if stage == "reverb":
+            if self.reverb == "convolution":
+                return ConvolutionReverb(
+                    self._impulse_response(), self.sample_rate, wet_db=self.reverb_wet_db
+                )
+            return EchoReverb(self.reverb_taps, self.sample_rate)
+
+        if stage == "master":
+            if self.master:
+                return Master(self.master_lufs, self.ceiling_dbtp, self.sample_rate, level)
+            return Bypass()
+
+        raise ValueError(f"Invalid stage: {stage}. Must be one of {', '.join(NODE_STAGES)}")
+
+    def build_nodes(
+        self,
+        level: Optional[float] = None,
+        mix_loudness: Optional[float] = None
+    ) -> Dict[str, Effect]:
+        """Create fresh nodes for every stage of one run.
+
+        Args:
+            level: Known input level for ``normalize`` (see ``build_node``)
+            mix_loudness: Known loudness of the mix for ``master``
+
+        Unknown levels are measured from the first block each node sees.
+        """
+        levels = {"normalize": level, "master": mix_loudness}
+        return {stage: self.build_node(stage, levels.get(stage)) for stage in NODE_STAGES}
+
+    def mix(self, doubled: np.ndarray, reverb: np.ndarray) -> np.ndarray:
+        """Sum the doubled vocal and the reverb at ``reverb_mix_db``."""
+        return doubled + db_to_gain(self.reverb_mix_db) * reverb
+
+    def run_nodes(
+        self,
+        nodes: Dict[str, Effect],
+        y: np.ndarray,
+        final: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """Push one block through the chain.
+
+        Args:
+            nodes: Nodes from ``build_nodes``
+            y: Mono float32 block (may be empty when only flushing)
+            final: This is the last block; flush output nodes held back
+
+        Returns:
+            Output of every stage, keyed by stage name, plus ``mix``
+            (the final output is ``master``)
+        """
+        def step(stage: str, x: np.ndarray) -> np.ndarray:
+            with timed("fx." + stage):
+                out = nodes[stage].process(x)
+                return np.concatenate([out, nodes[stage].flush()]) if final else out
+
+        normalized = step("normalize", y)
+        clean = step("pitch", normalized)
+        doubled = step("double", clean)
+        reverb = step("reverb", clean)
+        with timed("fx.mix"):
+            mix = self.mix(doubled, reverb)
+        return {
+            "normalize": normalized,
+            "pitch": clean,
+            "double": doubled,
+            "reverb": reverb,
+            "mix": mix,
+            "master": step("master", mix),
+        }
+
+    def process(self, y: np.ndarray) -> FXResult:
+        """Process a whole take held in memory.
+
+        Args:
+            y: Mono audio at ``sample_rate``
+
+        Returns:
+            Final mix and dry/doubled/reverb stems
+        """
+        outputs = self.run_nodes(self.build_nodes(), np.asarray(y, dtype=np.float32), final=True)
+        return FXResult(
+            mix=outputs["master"],
+            stems={name: outputs[stage] for name, stage in STEM_STAGES.items()},
+            sample_rate=self.sample_rate,
+            intermediates=outputs,
+        )
+
+    @timed("fx.process_file")
+    @profiled("fx.process_file")
+    def process_file(
+        self,
+        input_path: str,
+        output_dir: Optional[str] = "output",
+        write_intermediates: bool = False,
+        export_stems: bool = True,
+        previews: bool = False
+    ) -> FXResult:
+        """Decode a take, process it and export the results.
+
+        Decoding goes through the decode cache when enabled, so only the
+        first run on a take pays for ffmpeg and resampling.
+
+        Args:
+            input_path: Recording to process (any format librosa/ffmpeg can read)
+            output_dir: Where to write outputs; None keeps everything in memory
+            write_intermediates: Also write each stage's output (01_..05_ files)
+            export_stems: Write dry/doubled/reverb stems next to the mix
+                (or, with the multichannel layout, into the mix file)
+            previews: Write waveform/spectrogram sidecars of the mix (see
+                ``src.fx.preview``)
+
+        Returns:
+            The processed result
+        """
+        if self.cache is not None:
+            y = self.cache.load(input_path, self.sample_rate)
+        else:
+            y = load_audio(input_path, self.sample_rate)
+        result = self.process(y)
+
+        if output_dir is not None:
+            targets = self.export_targets(write_intermediates, export_stems)
+            with StemExporter(output_dir, targets, self.sample_rate, self.export_format) as exporter:
+                exporter.write(result.intermediates)
+            if previews:
+                build_preview(result.mix, self.sample_rate).save(Path(output_dir) / self.mix_filename)
+            logger.info("Processed %s (%.1fs) into %s", input_path, result.duration, output_dir)
+
+        return result
+
+    @timed("fx.process_stream")
+    @profiled("fx.process_stream")
+    def process_stream(
+        self,
+        input_path: str,
+        output_dir: str = "output",
+        write_intermediates: bool = False,
+        export_stems: bool = True,
+        blocksize: int = 65536,
+        previews: bool = False,
+        progress: Optional[Callable[[float], None]] = None
+    ) -> StreamResult:
+        """Process a long recording block by block with bounded memory.
+
+        A first cheap pass measures the peak (or loudness) for normalization;
+        with ``master`` on, a second pass meters the loudness of the mix. The
+        final pass streams blocks through the chain (delay lines and reverb
+        tails carry across block boundaries) and appends each output as it is
+        produced, so peak memory does not depend on the recording length.
+        Output the pitch corrector and limiter hold back is flushed at the
+        end, so files match ``process_file``.
+
+        Args:
+            input_path: Recording to process (WAV/FLAC/OGG)
+            output_dir: Where to write outputs
+            write_intermediates: Also write each stage's output (01_..05_ files)
+            export_stems: Write dry/doubled/reverb stems next to the mix
+            blocksize: Frames read per block
+            previews: Write waveform/spectrogram sidecars of the mix
+            progress: Called after every block of the chain passes with the
+                fraction done (0-1); exceptions it raises abort the run
+
+        Returns:
+            Duration, sample rate and paths of the written files
+        """
+        # A cached decode is read straight from the memory map; streaming never fills the cache
+        cached = self.cache.get(input_path, self.sample_rate) if self.cache is not None else None
+        if cached is not None:
+            def blocks():
+                return iter_array_blocks(cached, blocksize)
+        else:
+            def blocks():
+                return iter_blocks(input_path, self.sample_rate, blocksize)
+
+        passes = 2 if self.master else 1
+        total = max(1, cached.shape[0] if cached is not None else stream_length(input_path, self.sample_rate))
+
+        def report(chain_pass: int, done: int) -> None:
+            if progress is not None:
+                progress(min(1.0, (chain_pass + done / total) / passes))
+
+        # Measured on the resampled blocks, like process_file measures the loaded take
+        if self.normalize == "loudness":
+            level = measure_loudness(blocks(), self.sample_rate)
+        else:
+            level = max((float(np.abs(b).max()) for b in blocks()), default=0.0)
+
+        mix_loudness = None
+        if self.master:
+            # The master gain depends on the loudness of the whole mix, so
+            # meter it with one extra pass through the chain
+            nodes = self.build_nodes(level)
+            meter = LoudnessMeter(self.sample_rate)
+            metered = 0
+            for block in blocks():
+                meter.process(self.run_nodes(nodes, block)["mix"])
+                metered += block.size
+                report(0, metered)
+            meter.process(self.run_nodes(nodes, np.zeros(0, dtype=np.float32), final=True)["mix"])
+            mix_loudness = meter.integrated()
+
+        nodes = self.build_nodes(level, mix_loudness)
+
+        samples = 0
+        preview = PreviewBuilder(self.sample_rate) if previews else None
+        targets = self.export_targets(write_intermediates, export_stems)
+        with StemExporter(output_dir, targets, self.sample_rate, self.export_format) as exporter:
+            def write(outputs: Dict[str, np.ndarray]) -> None:
+                exporter.write(outputs)
+                if preview is not None:
+                    preview.process(outputs["master"])
+
+            for block in blocks():
+                write(self.run_nodes(nodes, block))
+                samples += block.size
+                report(passes - 1, samples)
+            write(self.run_nodes(nodes, np.zeros(0, dtype=np.float32), final=True))
+
+        paths = dict(exporter.paths)
+        if preview is not None:
+            paths.update(preview.finish().save(Path(output_dir) / self.mix_filename))
+        result = StreamResult(samples / self.sample_rate, self.sample_rate, paths)
+        logger.info("Streamed %s (%.1fs) into %s", input_path, result.duration, output_dir)
+        return result
@@ -0,0 +1,376 @@
+"""Vectorized pitch correction: YIN f0 tracking, scale snapping, PSOLA resynthesis"""
+from typing import Dict, Tuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+from src.fx.effects import Effect
+
+SCALES: Dict[str, Tuple[int, ...]] = {
+    "chromatic": tuple(range(12)),
+    "major": (0, 2, 4, 5, 7, 9, 11),
+    "minor": (0, 2, 3, 5, 7, 8, 10),
+    "minor_pentatonic": (0, 3, 5, 7, 10),
+}
+KEYS: Dict[str, int] = {
+    "C": 0, "C#": 1, "Db": 1, "D": 2, "D#": 3, "Eb": 3, "E": 4, "F": 5, "F#": 6,
+    "Gb": 6, "G": 7, "G#": 8, "Ab": 8, "A": 9, "A#": 10, "Bb": 10, "B": 11,
+}
+
+
+def hz_to_midi(f0: np.ndarray) -> np.ndarray:
+    """Convert frequencies in Hz to (fractional) MIDI note numbers."""
+    return 69.0 + 12.0 * np.log2(f0 / 440.0)
+
+
+def yin(
+    frames: np.ndarray,
+    sample_rate: int,
+    fmin: float = 70.0,
+    fmax: float = 1000.0,
+    threshold: float = 0.15
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Estimate f0 for a batch of frames with the YIN algorithm.
+
+    The difference function of every frame is computed at once from an
+    FFT cross-correlation plus running energy sums.
+
+    Args:
+        frames: (n_frames, frame_length) analysis frames
+        sample_rate: Sample rate in Hz
+        fmin: Lowest detectable pitch
+        fmax: Highest detectable pitch
+        threshold: Cumulative-mean-normalized difference threshold
+
+    Returns:
+        Tuple of (f0 in Hz, voiced mask); unvoiced frames have f0 = 0
+    """
+    n_frames, frame_length = frames.shape
+    tau_min = max(1, int(sample_rate / fmax))
+    tau_max = min(int(sample_rate / fmin), frame_length // 2)
+    window = frame_length - tau_max
+    if n_frames == 0:
+        return np.zeros(0), np.zeros(0, dtype=bool)
+
+    frames = frames.astype(np.float64, copy=False)
+    n_fft = 1 << int(np.ceil(np.log2(frame_length + window)))
+    spectrum = np.fft.rfft(frames, n_fft, axis=1)
+    spectrum *= np.conj(np.fft.rfft(frames[:, :window], n_fft, axis=1))
+    acf = np.fft.irfft(spectrum, n_fft, axis=1)[:, :tau_max + 1]
+    del spectrum
+
+    energy = np.concatenate([np.zeros((n_frames, 1)), np.cumsum(frames ** 2, axis=1)], axis=1)
+    taus = np.arange(tau_max + 1)
+    shifted = energy[:, taus + window] - energy[:, taus]
+    diff = np.maximum(shifted[:, :1] + shifted - 2.0 * acf, 0.0)
+
+    cmndf = np.ones_like(diff)
+    running = np.cumsum(diff[:, 1:], axis=1)
+    cmndf[:, 1:] = diff[:, 1:] * taus[1:] / np.maximum(running, 1e-12)
+
+    # First dip below threshold that is also a local minimum, else the global minimum
+    search = cmndf[:, tau_min:tau_max]
+    local_min = np.zeros_like(search, dtype=bool)
+    local_min[:, :-1] = search[:, :-1] <= search[:, 1:]
+    candidates = (search < threshold) & local_min
+    has_dip = candidates.any(axis=1)
+    best = np.where(has_dip, candidates.argmax(axis=1), search.argmin(axis=1))
+    tau = best + tau_min
+
+    # Parabolic interpolation around the chosen lag
+    rows = np.arange(n_frames)
+    left = cmndf[rows, np.maximum(tau - 1, 0)]
+    centre = cmndf[rows, tau]
+    right = cmndf[rows, np.minimum(tau + 1, tau_max)]
+    denom = left - 2 * centre + right
+    offset = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / np.where(denom == 0, 1, denom), 0.0)
+    refined = tau + np.clip(offset, -1.0, 1.0)
+
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    voiced = has_dip & (rms > 1e-3)
+    f0 = np.where(voiced, sample_rate / refined, 0.0)
+    return f0, voiced
+
+
+def estimate_f0(
+    y: np.ndarray,
+    sample_rate: int = 44100,
+    frame_length: int = 2048,
+    hop_length: int = 512,
+    fmin: float = 70.0,
+    fmax: float = 1000.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Track f0 over a signal with centered, frame-batched YIN.
+
+    Args:
+        y: Mono audio
+        sample_rate: Sample rate in Hz
+        frame_length: Analysis window length
+        hop_length: Frame hop
+        fmin: Lowest detectable pitch
+        fmax: Highest detectable pitch
+
+    Returns:
+        Tuple of (f0 in Hz per frame, voiced mask)
+    """
+    padded = np.pad(np.asarray(y, dtype=np.float64), frame_length // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, frame_length)[::hop_length]
+    return yin(frames[: y.size // hop_length + 1], sample_rate, fmin, fmax)
+
+
+def snap_to_scale(midi: np.ndarray, key: str = "C", scale: str = "chromatic") -> np.ndarray:
+    """Snap fractional MIDI notes to the nearest note of a key/scale.
+
+    Args:
+        midi: Fractional MIDI note numbers
+        key: Tonic name (e.g. "C", "F#", "Bb")
+        scale: One of ``SCALES``
+
+    Returns:
+        Target MIDI note numbers
+
+    Raises:
+        ValueError: If the key or scale is unknown
+    """
+    if key not in KEYS:
+        raise ValueError(f"Invalid key: {key}. Must be one of {', '.join(KEYS)}")
+    if scale not in SCALES:
+        raise ValueError(f"Invalid scale: {scale}. Must be one of {', '.join(SCALES)}")
+
+    tonic = KEYS[key]
+    degrees = np.array(SCALES[scale] + (SCALES[scale][0] + 12,), dtype=np.float64)
+    relative = np.asarray(midi, dtype=np.float64) - tonic
+    octave = np.floor(relative / 12.0)
+    pitch_class = relative - 12.0 * octave
+    nearest = degrees[np.abs(pitch_class[..., None] - degrees).argmin(axis=-1)]
+    snapped: np.ndarray = tonic + 12.0 * octave + nearest
+    return snapped
+
+
+class PitchCorrector(Effect):
+    """Automatic pitch correction by pitch-synchronous overlap-add (TD-PSOLA).
+
+    Every analysis hop the corrector estimates f0 with YIN, snaps it to the
+    chosen key/scale and smooths the correction with a one-pole glide (the
+    retune speed). Analysis pitch marks follow the detected pitch, synthesis
+    marks follow the corrected pitch; each synthesis mark takes the
+    two-period Hann grain around the nearest analysis mark. Analysis, mark
+    placement and grain overlap-add are vectorized per block.
+
+    Output is time-aligned with the input, but the last ``latency`` samples
+    are held back until grains can see the input they need; ``flush``
+    releases them at the end of the take.
+    """
+
+    BATCH = 8  # Frames (or grains) per vectorized batch, bounds temporary memory
+    UNVOICED_HZ = 150.0  # Mark rate used where no pitch is detected
+
+    def __init__(
+        self,
+        key: str = "C",
+        scale: str = "chromatic",
+        retune_ms: float = 40.0,
+        sample_rate: int = 44100,
+        frame_length: int = 2048,
+        hop_length: int = 256,
+        max_shift: float = 2.0,
+        fmin: float = 70.0,
+        fmax: float = 1000.0
+    ):
+        """Initialize the corrector.
+
+        Args:
+            key: Tonic name
+            scale: Scale name from ``SCALES``
+            retune_ms: Glide time constant; 0 snaps instantly (hard-tune effect)
+            sample_rate: Sample rate in Hz
+            frame_length: YIN analysis window
+            hop_length: Analysis hop
+            max_shift: Largest correction applied, in semitones
+            fmin: Lowest detectable pitch
+            fmax: Highest detectable pitch
+
+        Raises:
+            ValueError: If the key or scale is unknown, or the analysis
+                window cannot hold two periods of ``fmin``
+        """
+        snap_to_scale(np.zeros(1), key, scale)  # Validate early
+        self.key = key
+        self.scale = scale
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.hop = hop_length
+        self.max_shift = max_shift
+        self.fmin = fmin
+        self.fmax = fmax
+        self.alpha = 1.0 if retune_ms <= 0 else float(
+            1.0 - np.exp(-hop_length / (retune_ms / 1000.0 * sample_rate))
+        )
+        self.max_period = int(np.ceil(sample_rate / fmin))
+        if frame_length // 2 < self.max_period:
+            raise ValueError(f"frame_length {frame_length} is too short for fmin {fmin} Hz")
+
+        self.latency = frame_length // 2 + hop_length + 2 * self.max_period
+        self._taps = np.arange(-self.max_period, self.max_period + 1)
+        self.reset()
+
+    def reset(self) -> None:
+        pad = self.frame_length // 2 + self.max_period
+        self._buf_start = -pad
+        self._buf = np.zeros(pad, dtype=np.float64)  # Zero history before t=0
+        self._next_frame = 0
+        self._phase = np.full(2, -1e-9)  # (analysis, synthesis); a mark falls on sample 0
+        self._glide = 0.0
+        self._analysis_marks = np.zeros(0, dtype=np.int64)
+        self._analysis_periods = np.zeros(0)
+        self._synthesis_marks = np.zeros(0, dtype=np.int64)
+        self._acc_start = -self.max_period
+        self._acc = np.zeros((2, 0))  # (window-weighted signal, window sum)
+        self._emitted_to = 0
+        self._out = np.zeros(0, dtype=np.float32)  # Final samples not yet returned
+        self._received = 0
+        self._returned = 0
+
+    def _corrections(self, f0: np.ndarray, voiced: np.ndarray) -> np.ndarray:
+        """Glide-smoothed per-frame correction in semitones."""
+        target = np.zeros(f0.size)
+        if voiced.any():
+            midi = hz_to_midi(f0[voiced])
+            target[voiced] = np.clip(
+                snap_to_scale(midi, self.key, self.scale) - midi, -self.max_shift, self.max_shift
+            )
+        smoothed, _ = lfilter(
+            [self.alpha], [1.0, self.alpha - 1.0], target, zi=[(1.0 - self.alpha) * self._glide]
+        )
+        self._glide = smoothed[-1]
+        return np.asarray(smoothed)
+
+    def _analyse(self, first: int, count: int) -> None:
+        """Track pitch for frames [first, first + count) and place their marks."""
+        h, half = self.hop, self.frame_length // 2
+        starts = (first + np.arange(count)) * h + h // 2 - half - self._buf_start
+        frames = np.lib.stride_tricks.sliding_window_view(self._buf, self.frame_length)[starts]
+        f0, voiced = yin(frames, self.sample_rate, self.fmin, self.fmax)
+
+        f_in = np.clip(np.where(voiced, f0, self.UNVOICED_HZ), self.fmin, self.fmax)
+        f_out = np.clip(f_in * 2.0 ** (self._corrections(f0, voiced) / 12.0), self.fmin, None)
+
+        # Per-sample phase in periods; a mark sits wherever the phase crosses an integer
+        rates = np.repeat(np.stack([f_in, f_out]) / self.sample_rate, h, axis=1)
+        phase = self._phase[:, None] + np.cumsum(rates, axis=1)
+        previous = np.concatenate([self._phase[:, None], phase[:, :-1]], axis=1)
+        crossed = np.floor(phase) > np.floor(previous)
+
+        analysis = np.flatnonzero(crossed[0])
+        synthesis = np.flatnonzero(crossed[1])
+        self._analysis_marks = np.concatenate([self._analysis_marks, first * h + analysis])
+        self._analysis_periods = np.concatenate([self._analysis_periods, 1.0 / rates[0, analysis]])
+        self._synthesis_marks = np.concatenate([self._synthesis_marks, first * h + synthesis])
+        self._phase = phase[:, -1] - np.floor(phase[:, -1])
+
+    def _grow(self, end: int) -> None:
+        """Extend the accumulator to cover samples before ``end``."""
+        missing = end - self._acc_start - self._acc.shape[1]
+        if missing > 0:
+            self._acc = np.pad(self._acc, ((0, 0), (0, missing)))
+
+    def _render(self, marks: np.ndarray) -> None:
+        """Overlap-add the grain for every synthesis mark into the accumulator."""
+        analysis = self._analysis_marks
+        hi = np.clip(np.searchsorted(analysis, marks), 0, analysis.size - 1)
+        lo = np.maximum(hi - 1, 0)
+        nearest = np.where(np.abs(analysis[hi] - marks) < np.abs(analysis[lo] - marks), hi, lo)
+        sources = analysis[nearest]
+        periods = self._analysis_periods[nearest][:, None]
+
+        taps = self._taps[None, :]
+        window = np.where(np.abs(taps) < periods, 0.5 + 0.5 * np.cos(np.pi * taps / periods), 0.0)
+        grains = self._buf[(sources - self._buf_start)[:, None] + taps] * window
+
+        dest = (marks - self._acc_start)[:, None] + taps
+        first = int(dest[0, 0])
+        span = int(dest[-1, -1]) + 1 - first
+        local = (dest - first).ravel()
+        self._acc[0, first:first + span] += np.bincount(local, grains.ravel(), minlength=span)
+        self._acc[1, first:first + span] += np.bincount(local, window.ravel(), minlength=span)
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        self._ingest(x)
+        self._received += x.size
+        return self._take(max(0, self._received - self.latency) - self._returned)
+
+    def flush(self) -> np.ndarray:
+        # Trailing silence lets every held-back grain complete
+        self._ingest(np.zeros(self.latency, dtype=np.float32))
+        return self._take(self._received - self._returned)
+
+    def _take(self, n: int) -> np.ndarray:
+        out, self._out = self._out[:n], self._out[n:]
+        self._returned += n
+        return out
+
+    def _ingest(self, x: np.ndarray) -> None:
+        """Analyse and resynthesize a block, queueing samples that became final."""
+        h, half, reach = self.hop, self.frame_length // 2, self.max_period
+        self._buf = np.concatenate([self._buf, np.asarray(x, dtype=np.float64)])
+        available = self._buf_start + self._buf.size
+
+        # Frame k needs input up to the end of its centred analysis window
+        last_frame = (available - half - h // 2) // h
+        while self._next_frame <= last_frame:
+            count = min(self.BATCH, last_frame - self._next_frame + 1)
+            self._analyse(self._next_frame, count)
+            self._next_frame += count
+        known_to = self._next_frame * h  # Marks are placed for samples before this
+
+        # A synthesis mark is ready once every analysis mark it could pick is known
+        ready = np.searchsorted(self._synthesis_marks, known_to - reach, side='right')
+        if ready:
+            self._grow(self._synthesis_marks[ready - 1] + reach + 1)
+        for i in range(0, ready, self.BATCH):
+            self._render(self._synthesis_marks[i:min(i + self.BATCH, ready)])
+        self._synthesis_marks = self._synthesis_marks[ready:]
+
+        # Samples before the earliest future grain receive no more contributions
+        next_mark = self._synthesis_marks[0] if self._synthesis_marks.size else known_to
+        final_to = next_mark - reach
+        if final_to > self._emitted_to:
+            self._grow(final_to)
+            lo, hi = self._emitted_to - self._acc_start, final_to - self._acc_start
+            signal, weight = self._acc[:, lo:hi]
+            corrected = np.divide(signal, weight, out=np.zeros_like(signal), where=weight > 1e-6)
+            self._out = np.concatenate([self._out, corrected.astype(np.float32)])
+            self._acc = self._acc[:, hi:]
+            self._acc_start = self._emitted_to = final_to
+
+        # Drop marks and input no future grain or frame will read
+        keep = max(np.searchsorted(self._analysis_marks, next_mark - 2 * reach) - 1, 0)
+        self._analysis_marks = self._analysis_marks[keep:]
+        self._analysis_periods = self._analysis_periods[keep:]
+        keep_from = min(next_mark - 3 * reach, self._next_frame * h + h // 2 - half)
+        if keep_from > self._buf_start:
+            self._buf = self._buf[keep_from - self._buf_start:]
+            self._buf_start = keep_from
+
+
+def correct_pitch(
+    y: np.ndarray,
+    sample_rate: int = 44100,
+    key: str = "C",
+    scale: str = "chromatic",
+    retune_ms: float = 40.0
+) -> np.ndarray:
+    """Pitch-correct a whole take.
+
+    Args:
+        y: Mono audio
+        sample_rate: Sample rate in Hz
+        key: Tonic name
+        scale: Scale name from ``SCALES``
+        retune_ms: Glide time constant; 0 snaps instantly
+
+    Returns:
+        Corrected audio, same length as the input
+    """
+    node = PitchCorrector(key, scale, retune_ms, sample_rate)
+    return np.concatenate([node.process(np.asarray(y, dtype=np.float32)), node.flush()])
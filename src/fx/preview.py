@@ -0,0 +1,235 @@
+"""Waveform and spectrogram previews stored as small ``.npy`` sidecars"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+PEAK_BASE = 256  # Samples per bin at the finest pyramid level
+PEAK_FACTOR = 4  # Each level has PEAK_FACTOR times fewer bins than the one below
+PEAK_MIN_BINS = 256  # Coarsest level stops once it is this small
+MEL_N_FFT = 4096
+MEL_HOP = 2048
+MEL_BANDS = 64
+MEL_FLOOR_DB = -100.0
+
+
+def preview_paths(audio_path: Union[str, Path]) -> Dict[str, Path]:
+    """Sidecar files of an exported audio file, keyed "peaks", "mel" and "meta"."""
+    audio_path = Path(audio_path)
+    base = audio_path.with_suffix("")
+    return {
+        "peaks": base.with_name(f"{base.name}.peaks.npy"),
+        "mel": base.with_name(f"{base.name}.mel.npy"),
+        "meta": base.with_name(f"{base.name}.preview.json"),
+    }
+
+
+def _decimate(level: np.ndarray, factor: int) -> np.ndarray:
+    """Next pyramid level: min of mins and max of maxes over ``factor`` bins."""
+    pad = -len(level) % factor
+    if pad:
+        level = np.concatenate([level, np.repeat(level[-1:], pad, axis=0)])
+    grouped = level.reshape(-1, factor, 2)
+    return np.stack([grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], axis=1)
+
+
+class PreviewBuilder:
+    """Builds a preview from a signal fed whole or block by block.
+
+    The finest peak level (min/max per ``PEAK_BASE`` samples) and the
+    log-mel frames are computed as blocks arrive, carrying partial bins and
+    frame overlap across calls, so streamed and offline previews are the
+    same. Coarser levels are decimated from the finest one, never from the
+    audio.
+    """
+
+    def __init__(self, sample_rate: int):
+        import librosa
+
+        self.sample_rate = sample_rate
+        self._mel_basis: np.ndarray = librosa.filters.mel(sr=sample_rate, n_fft=MEL_N_FFT, n_mels=MEL_BANDS)
+        self._window = np.hanning(MEL_N_FFT)
+        self._samples = 0
+        self._peak_partial = np.zeros(0, dtype=np.float32)
+        self._peaks: List[np.ndarray] = []
+        self._mel_pending = np.zeros(0, dtype=np.float32)  # From the next frame start on
+        self._mel: List[np.ndarray] = []
+
+    def _mel_frames(self, frames: np.ndarray) -> np.ndarray:
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        mel = self._mel_basis @ power.T
+        db: np.ndarray = np.maximum(10.0 * np.log10(np.maximum(mel, 1e-10)), MEL_FLOOR_DB)
+        return db.astype(np.float16)
+
+    def process(self, x: np.ndarray) -> None:
+        """Add one block of mono audio."""
+        x = np.asarray(x, dtype=np.float32)
+        self._samples += x.size
+
+        samples = np.concatenate([self._peak_partial, x])
+        whole = samples.size - samples.size % PEAK_BASE
+        if whole:
+            bins = samples[:whole].reshape(-1, PEAK_BASE)
+            self._peaks.append(np.stack([bins.min(axis=1), bins.max(axis=1)], axis=1))
+        self._peak_partial = samples[whole:]
+
+        pending = np.concatenate([self._mel_pending, x])
+        if pending.size >= MEL_N_FFT:
+            count = (pending.size - MEL_N_FFT) // MEL_HOP + 1
+            frames = np.lib.stride_tricks.sliding_window_view(pending, MEL_N_FFT)[::MEL_HOP][:count]
+            self._mel.append(self._mel_frames(frames))
+            pending = pending[count * MEL_HOP:]
+        self._mel_pending = pending
+
+    def finish(self) -> "Preview":
+        """Flush partial bins and frames and build the pyramid."""
+        peaks = list(self._peaks)
+        if self._peak_partial.size:
+            peaks.append(np.array([[self._peak_partial.min(), self._peak_partial.max()]]))
+        level = np.concatenate(peaks).astype(np.float32) if peaks else np.zeros((0, 2), np.float32)
+        levels = [level]
+        while len(levels[-1]) > PEAK_MIN_BINS:
+            levels.append(_decimate(levels[-1], PEAK_FACTOR))
+
+        frames = list(self._mel)
+        covered = MEL_N_FFT - MEL_HOP if frames else 0  # Pending samples already in a frame
+        if self._mel_pending.size > covered:
+            tail = np.zeros(MEL_N_FFT, dtype=np.float32)
+            tail[:self._mel_pending.size] = self._mel_pending
+            frames.append(self._mel_frames(tail[None, :]))
+        mel = np.concatenate(frames, axis=1) if frames else np.zeros((MEL_BANDS, 0), np.float16)
+
+        return Preview.from_levels(levels, mel, self.sample_rate, self._samples)
+
+
+@dataclass
+class Preview:
+    """Min/max peak pyramid and log-mel spectrogram of one audio file.
+
+    ``peaks`` holds every pyramid level back to back as (bins, 2) min/max
+    rows; ``levels`` gives each level's samples per bin, row offset and bin
+    count. Loaded previews are memory-mapped, so reading a zoomed-in range
+    only touches the rows it needs.
+    """
+
+    peaks: np.ndarray
+    mel: np.ndarray  # (MEL_BANDS, frames) dB, float16
+    sample_rate: int
+    samples: int
+    levels: List[Dict[str, int]] = field(default_factory=list)
+    mel_hop: int = MEL_HOP
+
+    @classmethod
+    def from_levels(
+        cls,
+        levels: List[np.ndarray],
+        mel: np.ndarray,
+        sample_rate: int,
+        samples: int
+    ) -> "Preview":
+        offsets = np.cumsum([0] + [len(level) for level in levels])
+        meta = [
+            {"samples_per_bin": PEAK_BASE * PEAK_FACTOR ** i, "offset": int(offsets[i]), "bins": len(level)}
+            for i, level in enumerate(levels)
+        ]
+        peaks = np.concatenate(levels).astype(np.float16)
+        return cls(peaks, mel, sample_rate, samples, meta)
+
+    @property
+    def duration(self) -> float:
+        """Length of the previewed audio in seconds."""
+        return self.samples / self.sample_rate
+
+    def level(self, index: int) -> np.ndarray:
+        """(bins, 2) min/max rows of one pyramid level (0 is the finest)."""
+        meta = self.levels[index]
+        return self.peaks[meta["offset"]:meta["offset"] + meta["bins"]]
+
+    def waveform(
+        self,
+        start: float = 0.0,
+        end: Optional[float] = None,
+        width: int = 1000
+    ) -> Tuple[np.ndarray, int]:
+        """Min/max envelope of a time range at about ``width`` points.
+
+        Picks the coarsest level that still has at least ``width`` bins in
+        the range, so zooming in only reads finer levels.
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds (default: the end of the audio)
+            width: Points wanted, e.g. the plot width in pixels
+
+        Returns:
+            (bins, 2) float32 min/max rows and the samples per bin
+        """
+        end = self.duration if end is None else end
+        span = max(end - start, 0.0) * self.sample_rate
+        index = 0
+        for i, meta in enumerate(self.levels):
+            if span / meta["samples_per_bin"] >= width:
+                index = i
+        per_bin = self.levels[index]["samples_per_bin"]
+        first = int(start * self.sample_rate) // per_bin
+        last = -(-int(end * self.sample_rate) // per_bin)
+        return np.asarray(self.level(index)[first:last], dtype=np.float32), per_bin
+
+    def spectrogram(self, start: float = 0.0, end: Optional[float] = None) -> np.ndarray:
+        """(MEL_BANDS, frames) log-mel dB of a time range."""
+        end = self.duration if end is None else end
+        first = int(start * self.sample_rate) // self.mel_hop
+        last = -(-int(end * self.sample_rate) // self.mel_hop)
+        return np.asarray(self.mel[:, first:last], dtype=np.float32)
+
+    def save(self, audio_path: Union[str, Path]) -> Dict[str, str]:
+        """Write the sidecars of an audio file.
+
+        Returns:
+            Sidecar paths keyed by file stem
+        """
+        paths = preview_paths(audio_path)
+        np.save(paths["peaks"], self.peaks)
+        np.save(paths["mel"], self.mel)
+        meta: Dict[str, Any] = {
+            "sample_rate": self.sample_rate,
+            "samples": self.samples,
+            "levels": self.levels,
+            "mel": {"n_fft": MEL_N_FFT, "hop_length": self.mel_hop, "n_mels": self.mel.shape[0]},
+        }
+        paths["meta"].write_text(json.dumps(meta, indent=2))
+        logger.debug(f"Wrote preview of {audio_path} ({len(self.levels)} peak levels)")
+        return {path.stem: str(path) for path in paths.values()}
+
+
+def build_preview(y: np.ndarray, sample_rate: int) -> Preview:
+    """Preview of a whole signal held in memory."""
+    builder = PreviewBuilder(sample_rate)
+    builder.process(y)
+    return builder.finish()
+
+
+def load_preview(audio_path: Union[str, Path]) -> Preview:
+    """Open the sidecars of an audio file (memory-mapped).
+
+    Raises:
+        FileNotFoundError: If the file has no preview
+    """
+    paths = preview_paths(audio_path)
+    if not paths["meta"].exists():
+        raise FileNotFoundError(f"No preview for {audio_path}")
+    meta = json.loads(paths["meta"].read_text())
+    return Preview(
+        peaks=np.load(paths["peaks"], mmap_mode='r'),
+        mel=np.load(paths["mel"], mmap_mode='r'),
+        sample_rate=meta["sample_rate"],
+        samples=meta["samples"],
+        levels=meta["levels"],
+        mel_hop=meta["mel"]["hop_length"],
+    )
@@ -0,0 +1,374 @@
+"""Multi-track arrangement built from lazy, time-sorted MIDI event streams"""
+import heapq
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from midi_generator import get_note_from_word
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+TICKS_PER_BEAT = 480
+BEATS_PER_BAR = 4
+WORDS_PER_BAR = 4
+
+# Natural minor scale degrees (semitones above the tonic)
+MINOR_SCALE = (0, 2, 3, 5, 7, 8, 10)
+
+# Channel and General MIDI program for each part
+PARTS = {
+    "melody": (0, 0),     # Acoustic Grand Piano
+    "bass": (1, 33),      # Electric Bass (finger)
+    "pads": (2, 89),      # Pad 2 (warm)
+    "counter": (3, 81),   # Lead 2 (sawtooth)
+    "drums": (9, None),   # GM percussion channel, no program
+}
+DEFAULT_PARTS = tuple(PARTS)
+
+# Event ordering within a tick: meta/program first, then note-offs, then note-ons,
+# so a note retriggered on the same tick is not cut short.
+_ORDER_META = 0
+_ORDER_OFF = 1
+_ORDER_ON = 2
+
+
+class MidiEvent(NamedTuple):
+    """A raw MIDI event at an absolute tick."""
+
+    tick: int
+    order: int
+    data: bytes
+
+
+def _event_key(event: MidiEvent) -> Tuple[int, int]:
+    """Merge key: time first, then meta < note_off < note_on within a tick.
+
+    Ties keep their per-track order, since ``heapq.merge`` is stable.
+    """
+    return event.tick, event.order
+
+
+def _vlq(value: int) -> bytes:
+    """Encode an integer as a MIDI variable-length quantity."""
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.insert(0, (value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(out)
+
+
+def _meta(meta_type: int, payload: bytes) -> bytes:
+    return bytes([0xFF, meta_type]) + _vlq(len(payload)) + payload
+
+
+def tempo_event(tempo: int, tick: int = 0) -> MidiEvent:
+    """Create a set_tempo meta event for a BPM value."""
+    return MidiEvent(tick, _ORDER_META, _meta(0x51, int(60000000 / tempo).to_bytes(3, 'big')))
+
+
+def _schedule(notes: Iterable[Tuple[int, int, int, int, int]]) -> Iterator[MidiEvent]:
+    """Turn start-sorted notes into time-sorted note_on/note_off events.
+
+    Only notes that are currently sounding are held in memory, so arbitrarily
+    long note streams can be scheduled lazily.
+
+    Args:
+        notes: (start_tick, duration, channel, note, velocity) sorted by start_tick
+
+    Yields:
+        MidiEvent objects in time order
+    """
+    pending: List[MidiEvent] = []
+    for start, duration, channel, note, velocity in notes:
+        while pending and pending[0].tick <= start:
+            yield heapq.heappop(pending)
+        yield MidiEvent(start, _ORDER_ON, bytes([0x90 | channel, note, velocity]))
+        heapq.heappush(pending, MidiEvent(start + duration, _ORDER_OFF, bytes([0x80 | channel, note, 0])))
+    while pending:
+        yield heapq.heappop(pending)
+
+
+class Arrangement:
+    """Derive bass, pad, counter-melody and drum parts from a lyric hook.
+
+    Every part is exposed as a lazy generator of time-sorted ``MidiEvent``s;
+    nothing is materialized until the events are consumed (e.g. by ``write``).
+    """
+
+    def __init__(
+        self,
+        lyrics: str,
+        tempo: int = 120,
+        base_note: int = 60,
+        repeats: int = 1,
+        ticks_per_beat: int = TICKS_PER_BEAT
+    ):
+        """Initialize the arrangement.
+
+        Args:
+            lyrics: Hook or verse text the melody is derived from
+            tempo: Tempo in BPM
+            base_note: Tonic MIDI note of the melody (default: 60 = Middle C)
+            repeats: Number of times the hook is looped
+            ticks_per_beat: MIDI resolution
+        """
+        self.words = lyrics.split() or ["riff"]
+        self.tempo = tempo
+        self.base_note = base_note
+        self.repeats = max(1, repeats)
+        self.ticks_per_beat = ticks_per_beat
+        self.ticks_per_bar = ticks_per_beat * BEATS_PER_BAR
+        self.num_bars = max(1, -(-len(self.words) // WORDS_PER_BAR))
+
+    @property
+    def total_bars(self) -> int:
+        """Number of bars across all repeats."""
+        return self.num_bars * self.repeats
+
+    def _melody_notes(self) -> List[int]:
+        return [get_note_from_word(word, self.base_note) for word in self.words]
+
+    def _chord(self, bar: int, melody: Sequence[int]) -> Tuple[int, int, int]:
+        """Minor-scale triad rooted on the degree nearest the bar's first melody note."""
+        lead = melody[(bar * WORDS_PER_BAR) % len(melody)]
+        pitch_class = (lead - self.base_note) % 12
+        degree = min(range(len(MINOR_SCALE)), key=lambda d: abs(MINOR_SCALE[d] - pitch_class))
+        root, third, fifth = (
+            self.base_note + MINOR_SCALE[(degree + step) % 7] + 12 * ((degree + step) // 7)
+            for step in (0, 2, 4)
+        )
+        return root, third, fifth
+
+    def _bars(self) -> Iterator[Tuple[int, int]]:
+        """Yield (absolute bar index, bar index within the hook)."""
+        for repeat in range(self.repeats):
+            for bar in range(self.num_bars):
+                yield repeat * self.num_bars + bar, bar
+
+    def melody(self) -> Iterator[MidiEvent]:
+        """The hook melody: one eighth note per word on each beat."""
+        channel = PARTS["melody"][0]
+        notes = self._melody_notes()
+        step = self.ticks_per_beat
+
+        def gen():
+            for repeat in range(self.repeats):
+                offset = repeat * self.num_bars * self.ticks_per_bar
+                for i, note in enumerate(notes):
+                    velocity = 70 + (sum(map(ord, self.words[i])) % 31)
+                    yield offset + i * step, step // 2, channel, note, velocity
+
+        return _schedule(gen())
+
+    def bass(self) -> Iterator[MidiEvent]:
+        """Chord roots two octaves down on beats 1 and 3."""
+        channel = PARTS["bass"][0]
+        melody = self._melody_notes()
+        half_bar = self.ticks_per_bar // 2
+
+        def gen():
+            for index, bar in self._bars():
+                root = self._chord(bar, melody)[0] - 24
+                start = index * self.ticks_per_bar
+                yield start, half_bar - self.ticks_per_beat // 4, channel, root, 100
+                yield start + half_bar, half_bar - self.ticks_per_beat // 4, channel, root, 90
+
+        return _schedule(gen())
+
+    def pads(self) -> Iterator[MidiEvent]:
+        """Sustained triads one octave below the melody, one chord per bar."""
+        channel = PARTS["pads"][0]
+        melody = self._melody_notes()
+
+        def gen():
+            for index, bar in self._bars():
+                start = index * self.ticks_per_bar
+                for note in self._chord(bar, melody):
+                    yield start, self.ticks_per_bar, channel, note - 12, 60
+
+        return _schedule(gen())
+
+    def counter(self) -> Iterator[MidiEvent]:
+        """Off-beat arpeggio of the chord, descending, an octave above the melody."""
+        channel = PARTS["counter"][0]
+        melody = self._melody_notes()
+        eighth = self.ticks_per_beat // 2
+
+        def gen():
+            for index, bar in self._bars():
+                chord = sorted(self._chord(bar, melody), reverse=True)
+                start = index * self.ticks_per_bar
+                for beat in range(BEATS_PER_BAR):
+                    note = chord[beat % len(chord)] + 12
+                    yield start + beat * self.ticks_per_beat + eighth, eighth, channel, note, 75
+
+        return _schedule(gen())
+
+    def drums(self) -> Iterator[MidiEvent]:
+        """Kick on 1 and 3, snare on 2 and 4, hi-hat on every beat."""
+        channel = PARTS["drums"][0]
+        hit = self.ticks_per_beat // 4
+        kick, snare, hihat = 36, 38, 42
+
+        def gen():
+            for index, _ in self._bars():
+                start = index * self.ticks_per_bar
+                for beat in range(BEATS_PER_BAR):
+                    tick = start + beat * self.ticks_per_beat
+                    if beat % 2 == 0:
+                        yield tick, hit, channel, kick, 100
+                    else:
+                        yield tick, hit, channel, snare, 90
+                    yield tick, hit, channel, hihat, 80
+
+        return _schedule(gen())
+
+    def track(self, part: str) -> Iterator[MidiEvent]:
+        """Event stream for one part, preceded by its track setup events.
+
+        Args:
+            part: One of ``PARTS``
+
+        Returns:
+            Lazy, time-sorted event iterator
+
+        Raises:
+            ValueError: If the part is unknown
+        """
+        if part not in PARTS:
+            raise ValueError(f"Unknown part: {part}. Must be one of {', '.join(PARTS)}")
+
+        channel, program = PARTS[part]
+        setup = [MidiEvent(0, _ORDER_META, _meta(0x03, part.encode('ascii')))]
+        if program is not None:
+            setup.append(MidiEvent(0, _ORDER_META, bytes([0xC0 | channel, program])))
+
+        def gen() -> Iterator[MidiEvent]:
+            yield from setup
+            yield from getattr(self, part)()
+
+        return gen()
+
+    def events(self, parts: Sequence[str] = DEFAULT_PARTS) -> Iterator[MidiEvent]:
+        """All requested parts merged into a single time-sorted stream.
+
+        Args:
+            parts: Parts to include
+
+        Returns:
+            Lazy iterator produced by ``heapq.merge``
+        """
+        return heapq.merge(
+            iter([tempo_event(self.tempo)]),
+            *(self.track(p) for p in parts),
+            key=_event_key
+        )
+
+    def write(
+        self,
+        output_path: str,
+        midi_type: int = 1,
+        parts: Sequence[str] = DEFAULT_PARTS
+    ) -> str:
+        """Stream the arrangement to a Standard MIDI File.
+
+        Args:
+            output_path: Path to save the MIDI file
+            midi_type: 1 for one track per part, 0 for a single merged track
+            parts: Parts to include
+
+        Returns:
+            Path to the generated MIDI file
+
+        Raises:
+            ValueError: If midi_type is not 0 or 1
+        """
+        if midi_type == 0:
+            tracks: Sequence[Iterable[MidiEvent]] = [self.events(parts)]
+        elif midi_type == 1:
+            # Conductor track carries the tempo; each part gets its own track
+            tracks = [iter([tempo_event(self.tempo)])] + [self.track(p) for p in parts]
+        else:
+            raise ValueError(f"Invalid midi_type: {midi_type}. Must be 0 or 1")
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        write_midi_stream(str(output_file), tracks, midi_type, self.ticks_per_beat)
+
+        logger.info(f"Arrangement ({self.total_bars} bars, type {midi_type}) written: {output_path}")
+        return str(output_path)
+
+
+def _write_track(f: BinaryIO, events: Iterable[MidiEvent], flush_bytes: int = 1 << 16) -> None:
+    """Write one MTrk chunk, patching its length header after streaming the body."""
+    header_pos = f.tell()
+    f.write(b'MTrk\x00\x00\x00\x00')
+
+    buffer = bytearray()
+    last_tick = 0
+    for event in events:
+        buffer += _vlq(event.tick - last_tick)
+        buffer += event.data
+        last_tick = event.tick
+        if len(buffer) >= flush_bytes:
+            f.write(buffer)
+            buffer.clear()
+    buffer += b'\x00' + _meta(0x2F, b'')
+    f.write(buffer)
+
+    end_pos = f.tell()
+    f.seek(header_pos + 4)
+    f.write((end_pos - header_pos - 8).to_bytes(4, 'big'))
+    f.seek(end_pos)
+
+
+def write_midi_stream(
+    output_path: str,
+    tracks: Sequence[Iterable[MidiEvent]],
+    midi_type: int = 1,
+    ticks_per_beat: int = TICKS_PER_BEAT
+) -> None:
+    """Write time-sorted event streams to a Standard MIDI File.
+
+    Each track is consumed exactly once and written as it is generated, so
+    memory use does not grow with the length of the arrangement.
+
+    Args:
+        output_path: Path to save the MIDI file
+        tracks: One time-sorted event iterable per track
+        midi_type: SMF format (0 or 1)
+        ticks_per_beat: MIDI resolution
+    """
+    with open(output_path, 'wb') as f:
+        f.write(b'MThd' + (6).to_bytes(4, 'big'))
+        f.write(midi_type.to_bytes(2, 'big'))
+        f.write(len(tracks).to_bytes(2, 'big'))
+        f.write(ticks_per_beat.to_bytes(2, 'big'))
+        for events in tracks:
+            _write_track(f, events)
+
+
+def generate_arrangement(
+    lyrics: str,
+    output_path: str = "arrangement.mid",
+    tempo: int = 120,
+    base_note: int = 60,
+    midi_type: int = 1,
+    repeats: int = 1
+) -> str:
+    """Generate a full multi-track arrangement MIDI file from lyrics.
+
+    Args:
+        lyrics: Input lyrics text
+        output_path: Path to save the MIDI file
+        tempo: Tempo in BPM (default: 120)
+        base_note: Base MIDI note (default: 60 = Middle C)
+        midi_type: 1 for one track per part, 0 for a single merged track
+        repeats: Number of times the hook is looped
+
+    Returns:
+        Path to the generated MIDI file
+    """
+    arrangement = Arrangement(lyrics, tempo=tempo, base_note=base_note, repeats=repeats)
+    return arrangement.write(output_path, midi_type=midi_type)
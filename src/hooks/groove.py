@@ -0,0 +1,353 @@
+"""Reference MIDI groove ingestion and lookup index"""
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+STEPS_PER_BAR = 16
+DRUM_CHANNEL = 9
+
+# Pattern rows and the General MIDI drum notes folded into each of them
+DRUM_ROWS: Tuple[Tuple[int, Tuple[int, ...]], ...] = (
+    (36, (35, 36)),                  # Kick
+    (38, (37, 38, 39, 40)),          # Snare / rim / clap
+    (42, (42, 44, 46, 49, 51, 57)),  # Hats / cymbals
+)
+_ROW_OF_NOTE = {note: row for row, (_, notes) in enumerate(DRUM_ROWS) for note in notes}
+
+DEFAULT_GROOVES_DIR = "data/grooves"
+INDEX_FILENAME = "groove_index.npz"
+
+# Bytes following a channel status byte, by high nibble
+_DATA_LENGTH = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1, 0xE0: 2}
+
+
+class Groove(NamedTuple):
+    """Features extracted from one reference MIDI file."""
+
+    name: str
+    tempo: float
+    pattern: np.ndarray  # (len(DRUM_ROWS), STEPS_PER_BAR) hit probability per step
+    density: float       # note_on events per bar, all channels
+
+    def beat_pattern(self, threshold: float = 0.5) -> Dict[int, List[int]]:
+        """Drum pattern in the form accepted by ``create_simple_beat``.
+
+        Args:
+            threshold: Minimum fraction of bars a step must be hit in
+
+        Returns:
+            Mapping of drum note to per-step velocities (0 = rest)
+        """
+        return {
+            note: [int(40 + 60 * p) if p >= threshold else 0 for p in row]
+            for (note, _), row in zip(DRUM_ROWS, self.pattern.tolist(), strict=True)
+        }
+
+
+def _read_vlq(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def parse_midi_bytes(data: bytes) -> Tuple[int, Optional[int], List[Tuple[int, int, int]]]:
+    """Scan a Standard MIDI File for tempo and note_on events.
+
+    This is a minimal, mido-independent parser: it only decodes what groove
+    extraction needs and skips everything else without building message objects.
+
+    Args:
+        data: Raw ``.mid`` file contents
+
+    Returns:
+        Tuple of (ticks per beat, first tempo in microseconds per beat or None,
+        list of (absolute tick, channel, note) for every note_on with velocity > 0)
+
+    Raises:
+        ValueError: If the data is not a valid SMF, uses SMPTE timing or has
+            zero ticks per beat
+    """
+    if data[:4] != b'MThd':
+        raise ValueError("Not a Standard MIDI File")
+    header_len = int.from_bytes(data[4:8], 'big')
+    num_tracks = int.from_bytes(data[10:12], 'big')
+    division = int.from_bytes(data[12:14], 'big')
+    if division & 0x8000:
+        raise ValueError("SMPTE time division is not supported")
+    if division == 0:
+        raise ValueError("Invalid time division: 0. Must be a positive number of ticks per beat")
+
+    tempo: Optional[int] = None
+    notes: List[Tuple[int, int, int]] = []
+    pos = 8 + header_len
+
+    for _ in range(num_tracks):
+        if data[pos:pos + 4] != b'MTrk':
+            break
+        end = pos + 8 + int.from_bytes(data[pos + 4:pos + 8], 'big')
+        pos += 8
+        tick = 0
+        status = 0
+        while pos < end:
+            delta, pos = _read_vlq(data, pos)
+            tick += delta
+            byte = data[pos]
+            if byte == 0xFF:
+                meta_type = data[pos + 1]
+                length, pos = _read_vlq(data, pos + 2)
+                if meta_type == 0x51 and tempo is None:
+                    tempo = int.from_bytes(data[pos:pos + 3], 'big')
+                pos += length
+                continue
+            if byte in (0xF0, 0xF7):
+                length, pos = _read_vlq(data, pos + 1)
+                pos += length
+                continue
+            if byte & 0x80:
+                status = byte
+                pos += 1
+            # else: running status, byte is the first data byte
+            kind = status & 0xF0
+            if kind == 0x90 and data[pos + 1] > 0:
+                notes.append((tick, status & 0x0F, data[pos]))
+            pos += _DATA_LENGTH.get(kind, 0)
+        pos = end
+
+    return division, tempo, notes
+
+
+def extract_groove(path: Union[str, Path]) -> Groove:
+    """Extract tempo, quantized drum pattern and note density from a MIDI file.
+
+    Args:
+        path: Path to a ``.mid`` file
+
+    Returns:
+        Groove features (4/4 time is assumed)
+    """
+    path = Path(path)
+    division, tempo, notes = parse_midi_bytes(path.read_bytes())
+
+    bpm = 60000000 / tempo if tempo else 120.0
+    step_ticks = division / 4
+    pattern = np.zeros((len(DRUM_ROWS), STEPS_PER_BAR), dtype=np.float32)
+
+    if notes:
+        events = np.array(notes, dtype=np.int64)
+        ticks, channels, pitches = events[:, 0], events[:, 1], events[:, 2]
+        steps = np.rint(ticks / step_ticks).astype(np.int64)
+        num_bars = int(steps.max() // STEPS_PER_BAR) + 1
+
+        drums = channels == DRUM_CHANNEL
+        rows = np.array([_ROW_OF_NOTE.get(int(p), -1) for p in pitches[drums]], dtype=np.int64)
+        known = rows >= 0
+        hits = np.zeros((len(DRUM_ROWS), num_bars, STEPS_PER_BAR), dtype=bool)
+        drum_steps = steps[drums][known]
+        hits[rows[known], drum_steps // STEPS_PER_BAR, drum_steps % STEPS_PER_BAR] = True
+        pattern = hits.mean(axis=1).astype(np.float32)
+        density = len(notes) / num_bars
+    else:
+        density = 0.0
+
+    return Groove(path.stem, float(bpm), pattern, float(density))
+
+
+class GrooveIndex:
+    """Compact on-disk index of grooves stored as NumPy arrays.
+
+    The index is a single ``.npz`` with one row per reference file, so picking
+    a groove at generation time never re-parses MIDI.
+    """
+
+    def __init__(
+        self,
+        names: np.ndarray,
+        tempos: np.ndarray,
+        patterns: np.ndarray,
+        densities: np.ndarray,
+        mtimes: Optional[np.ndarray] = None
+    ):
+        self.names = names
+        self.tempos = tempos
+        self.patterns = patterns
+        self.densities = densities
+        self.mtimes = mtimes if mtimes is not None else np.zeros(len(names), dtype=np.int64)
+        self._positions = {str(name): i for i, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    @classmethod
+    def build(
+        cls,
+        directory: str = DEFAULT_GROOVES_DIR,
+        index_path: Optional[str] = None
+    ) -> "GrooveIndex":
+        """Ingest every ``.mid`` file in a directory and save the index.
+
+        Files whose modification time matches an existing index entry are not
+        parsed again.
+
+        Args:
+            directory: Folder of reference MIDI files (searched recursively)
+            index_path: Where to save the index (default: ``<directory>/groove_index.npz``)
+
+        Returns:
+            The built index
+        """
+        directory_path = Path(directory)
+        index_file = Path(index_path) if index_path else directory_path / INDEX_FILENAME
+        previous = cls.load(str(index_file)) if index_file.exists() else None
+
+        grooves: List[Groove] = []
+        mtimes: List[int] = []
+        files = sorted(p for p in directory_path.rglob("*") if p.suffix.lower() in (".mid", ".midi"))
+        for file in files:
+            mtime = os.stat(file).st_mtime_ns
+            name = file.relative_to(directory_path).with_suffix("").as_posix()
+            if previous is not None and name in previous and previous.mtimes[previous._positions[name]] == mtime:
+                groove = previous.get(name)
+            else:
+                try:
+                    groove = extract_groove(file)._replace(name=name)
+                except (ValueError, IndexError) as e:
+                    logger.warning(f"Skipping unreadable MIDI file {file}: {e}")
+                    continue
+            grooves.append(groove)
+            mtimes.append(mtime)
+
+        index = cls.from_grooves(grooves, mtimes)
+        index.save(str(index_file))
+        logger.info(f"Indexed {len(index)} grooves from {directory} into {index_file}")
+        return index
+
+    @classmethod
+    def from_grooves(cls, grooves: Iterable[Groove], mtimes: Optional[Iterable[int]] = None) -> "GrooveIndex":
+        """Build an in-memory index from extracted grooves."""
+        grooves = list(grooves)
+        shape = (0, len(DRUM_ROWS), STEPS_PER_BAR)
+        return cls(
+            names=np.array([g.name for g in grooves], dtype=str),
+            tempos=np.array([g.tempo for g in grooves], dtype=np.float32),
+            patterns=np.stack([g.pattern for g in grooves]).astype(np.float32) if grooves else np.zeros(shape, np.float32),
+            densities=np.array([g.density for g in grooves], dtype=np.float32),
+            mtimes=np.array(list(mtimes), dtype=np.int64) if mtimes is not None else None,
+        )
+
+    def save(self, index_path: str) -> None:
+        """Save the index as a compressed ``.npz``."""
+        path = Path(index_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                names=self.names,
+                tempos=self.tempos,
+                patterns=self.patterns,
+                densities=self.densities,
+                mtimes=self.mtimes,
+            )
+
+    @classmethod
+    def load(cls, index_path: str) -> "GrooveIndex":
+        """Load an index saved with ``save``.
+
+        Raises:
+            FileNotFoundError: If the index doesn't exist
+        """
+        if not Path(index_path).exists():
+            raise FileNotFoundError(f"Groove index not found: {index_path}")
+        with np.load(index_path) as data:
+            return cls(
+                data['names'], data['tempos'], data['patterns'], data['densities'], data['mtimes']
+            )
+
+    def get(self, name: str) -> Groove:
+        """Look up a groove by name.
+
+        Raises:
+            KeyError: If the groove isn't indexed
+        """
+        if name not in self._positions:
+            raise KeyError(f"Groove not in index: {name}")
+        i = self._positions[name]
+        return Groove(name, float(self.tempos[i]), self.patterns[i], float(self.densities[i]))
+
+    def _features(self) -> np.ndarray:
+        # Tempo and density are scaled so one unit roughly matches one pattern step
+        return np.hstack([
+            self.patterns.reshape(len(self), -1),
+            (self.tempos / 20.0)[:, None],
+            (self.densities / 16.0)[:, None],
+        ])
+
+    def like(self, name: str, k: int = 1) -> List[Groove]:
+        """Find the grooves most similar to a reference groove.
+
+        Args:
+            name: Name of the reference groove
+            k: Number of matches to return
+
+        Returns:
+            Up to k grooves, nearest first, excluding the reference itself
+        """
+        target = self._positions.get(name)
+        if target is None:
+            raise KeyError(f"Groove not in index: {name}")
+        features = self._features()
+        distances = np.linalg.norm(features - features[target], axis=1)
+        distances[target] = np.inf
+        order = np.argsort(distances)[:k]
+        return [self.get(str(self.names[i])) for i in order if np.isfinite(distances[i])]
+
+    def closest_tempo(self, bpm: float) -> Groove:
+        """Find the groove whose tempo is closest to ``bpm``.
+
+        Raises:
+            LookupError: If the index is empty
+        """
+        if not len(self):
+            raise LookupError("Groove index is empty")
+        i = int(np.argmin(np.abs(self.tempos - bpm)))
+        return self.get(str(self.names[i]))
+
+
+def generate_midi_from_groove(
+    lyrics: str,
+    groove: Groove,
+    output_path: str = "output.mid",
+    base_note: int = 60
+) -> str:
+    """Generate a MIDI file whose tempo and beat follow a reference groove.
+
+    Args:
+        lyrics: Input lyrics text
+        groove: Groove from ``GrooveIndex.get``/``like``/``closest_tempo``
+        output_path: Path to save the MIDI file
+        base_note: Base MIDI note (default: 60 = Middle C)
+
+    Returns:
+        Path to the generated MIDI file
+    """
+    from midi_generator import generate_midi
+
+    return generate_midi(
+        lyrics,
+        output_path,
+        tempo=round(groove.tempo),
+        base_note=base_note,
+        pattern=groove.beat_pattern(),
+    )
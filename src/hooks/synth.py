@@ -0,0 +1,233 @@
+"""Offline NumPy synthesizer for previewing generated MIDI as audio"""
+import io
+import wave
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+if TYPE_CHECKING:
+    import mido
+
+logger = get_logger(__name__)
+
+DEFAULT_SAMPLE_RATE = 22050
+DRUM_CHANNEL = 9  # General MIDI percussion channel (channel 10, zero-based)
+KICK, SNARE, HIHAT = 36, 38, 42
+
+WAVETABLE_SIZE = 2048
+ATTACK_SECONDS = 0.005
+RELEASE_SECONDS = 0.06
+TAIL_SECONDS = 0.4
+
+
+class NoteEvent(NamedTuple):
+    """A single note with absolute timing in seconds."""
+
+    start: float
+    duration: float
+    note: int
+    velocity: int
+    channel: int
+
+
+def extract_note_events(midi: Union[str, Path, "mido.MidiFile"]) -> List[NoteEvent]:
+    """Flatten a MIDI file into absolute-time note events.
+
+    Args:
+        midi: Path to a ``.mid`` file or a ``mido.MidiFile`` instance
+
+    Returns:
+        Note events sorted by start time
+    """
+    import mido
+
+    mid = mido.MidiFile(str(midi)) if isinstance(midi, (str, Path)) else midi
+
+    events: List[NoteEvent] = []
+    active: Dict[tuple, List[tuple]] = {}
+    now = 0.0
+
+    # Iterating a MidiFile merges all tracks and converts delta ticks to seconds,
+    # honouring any set_tempo messages along the way.
+    for msg in mid:
+        now += msg.time
+        if msg.type == 'note_on' and msg.velocity > 0:
+            active.setdefault((msg.channel, msg.note), []).append((now, msg.velocity))
+        elif msg.type in ('note_off', 'note_on'):
+            stack = active.get((msg.channel, msg.note))
+            if stack:
+                start, velocity = stack.pop(0)
+                events.append(NoteEvent(start, now - start, msg.note, velocity, msg.channel))
+
+    # Close notes that were never released
+    for (channel, note), stack in active.items():
+        for start, velocity in stack:
+            events.append(NoteEvent(start, max(now - start, 0.0), note, velocity, channel))
+
+    events.sort(key=lambda e: e.start)
+    return events
+
+
+@lru_cache(maxsize=1)
+def _wavetable() -> np.ndarray:
+    """Single-cycle additive wavetable (decaying odd/even harmonics)."""
+    phase = np.arange(WAVETABLE_SIZE) / WAVETABLE_SIZE * 2 * np.pi
+    harmonics = np.arange(1, 9)
+    amplitudes = 1.0 / harmonics ** 1.5
+    table: np.ndarray = (amplitudes[:, None] * np.sin(harmonics[:, None] * phase)).sum(axis=0)
+    table = (table / np.abs(table).max()).astype(np.float32)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=256)
+def _voice(note: int, num_samples: int, sample_rate: int) -> np.ndarray:
+    """Render one enveloped wavetable voice at unit velocity.
+
+    Cached because hooks repeat the same pitch/length pairs constantly.
+    """
+    freq = 440.0 * 2.0 ** ((note - 69) / 12.0)
+    table = _wavetable()
+    index = (np.arange(num_samples) * (freq * WAVETABLE_SIZE / sample_rate)) % WAVETABLE_SIZE
+    voice: np.ndarray = table[index.astype(np.int32)]
+
+    attack = min(int(ATTACK_SECONDS * sample_rate), num_samples)
+    release = min(int(RELEASE_SECONDS * sample_rate), num_samples - attack)
+    envelope = np.ones(num_samples, dtype=np.float32)
+    envelope[:attack] = np.linspace(0.0, 1.0, attack, endpoint=False)
+    if release > 0:
+        envelope[-release:] = np.linspace(1.0, 0.0, release)
+
+    voice = (voice * envelope).astype(np.float32)
+    voice.flags.writeable = False
+    return voice
+
+
+@lru_cache(maxsize=4)
+def _drum_kit(sample_rate: int) -> Dict[int, np.ndarray]:
+    """Synthesize kick, snare and hi-hat one-shots for a sample rate."""
+    rng = np.random.default_rng(0)
+
+    def timeline(seconds: float) -> np.ndarray:
+        return np.arange(int(seconds * sample_rate)) / sample_rate
+
+    # Kick: exponential pitch sweep 150 Hz -> 45 Hz with a fast amplitude decay
+    t = timeline(0.35)
+    freq = 45.0 + 105.0 * np.exp(-t * 30.0)
+    kick = np.sin(2 * np.pi * np.cumsum(freq) / sample_rate) * np.exp(-t * 9.0)
+
+    # Snare: noise burst over a short tonal body
+    t = timeline(0.2)
+    snare = (0.6 * rng.uniform(-1, 1, t.size) * np.exp(-t * 25.0)
+             + 0.4 * np.sin(2 * np.pi * 185.0 * t) * np.exp(-t * 30.0))
+
+    # Hi-hat: first-difference (high-passed) noise with a very short decay
+    t = timeline(0.06)
+    hat = 0.5 * np.diff(rng.uniform(-1, 1, t.size + 1)) * np.exp(-t * 80.0)
+
+    kit = {}
+    for note, sample in ((KICK, kick), (SNARE, snare), (HIHAT, hat)):
+        sample = sample.astype(np.float32)
+        sample.flags.writeable = False
+        kit[note] = sample
+    return kit
+
+
+def render_events(
+    events: Iterable[NoteEvent],
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    gain: float = 0.9
+) -> np.ndarray:
+    """Mix note events into a mono float32 buffer.
+
+    The output buffer is allocated once; each note is rendered as a vectorized
+    block and mixed in with a slice-add.
+
+    Args:
+        events: Note events to render
+        sample_rate: Output sample rate in Hz
+        gain: Peak level of the normalized output (0 disables normalization)
+
+    Returns:
+        Mono float32 audio in the range [-1, 1]
+    """
+    events = list(events)
+    kit = _drum_kit(sample_rate)
+    end = max((e.start + e.duration for e in events), default=0.0)
+    total = int((end + RELEASE_SECONDS + TAIL_SECONDS) * sample_rate)
+    out = np.zeros(total, dtype=np.float32)
+
+    for event in events:
+        start = int(event.start * sample_rate)
+        level = event.velocity / 127.0
+        if event.channel == DRUM_CHANNEL:
+            sample = kit.get(event.note, kit[HIHAT])
+        else:
+            length = int((event.duration + RELEASE_SECONDS) * sample_rate)
+            sample = _voice(event.note, max(length, 1), sample_rate)
+            level *= 0.5  # Sit the melody under the drums
+        stop = min(start + sample.size, total)
+        out[start:stop] += level * sample[:stop - start]
+
+    peak = float(np.abs(out).max()) if out.size else 0.0
+    if gain and peak > 0:
+        out *= gain / peak
+    return out
+
+
+def render_midi(
+    midi: Union[str, Path, "mido.MidiFile"],
+    sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> np.ndarray:
+    """Render a MIDI file (melody and drum tracks) to mono audio.
+
+    Args:
+        midi: Path to a ``.mid`` file or a ``mido.MidiFile`` instance
+        sample_rate: Output sample rate in Hz
+
+    Returns:
+        Mono float32 audio
+    """
+    events = extract_note_events(midi)
+    logger.debug("Rendering %d note events at %d Hz", len(events), sample_rate)
+    return render_events(events, sample_rate)
+
+
+def to_wav_bytes(samples: np.ndarray, sample_rate: int = DEFAULT_SAMPLE_RATE) -> bytes:
+    """Encode mono float audio as 16-bit PCM WAV bytes (e.g. for ``st.audio``).
+
+    Args:
+        samples: Mono float audio in the range [-1, 1]
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        WAV file contents
+    """
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def render_midi_to_wav(
+    midi: Union[str, Path, "mido.MidiFile"],
+    sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> bytes:
+    """Render a MIDI file straight to WAV bytes.
+
+    Args:
+        midi: Path to a ``.mid`` file or a ``mido.MidiFile`` instance
+        sample_rate: Output sample rate in Hz
+
+    Returns:
+        WAV file contents
+    """
+    return to_wav_bytes(render_midi(midi, sample_rate), sample_rate)
@@ -1,6 +1,8 @@
 """Prompt templates & model calls for lyric generation"""
 import random
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, cast
 
 from src.lyrics.utils import (
     get_chaos_phrases,
@@ -10,30 +12,75 @@ from src.lyrics.utils import (
     get_theme_responses,
     get_theme_words,
 )
-from src.personas.vocab_loader import load_persona
+from src.metrics import timed
+from src.personas.vocab_loader import PersonaVocabLoader
+from src.profiling import profiled
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+MODES = ("4-Bar Verse", "Hook Generator")
+VARIATION_WORKERS = 8
+
+
+def _rng(seed: Optional[int]) -> random.Random:
+    """A generator seeded with ``seed``, or the module-level one when there is no seed.
+
+    Unseeded calls share the global generator, so ``random.seed()`` still makes
+    them reproducible and they skip seeding a new generator from the OS.
+    """
+    return random.Random(seed) if seed is not None else cast(random.Random, random)
+
+
+@dataclass
+class Variation:
+    """One of several seeded generations with the same settings."""
+
+    index: int
+    seed: int  # ``generate(..., seed=seed)`` reproduces ``text``
+    text: str
+
+
+@dataclass
+class GenerationRequest:
+    """Settings of one generation, for ``LyricGenerator.generate_batch``."""
+
+    persona: str
+    theme: str
+    mode: str = "4-Bar Verse"
+    flex: int = 7
+    chaos: int = 5
+    seed: Optional[int] = None
+
 
 class LyricGenerator:
     """Generator for Riff Raff style lyrics and hooks."""
 
-    def __init__(self, personas_dir: str = "personas"):
+    def __init__(
+        self,
+        personas_dir: str = "personas",
+        vocab_loader: Optional[PersonaVocabLoader] = None
+    ):
         """Initialize the lyric generator.
 
         Args:
             personas_dir: Directory containing persona JSON files
+            vocab_loader: Shared persona registry (default: a private one for
+                ``personas_dir``), so persona files are read once per process
         """
         self.personas_dir = personas_dir
+        self.vocab_loader = vocab_loader or PersonaVocabLoader(personas_dir)
 
+    @timed("lyrics.generate_bars")
+    @profiled("lyrics.generate_bars")
     def generate_bars(
         self,
         persona: str,
         theme: str,
         flex: int = 7,
         chaos: int = 5,
-        num_bars: int = 4
+        num_bars: int = 4,
+        seed: Optional[int] = None
     ) -> str:
         """Generate verse bars with persona and theme influence.
 
@@ -43,13 +90,26 @@ class LyricGenerator:
             flex: Flex level (1-10)
             chaos: Nonsense juice level (0-10)
             num_bars: Number of bars to generate (default: 4)
+            seed: Seed for a reproducible result (default: random)
 
         Returns:
             Generated bars as a string with newlines between bars
         """
-        logger.info(f"Generating {num_bars} bars with persona={persona}, theme={theme}")
+        logger.debug("Generating %d bars with persona=%s, theme=%s", num_bars, persona, theme)
+
+        vocab, styles = self.vocab_loader.load_persona(persona)
+        return self._bars(_rng(seed), vocab, styles, theme, flex, chaos, num_bars)
 
-        vocab, styles = load_persona(persona, self.personas_dir)
+    @staticmethod
+    def _bars(
+        rng: random.Random,
+        vocab: List[str],
+        styles: List[str],
+        theme: str,
+        flex: int,
+        chaos: int,
+        num_bars: int = 4
+    ) -> str:
         theme_words = get_theme_words(theme)
 
         # Combine vocab with theme words
@@ -58,19 +118,19 @@ class LyricGenerator:
         bars = []
         for i in range(num_bars):
             # Select subject with persona/theme bias
-            if random.random() < 0.7:  # 70% chance to use persona/theme vocab
-                subject = random.choice(all_vocab)
+            if rng.random() < 0.7:  # 70% chance to use persona/theme vocab
+                subject = rng.choice(all_vocab)
             else:
-                subject = random.choice(vocab)
+                subject = rng.choice(vocab)
 
             # Select verb with persona style bias
-            if random.random() < 0.6:  # 60% chance to use persona styles
-                verb = random.choice(styles)
+            if rng.random() < 0.6:  # 60% chance to use persona styles
+                verb = rng.choice(styles)
             else:
-                verb = random.choice(["glow", "drip", "hiss", "teleport", "breathe", "bounce"])
+                verb = rng.choice(["glow", "drip", "hiss", "teleport", "breathe", "bounce"])
 
             # Theme-specific objects
-            obj = random.choice(get_theme_objects(theme))
+            obj = rng.choice(get_theme_objects(theme))
 
             # Create the bar
             bar = f"My {subject} {verb}s {obj}."
@@ -78,24 +138,27 @@ class LyricGenerator:
             # Add flex level effects
             if flex > 7:
                 flex_phrases = get_flex_phrases(flex)
-                bar += f" {random.choice(flex_phrases)}"
+                bar += f" {rng.choice(flex_phrases)}"
 
             # Add chaos/nonsense effects
             if chaos > 7:
                 chaos_phrases = get_chaos_phrases(chaos)
-                bar += f" {random.choice(chaos_phrases)}"
+                bar += f" {rng.choice(chaos_phrases)}"
 
             bars.append(bar)
 
         return "\n".join(bars)
 
+    @timed("lyrics.generate_hook")
+    @profiled("lyrics.generate_hook")
     def generate_hook(
         self,
         persona: str,
         theme: str,
         flex: int = 7,
         chaos: int = 5,
-        num_repeats: int = 2
+        num_repeats: int = 2,
+        seed: Optional[int] = None
     ) -> str:
         """Generate hook with persona and theme influence.
 
@@ -105,12 +168,23 @@ class LyricGenerator:
             flex: Flex level (1-10)
             chaos: Nonsense juice level (0-10)
             num_repeats: Number of times to repeat the hook pattern (default: 2)
+            seed: Seed for a reproducible result (default: random)
 
         Returns:
             Generated hook as a string
         """
-        logger.info(f"Generating hook with persona={persona}, theme={theme}")
+        logger.debug("Generating hook with persona=%s, theme=%s", persona, theme)
+        return self._hook(_rng(seed), persona, theme, flex, chaos, num_repeats)
 
+    @staticmethod
+    def _hook(
+        rng: random.Random,
+        persona: str,
+        theme: str,
+        flex: int,
+        chaos: int,
+        num_repeats: int = 2
+    ) -> str:
         # Get persona-specific hook bases
         hook_bases = get_persona_hooks(persona)
 
@@ -118,8 +192,8 @@ class LyricGenerator:
         responses = get_theme_responses(theme)
 
         # Select hook base and response
-        base = random.choice(hook_bases)
-        response = random.choice(responses)
+        base = rng.choice(hook_bases)
+        response = rng.choice(responses)
 
         hook = []
         for _ in range(num_repeats):
@@ -128,9 +202,9 @@ class LyricGenerator:
         # Add flex/chaos effects
         result = "\n".join(hook)
         if flex > 8:
-            result += f"\n{random.choice(get_flex_phrases(flex))}"
+            result += f"\n{rng.choice(get_flex_phrases(flex))}"
         if chaos > 8:
-            result += f"\n{random.choice(get_chaos_phrases(chaos))}"
+            result += f"\n{rng.choice(get_chaos_phrases(chaos))}"
 
         return result
 
@@ -140,7 +214,8 @@ class LyricGenerator:
         theme: str,
         mode: str = "4-Bar Verse",
         flex: int = 7,
-        chaos: int = 5
+        chaos: int = 5,
+        seed: Optional[int] = None
     ) -> str:
         """Generate lyrics based on mode.
 
@@ -150,6 +225,7 @@ class LyricGenerator:
             mode: Generation mode ("4-Bar Verse" or "Hook Generator")
             flex: Flex level (1-10)
             chaos: Nonsense juice level (0-10)
+            seed: Seed for a reproducible result (default: random)
 
         Returns:
             Generated lyrics
@@ -158,12 +234,119 @@ class LyricGenerator:
             ValueError: If mode is invalid
         """
         if mode == "4-Bar Verse":
-            return self.generate_bars(persona, theme, flex, chaos)
+            return self.generate_bars(persona, theme, flex, chaos, seed=seed)
         elif mode == "Hook Generator":
-            return self.generate_hook(persona, theme, flex, chaos)
+            return self.generate_hook(persona, theme, flex, chaos, seed=seed)
         else:
             raise ValueError(f"Invalid mode: {mode}. Must be '4-Bar Verse' or 'Hook Generator'")
 
+    @timed("lyrics.generate_batch")
+    @profiled("lyrics.generate_batch")
+    def generate_batch(self, requests: Sequence[GenerationRequest]) -> List[str]:
+        """Generate many requests in one call.
+
+        Each persona is looked up once per batch and nothing is logged per
+        request, so a batch costs little more than its random draws. Request
+        ``i`` yields exactly what ``generate`` would for the same settings
+        and seed.
+
+        Args:
+            requests: Settings of each generation
+
+        Returns:
+            Generated lyrics, in request order
+
+        Raises:
+            ValueError: If any request has an invalid mode (before any work)
+        """
+        for request in requests:
+            if request.mode not in MODES:
+                raise ValueError(f"Invalid mode: {request.mode}. Must be '4-Bar Verse' or 'Hook Generator'")
+        vocabs = {
+            persona: self.vocab_loader.load_persona(persona)
+            for persona in {request.persona for request in requests if request.mode == "4-Bar Verse"}
+        }
+        logger.debug("Generating a batch of %d requests (%d verse personas)", len(requests), len(vocabs))
+
+        results = []
+        for request in requests:
+            rng = _rng(request.seed)
+            if request.mode == "4-Bar Verse":
+                vocab, styles = vocabs[request.persona]
+                results.append(self._bars(rng, vocab, styles, request.theme, request.flex, request.chaos))
+            else:
+                results.append(self._hook(rng, request.persona, request.theme, request.flex, request.chaos))
+        return results
+
+    def iter_variations(
+        self,
+        persona: str,
+        theme: str,
+        mode: str = "4-Bar Verse",
+        flex: int = 7,
+        chaos: int = 5,
+        count: int = 10,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Iterator[Variation]:
+        """Generate ``count`` variations in a thread pool, yielding each as it completes.
+
+        Variation ``i`` uses seed ``seed + i``, so any one of them can be
+        regenerated on its own. The persona is loaded once up front and
+        shared by every worker.
+
+        Args:
+            persona: Persona name
+            theme: Theme name
+            mode: Generation mode ("4-Bar Verse" or "Hook Generator")
+            flex: Flex level (1-10)
+            chaos: Nonsense juice level (0-10)
+            count: Number of variations
+            seed: Seed of the first variation (default: random)
+            workers: Worker threads (default: up to ``VARIATION_WORKERS``)
+
+        Yields:
+            Variations in completion order
+
+        Raises:
+            ValueError: If mode is invalid or count is not positive
+        """
+        if mode not in MODES:
+            raise ValueError(f"Invalid mode: {mode}. Must be '4-Bar Verse' or 'Hook Generator'")
+        if count < 1:
+            raise ValueError(f"Invalid count: {count}. Must be at least 1")
+        if seed is None:
+            seed = random.randrange(2 ** 31)
+        logger.info("Generating %d variations with persona=%s, theme=%s, seed=%d", count, persona, theme, seed)
+        self.vocab_loader.load_persona(persona)  # Warm the registry before the workers share it
+
+        with ThreadPoolExecutor(max_workers=workers or min(count, VARIATION_WORKERS)) as pool:
+            futures = {
+                pool.submit(self.generate, persona, theme, mode, flex, chaos, seed + i): i
+                for i in range(count)
+            }
+            try:
+                for future in as_completed(futures):
+                    i = futures[future]
+                    yield Variation(index=i, seed=seed + i, text=future.result())
+            finally:
+                for future in futures:
+                    future.cancel()  # Stop early if the caller does
+
+    def generate_variations(
+        self,
+        persona: str,
+        theme: str,
+        mode: str = "4-Bar Verse",
+        flex: int = 7,
+        chaos: int = 5,
+        count: int = 10,
+        seed: Optional[int] = None
+    ) -> List[Variation]:
+        """All variations from ``iter_variations``, in seed order."""
+        variations = self.iter_variations(persona, theme, mode, flex, chaos, count, seed)
+        return sorted(variations, key=lambda variation: variation.index)
+
 
 # Convenience functions for backward compatibility with generator_core.py
 def generate_bars(persona: str, theme: str, flex: int, chaos: int) -> str:
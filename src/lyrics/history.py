@@ -0,0 +1,202 @@
+"""Bounded generation history that spills older entries to disk"""
+import json
+import os
+import shutil
+import time
+from array import array
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from src.utils import get_logger, user_cache_dir
+
+logger = get_logger(__name__)
+
+DEFAULT_CAPACITY = 50  # Entries kept in memory per session
+DEFAULT_MAX_SPILLED = 10000  # Entries kept on disk per session before the oldest half is dropped
+SPILL_MAX_AGE = 7 * 24 * 3600  # Seconds before an abandoned spill file is pruned
+
+
+def default_spill_dir() -> Path:
+    """Per-user directory for spill files: ``$XDG_CACHE_HOME/riff-raff/history``."""
+    return user_cache_dir("history")
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    """One generation, as shown in the history."""
+
+    text: str
+    persona: str
+    theme: str
+    mode: str
+    flex_level: int
+    nonsense: int
+    timestamp: str
+
+    @classmethod
+    def from_generation(cls, generation: Dict[str, Any]) -> "HistoryEntry":
+        """Compact record of a generation dict (extra keys are dropped)."""
+        return cls(**{name: generation[name] for name in cls.__slots__})
+
+
+class GenerationHistory:
+    """Ring buffer of the newest generations, backed by an append-only log.
+
+    At most ``capacity`` entries are held in memory. When the buffer is
+    full, the oldest entry is appended to a JSON Lines spill file and its
+    byte offset recorded in an ``array`` (8 bytes per entry), so any entry
+    can be read back with one seek. Once ``max_spilled`` entries are on
+    disk, the oldest half is dropped from the file and the offsets, so
+    memory and disk use per session are both capped while the recent
+    history stays browsable with ``page``.
+
+    Indices are chronological (0 is the oldest); ``latest`` and ``page``
+    return the newest first.
+
+    Example:
+        history = GenerationHistory(default_spill_dir() / "session.jsonl")
+        history.append(HistoryEntry.from_generation(generation))
+        history.latest(5)
+        history.page(2, size=10)
+    """
+
+    def __init__(
+        self,
+        spill_path: Union[str, Path],
+        capacity: int = DEFAULT_CAPACITY,
+        max_spilled: int = DEFAULT_MAX_SPILLED
+    ):
+        """Start an empty history.
+
+        Args:
+            spill_path: JSON Lines file for entries evicted from memory
+                (created on the first eviction, truncated if it exists)
+            capacity: Entries kept in memory
+            max_spilled: Entries kept on disk; reaching it drops the oldest half
+
+        Raises:
+            ValueError: If capacity or max_spilled is not positive
+        """
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}. Must be at least 1")
+        if max_spilled < 1:
+            raise ValueError(f"Invalid max_spilled: {max_spilled}. Must be at least 1")
+        self.spill_path = Path(spill_path)
+        self.capacity = capacity
+        self.max_spilled = max_spilled
+        self._recent: Deque[HistoryEntry] = deque()
+        self._offsets = array('Q')  # Byte offset of each spilled entry
+        self._spill_size = 0
+        self.spill_path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._recent)
+
+    @property
+    def spilled(self) -> int:
+        """Entries that live on disk only."""
+        return len(self._offsets)
+
+    def append(self, entry: HistoryEntry) -> None:
+        """Add the newest entry, spilling the oldest one if the buffer is full."""
+        if len(self._recent) == self.capacity:
+            self._spill(self._recent.popleft())
+        self._recent.append(entry)
+
+    def _spill(self, entry: HistoryEntry) -> None:
+        if len(self._offsets) >= self.max_spilled:
+            self._drop_oldest(len(self._offsets) - self.max_spilled // 2)
+        line = (json.dumps(asdict(entry)) + "\n").encode("utf-8")
+        if not self._offsets:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "ab") as f:
+            f.write(line)
+        self._offsets.append(self._spill_size)
+        self._spill_size += len(line)
+
+    def _drop_oldest(self, count: int) -> None:
+        # Rewrite the spill file without its first ``count`` lines; dropping half
+        # at a time keeps the copying to about one line per spill
+        start = self._offsets[count] if count < len(self._offsets) else self._spill_size
+        staged = self.spill_path.with_name(f"{self.spill_path.name}.tmp")
+        with open(self.spill_path, "rb") as source, open(staged, "wb") as target:
+            source.seek(start)
+            shutil.copyfileobj(source, target)
+        os.replace(staged, self.spill_path)
+        self._offsets = array('Q', (offset - start for offset in self._offsets[count:]))
+        self._spill_size -= start
+        logger.debug("Dropped the %d oldest history entries from %s", count, self.spill_path)
+
+    def _read_spilled(self, start: int, stop: int) -> List[HistoryEntry]:
+        if start >= stop:
+            return []
+        with open(self.spill_path, "rb") as f:
+            f.seek(self._offsets[start])
+            return [HistoryEntry(**json.loads(f.readline())) for _ in range(start, stop)]
+
+    def __getitem__(self, index: int) -> HistoryEntry:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"History index out of range: {index}")
+        if index >= self.spilled:
+            return self._recent[index - self.spilled]
+        return self._read_spilled(index, index + 1)[0]
+
+    def entries(self, start: int, stop: int) -> List[HistoryEntry]:
+        """Entries ``start:stop`` in chronological order, reading disk only for spilled ones."""
+        start, stop = max(start, 0), min(stop, len(self))
+        spilled = self._read_spilled(start, min(stop, self.spilled))
+        recent = [self._recent[i - self.spilled] for i in range(max(start, self.spilled), stop)]
+        return spilled + recent
+
+    def latest(self, count: int) -> List[HistoryEntry]:
+        """The newest ``count`` entries, newest first."""
+        return self.page(0, count)
+
+    def page(self, number: int, size: int = 10) -> List[HistoryEntry]:
+        """One page of the history, newest first (page 0 is the newest).
+
+        Returns:
+            Up to ``size`` entries (empty past the last page)
+        """
+        stop = len(self) - number * size
+        return self.entries(stop - size, stop)[::-1]
+
+    def pages(self, size: int = 10) -> int:
+        """Number of pages of ``size`` entries."""
+        return -(-len(self) // size)
+
+    def clear(self) -> None:
+        """Forget every entry and delete the spill file."""
+        self._recent.clear()
+        self._offsets = array('Q')
+        self._spill_size = 0
+        self.spill_path.unlink(missing_ok=True)
+
+
+def prune_spills(spill_dir: Optional[Union[str, Path]] = None, max_age: float = SPILL_MAX_AGE) -> int:
+    """Delete spill files of sessions that have not written for ``max_age`` seconds.
+
+    Args:
+        spill_dir: Directory of spill files (default: ``default_spill_dir()``)
+        max_age: Seconds without writes before a file is deleted
+
+    Returns:
+        Number of files deleted
+    """
+    spill_dir = Path(spill_dir) if spill_dir is not None else default_spill_dir()
+    cutoff = time.time() - max_age
+    pruned = 0
+    for path in spill_dir.glob("*.jsonl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                pruned += 1
+        except FileNotFoundError:
+            continue  # Pruned by another session
+    if pruned:
+        logger.info(f"Pruned {pruned} stale history files from {spill_dir}")
+    return pruned
@@ -0,0 +1,224 @@
+"""Lightweight timing metrics for the hot paths
+
+Operations are timed with ``timed`` (a context manager and a decorator)
+into per-operation counters and a latency histogram with fixed,
+log-spaced buckets (HDR-style: ``SUB_BUCKETS`` per power of two from
+about 1 µs to about a minute), so recording is O(1) memory and
+percentiles stay within one bucket width of the truth.
+
+Metrics are off unless ``RIFF_RAFF_METRICS`` is set (or ``enable_metrics``
+is called); while off, a timer costs one flag check. Read them with
+``get_metrics`` or as Prometheus text with ``prometheus_text``.
+
+This module only imports the standard library, so every other module can
+use it.
+"""
+import functools
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+METRICS_ENV = "RIFF_RAFF_METRICS"
+SUB_BUCKETS = 4  # Per power of two (bucket width ~19%)
+MIN_EXPONENT = -20  # 2 ** -20 s ~ 1 µs
+MAX_EXPONENT = 6  # 2 ** 6 s = 64 s; slower calls land in the +Inf bucket
+PERCENTILES = (50, 95, 99)
+
+# Upper bounds (seconds) of the finite buckets
+BUCKET_BOUNDS = tuple(
+    2.0 ** (MIN_EXPONENT + i / SUB_BUCKETS)
+    for i in range((MAX_EXPONENT - MIN_EXPONENT) * SUB_BUCKETS + 1)
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = os.environ.get(METRICS_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+class _Operation:
+    """Counters and histogram of one operation."""
+
+    __slots__ = ("lock", "count", "errors", "total", "max", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)  # Last one is +Inf
+
+    def add(self, seconds: float, error: bool) -> None:
+        index = bisect_left(BUCKET_BOUNDS, seconds)
+        with self.lock:
+            self.count += 1
+            self.errors += error
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            self.buckets[index] += 1
+
+
+_operations: Dict[str, _Operation] = {}
+_registry_lock = threading.Lock()
+
+
+def _percentile(q: float, buckets: List[int], count: int, maximum: float) -> float:
+    # Upper bound of the bucket holding the q-th percentile, capped at the slowest call
+    rank = max(1, math.ceil(count * q / 100))
+    seen = 0
+    for index, hits in enumerate(buckets):
+        seen += hits
+        if seen >= rank:
+            return min(BUCKET_BOUNDS[index], maximum) if index < len(BUCKET_BOUNDS) else maximum
+    return maximum
+
+
+def enable_metrics(enabled: bool = True) -> None:
+    """Turn recording on or off (already recorded metrics are kept)."""
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    """Whether timers currently record."""
+    return _enabled
+
+
+def _operation(name: str) -> _Operation:
+    operation = _operations.get(name)
+    if operation is None:
+        with _registry_lock:
+            operation = _operations.setdefault(name, _Operation())
+    return operation
+
+
+def record(name: str, seconds: float, error: bool = False) -> None:
+    """Record one call of ``name`` that took ``seconds`` (no-op while disabled).
+
+    For code that already measures its own time; otherwise use ``timed``.
+    """
+    if _enabled:
+        _operation(name).add(seconds, error)
+
+
+class timed:
+    """Time a block or every call of a function as operation ``name``.
+
+    Calls that raise are counted (and timed) as errors.
+
+    Example::
+
+        with timed("vault.save"):
+            save_lyrics(lyrics)
+
+        @timed("lyrics.generate_bars")
+        def generate_bars(...): ...
+    """
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start: Optional[float] = None
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter() if _enabled else None
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._start is not None:
+            _operation(self.name).add(time.perf_counter() - self._start, exc_type is not None)
+
+    def __call__(self, func: F) -> F:
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            error = True
+            try:
+                result = func(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                _operation(name).add(time.perf_counter() - start, error)
+
+        return wrapper  # type: ignore[return-value]
+
+
+def _snapshot() -> List[Tuple[str, _Operation]]:
+    with _registry_lock:
+        return sorted(_operations.items())
+
+
+def get_metrics() -> Dict[str, Dict[str, float]]:
+    """Snapshot of every operation recorded so far.
+
+    Returns:
+        Operation name -> ``count``, ``errors``, ``total``, ``mean``, ``max``
+        and ``p50``/``p95``/``p99`` (all times in seconds; percentiles are
+        bucket upper bounds)
+    """
+    snapshot = {}
+    for name, operation in _snapshot():
+        with operation.lock:
+            count, errors, total, maximum = operation.count, operation.errors, operation.total, operation.max
+            buckets = list(operation.buckets)
+        stats = {
+            "count": count,
+            "errors": errors,
+            "total": total,
+            "mean": total / count if count else 0.0,
+            "max": maximum,
+        }
+        for q in PERCENTILES:
+            stats[f"p{q}"] = _percentile(q, buckets, count, maximum) if count else 0.0
+        snapshot[name] = stats
+    return snapshot
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(prefix: str = "riff_raff") -> str:
+    """All operations in the Prometheus text exposition format.
+
+    Exposes a ``<prefix>_operation_seconds`` histogram and an
+    ``<prefix>_operation_errors_total`` counter, labelled by operation.
+    """
+    histogram, errors = f"{prefix}_operation_seconds", f"{prefix}_operation_errors_total"
+    lines = [
+        f"# HELP {histogram} Time spent per operation call.",
+        f"# TYPE {histogram} histogram",
+    ]
+    error_lines = [
+        f"# HELP {errors} Operation calls that raised.",
+        f"# TYPE {errors} counter",
+    ]
+    for name, operation in _snapshot():
+        with operation.lock:
+            count, total, failed = operation.count, operation.total, operation.errors
+            buckets = list(operation.buckets)
+        label = f'operation="{_label(name)}"'
+        cumulative = 0
+        for bound, hits in zip(BUCKET_BOUNDS, buckets[:-1], strict=True):  # +Inf is the count
+            cumulative += hits
+            lines.append(f'{histogram}_bucket{{{label},le="{bound:.9g}"}} {cumulative}')
+        lines.append(f'{histogram}_bucket{{{label},le="+Inf"}} {count}')
+        lines.append(f"{histogram}_sum{{{label}}} {total!r}")
+        lines.append(f"{histogram}_count{{{label}}} {count}")
+        error_lines.append(f"{errors}{{{label}}} {failed}")
+    return "\n".join(lines + error_lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Forget everything recorded so far."""
+    with _registry_lock:
+        _operations.clear()
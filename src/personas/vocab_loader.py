@@ -1,8 +1,10 @@
 """Load & manage persona vocab"""
-import os
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
 
+from src.metrics import timed
 from src.utils import get_logger, load_json_file
 
 
@@ -10,7 +12,14 @@ logger = get_logger(__name__)
 
 
 class PersonaVocabLoader:
-    """Load and manage persona-specific vocabulary and styles."""
+    """Load and manage persona-specific vocabulary and styles.
+
+    One loader is shared by every session of the app. The cache is never
+    mutated: loading a new persona, ``reload`` and ``clear_cache`` publish
+    a new dict with one attribute assignment (copy-on-write), so lookups
+    take no lock. Cached vocab and style lists are shared by all callers
+    and must be treated as read-only.
+    """
 
     def __init__(self, personas_dir: str = "personas"):
         """Initialize the vocab loader.
@@ -19,8 +28,11 @@ class PersonaVocabLoader:
             personas_dir: Directory containing persona JSON files
         """
         self.personas_dir = Path(personas_dir)
-        self._cache: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._cache: Mapping[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = MappingProxyType({})
+        self._write_lock = threading.Lock()  # Serializes cache swaps so none is lost
+        self._generation = 0  # Bumped by reload/clear so loads that raced them aren't cached
 
+    @timed("personas.load_persona")
     def load_persona(self, persona_name: str) -> Tuple[List[str], List[str]]:
         """Load persona-specific vocabulary and styles.
 
@@ -33,11 +45,25 @@ class PersonaVocabLoader:
         Raises:
             FileNotFoundError: If the base persona file doesn't exist
         """
-        # Check cache first
-        if persona_name in self._cache:
-            logger.debug(f"Loading persona '{persona_name}' from cache")
-            return self._cache[persona_name]
-
+        # Check cache first (one read of the current snapshot)
+        cached = self._cache.get(persona_name)
+        if cached is not None:
+            logger.debug("Loading persona '%s' from cache", persona_name)
+        else:
+            generation = self._generation
+            cached = self._read_persona(persona_name)
+            with self._write_lock:
+                # Another thread may have loaded it meanwhile; keep its entry so all callers agree
+                current = self._cache.get(persona_name)
+                if current is not None:
+                    cached = current
+                elif generation == self._generation:
+                    self._cache = MappingProxyType({**self._cache, persona_name: cached})
+
+        vocab, styles = cached
+        return list(vocab), list(styles)
+
+    def _read_persona(self, persona_name: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
         # Load base persona
         base_file = self.personas_dir / "base.json"
         if not base_file.exists():
@@ -50,24 +76,37 @@ class PersonaVocabLoader:
         # Load specific persona if it exists
         persona_file = self.personas_dir / f"{persona_name.lower().replace(' ', '_')}.json"
         if persona_file.exists():
-            logger.info(f"Loading persona-specific vocab from {persona_file}")
+            logger.info("Loading persona-specific vocab from %s", persona_file)
             persona_data = load_json_file(str(persona_file))
 
             # Merge base and persona-specific vocab
             vocab = vocab + persona_data.get('vocab', [])
             styles = styles + persona_data.get('styles', [])
         else:
-            logger.warning(f"Persona file not found: {persona_file}, using base only")
+            logger.warning("Persona file not found: %s, using base only", persona_file)
+
+        return tuple(vocab), tuple(styles)
 
-        # Cache the result
-        result = (vocab, styles)
-        self._cache[persona_name] = result
+    def reload(self) -> None:
+        """Re-read every cached persona from disk and swap them in at once.
 
-        return result
+        Until the swap, lookups keep getting the previous vocab, never a mix.
+
+        Raises:
+            FileNotFoundError: If the base persona file doesn't exist
+        """
+        with self._write_lock:
+            self._cache = MappingProxyType(
+                {name: self._read_persona(name) for name in self._cache}
+            )
+            self._generation += 1
+        logger.debug("Persona cache reloaded")
 
     def clear_cache(self) -> None:
         """Clear the persona cache."""
-        self._cache.clear()
+        with self._write_lock:
+            self._cache = MappingProxyType({})
+            self._generation += 1
         logger.debug("Persona cache cleared")
 
     def list_available_personas(self) -> List[str]:
@@ -77,7 +116,7 @@ class PersonaVocabLoader:
             List of persona names (without .json extension)
         """
         if not self.personas_dir.exists():
-            logger.warning(f"Personas directory not found: {self.personas_dir}")
+            logger.warning("Personas directory not found: %s", self.personas_dir)
             return []
 
         personas = []
@@ -0,0 +1,207 @@
+"""Sampled cProfile + tracemalloc capture of slow-path calls
+
+Calls wrapped with ``profiled`` are captured when the ``profiling.enabled``
+config key is on, for a random ``profiling.sample_rate`` fraction of calls,
+so the overhead stays bounded under real traffic. Each capture writes a
+``.prof`` file (open it with ``pstats`` or snakeviz) and a text report of
+the slowest functions and the top allocations to ``profiling.dir``; only
+the newest ``profiling.keep`` captures are kept.
+
+Settings (``src.utils.Config`` keys, defaults in brackets):
+    profiling.enabled      Capture at all [False]
+    profiling.sample_rate  Fraction of calls captured, 0-1 [0.01]
+    profiling.dir          Output directory [$XDG_CACHE_HOME/riff-raff/profiles]
+    profiling.keep         Captures kept before the oldest are deleted [50]
+    profiling.top          Functions and allocations per report [20]
+
+One call is captured at a time (``tracemalloc`` is process-wide); calls
+sampled while another capture runs go through uncaptured. Allocations
+by other threads during a capture still show up in its report.
+"""
+import cProfile
+import functools
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from src.utils import Config, get_logger, user_cache_dir
+
+logger = get_logger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_KEEP = 50
+DEFAULT_TOP = 20
+TRACEMALLOC_FRAMES = 10
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def default_profile_dir() -> Path:
+    """Per-user capture directory: ``$XDG_CACHE_HOME/riff-raff/profiles`` (``~/.cache`` if unset)."""
+    return user_cache_dir("profiles")
+
+
+@dataclass
+class ProfileSummary:
+    """What one capture found."""
+
+    name: str  # Operation, e.g. "lyrics.generate_bars"
+    timestamp: str
+    seconds: float
+    peak_bytes: int  # Peak traced memory during the call
+    profile_path: str
+    report_path: str
+    # Slowest functions by cumulative time: (function, calls, own seconds, cumulative seconds)
+    functions: List[Tuple[str, int, float, float]] = field(default_factory=list)
+    # Largest allocations alive when the call returned: (file:line, bytes, blocks)
+    allocations: List[Tuple[str, int, int]] = field(default_factory=list)
+
+
+_capture_lock = threading.Lock()
+_last: Optional[ProfileSummary] = None
+
+
+def profiling_enabled() -> bool:
+    """Whether ``profiling.enabled`` is set."""
+    return bool(Config().get("profiling.enabled", False))
+
+
+def _sampled() -> bool:
+    config = Config()
+    if not config.get("profiling.enabled", False):
+        return False
+    return random.random() < float(config.get("profiling.sample_rate", DEFAULT_SAMPLE_RATE))
+
+
+def _rotate(directory: Path, keep: int) -> None:
+    profiles = sorted(directory.glob("*.prof"))  # Names start with the capture time
+    for stale in profiles[:max(0, len(profiles) - keep)]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".txt").unlink(missing_ok=True)
+
+
+def _write(
+    name: str,
+    seconds: float,
+    profiler: cProfile.Profile,
+    peak: int,
+    snapshot: tracemalloc.Snapshot
+) -> ProfileSummary:
+    config = Config()
+    directory = Path(config.get("profiling.dir") or default_profile_dir())
+    top = int(config.get("profiling.top", DEFAULT_TOP))
+    directory.mkdir(parents=True, exist_ok=True)
+
+    now = datetime.now()
+    stem = f"{now:%Y%m%d-%H%M%S-%f}-{os.getpid()}-{name}"
+    profile_path, report_path = directory / f"{stem}.prof", directory / f"{stem}.txt"
+    profiler.dump_stats(str(profile_path))
+
+    stats = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+    functions = [
+        (f"{Path(file).name}:{line}({function})", calls, tottime, cumtime)
+        for (file, line, function), (_, calls, tottime, cumtime, _) in sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]  # Missing from the pstats stubs
+            key=lambda item: item[1][3], reverse=True
+        )[:top]
+    ]
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    allocations = [
+        (str(stat.traceback[0]), stat.size, stat.count)
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+    text = io.StringIO()
+    text.write(f"{name}: {seconds * 1000:.2f} ms, peak traced memory {peak / 1024:.1f} KiB\n")
+    text.write(f"Captured {now.isoformat()} in process {os.getpid()}\n\n")
+    pstats.Stats(profiler, stream=text).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    text.write(f"Top {top} allocations still alive at the end of the call:\n")
+    for line, size, count in allocations:
+        text.write(f"{size / 1024:10.1f} KiB {count:8} blocks  {line}\n")
+    report_path.write_text(text.getvalue())
+
+    _rotate(directory, int(config.get("profiling.keep", DEFAULT_KEEP)))
+    return ProfileSummary(
+        name=name,
+        timestamp=now.isoformat(timespec="seconds"),
+        seconds=seconds,
+        peak_bytes=peak,
+        profile_path=str(profile_path),
+        report_path=str(report_path),
+        functions=functions,
+        allocations=allocations,
+    )
+
+
+def _capture(name: str, func: Callable[..., Any], args: Any, kwargs: Any) -> Any:
+    if not _capture_lock.acquire(blocking=False):
+        return func(*args, **kwargs)  # Another capture is running (maybe an outer call)
+    try:
+        tracing = tracemalloc.is_tracing()  # Someone else's tracing is left running
+        if not tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if not tracing:
+                tracemalloc.stop()
+            _save(name, seconds, profiler, peak, snapshot)
+    finally:
+        _capture_lock.release()
+
+
+def _save(
+    name: str,
+    seconds: float,
+    profiler: cProfile.Profile,
+    peak: int,
+    snapshot: tracemalloc.Snapshot
+) -> None:
+    global _last
+    try:
+        _last = _write(name, seconds, profiler, peak, snapshot)
+    except OSError as e:
+        logger.warning("Could not write profile of %s: %s", name, e)
+        return
+    logger.info("Profiled %s (%.2f ms) into %s", name, seconds * 1000, _last.profile_path)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorate a function so sampled calls are captured as operation ``name``.
+
+    Calls made inside a capture are covered by it and never start their own.
+    """
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sampled():
+                return func(*args, **kwargs)
+            return _capture(name, func, args, kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def last_profile() -> Optional[ProfileSummary]:
+    """The most recent capture in this process, if any."""
+    return _last
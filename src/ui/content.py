@@ -1,2 +1,466 @@
 """Display lyrics, hooks, download buttons"""
-# TODO: Implement content UI
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import streamlit as st
+
+from midi_generator import MIDO_AVAILABLE, generate_midi
+from src.lyrics.generator import LyricGenerator
+from src.lyrics.history import HistoryEntry
+from src.personas.vocab_loader import PersonaVocabLoader
+from src.ui.sidebar import get_settings, get_variation_count
+from vault_manager import append_lyrics, delete_lyrics, export_json, export_text, load_lyrics
+
+if TYPE_CHECKING:
+    from src.fx.jobs import JobQueue
+
+VAULT_PATH = "data/saved_lyrics.json"
+HISTORY_SHOWN = 5
+GRID_COLUMNS = 3
+
+
+@st.cache_resource
+def get_vocab_loader() -> PersonaVocabLoader:
+    """Persona registry shared by every session (files are read once)."""
+    return PersonaVocabLoader()
+
+
+@st.cache_resource
+def get_generator() -> LyricGenerator:
+    """Lyric generator shared by every session."""
+    return LyricGenerator(vocab_loader=get_vocab_loader())
+
+
+@st.cache_resource
+def get_job_queue() -> "JobQueue":
+    """Background FX job queue shared by every session."""
+    from src.fx.jobs import JobQueue
+
+    return JobQueue()
+
+
+@st.cache_data(show_spinner=False)
+def _read_vault(path: str, mtime_ns: Optional[int]) -> List[Dict[str, Any]]:
+    lyrics = load_lyrics(path)
+    return lyrics if isinstance(lyrics, list) else []
+
+
+def load_vault() -> List[Dict[str, Any]]:
+    """Saved lyrics, re-read from disk only when the vault file changed.
+
+    Returns a fresh copy on every call, so callers may modify it.
+    """
+    try:
+        mtime_ns: Optional[int] = os.stat(VAULT_PATH).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    return _read_vault(VAULT_PATH, mtime_ns)
+
+
+@st.fragment
+def _history() -> None:
+    st.header("📚 Generation History")
+
+    history = st.session_state.generation_history
+    if not history:
+        st.info("No generation history yet. Generate some bars to see them here!")
+        return
+
+    # Page 1 is the newest; older pages are read back from the spill file
+    page = 0
+    if len(history) > HISTORY_SHOWN:
+        page = st.number_input(
+            f"Page (of {history.pages(HISTORY_SHOWN)})",
+            min_value=1,
+            max_value=history.pages(HISTORY_SHOWN),
+            value=1,
+            key="history_page"
+        ) - 1
+        st.caption(f"{len(history)} generations this session")
+
+    for i, entry in enumerate(history.page(page, HISTORY_SHOWN)):
+        with st.expander(f"{entry.timestamp} - {entry.persona} ({entry.theme})"):
+            st.text_area(
+                f"{entry.mode}",
+                value=entry.text,
+                height=100,
+                disabled=True,
+                key=f"history_{i}"
+            )
+            st.caption(f"Flex: {entry.flex_level} | Nonsense: {entry.nonsense}")
+
+
+def _save_to_vault(generation: Dict[str, Any]) -> None:
+    append_lyrics({
+        'text': generation['text'],
+        'persona': generation['persona'],
+        'theme': generation['theme'],
+        'mode': generation['mode'],
+        'flex_level': generation['flex_level'],
+        'nonsense': generation['nonsense'],
+        'timestamp': datetime.now().isoformat()
+    }, VAULT_PATH)
+
+
+def _midi_preview(text: str) -> None:
+    from src.hooks.synth import render_midi_to_wav
+
+    # Line the beat and melody up with an uploaded vocal take, if any
+    analysis = st.session_state.get('fx_analysis')
+    midi_options = {}
+    if analysis is not None:
+        midi_options = {
+            'tempo': analysis.tempo or 120,
+            'base_note': analysis.base_note,
+            'scale': analysis.scale_intervals,
+        }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        midi_path = generate_midi(text, str(Path(tmp_dir) / "preview.mid"), **midi_options)
+        st.audio(render_midi_to_wav(midi_path), format="audio/wav")
+
+
+def _variation_grid(count: int) -> List[Any]:
+    columns = st.columns(GRID_COLUMNS)
+    return [columns[i % GRID_COLUMNS].empty() for i in range(count)]
+
+
+def _variation_cards(cells: List[Any], variations: List[Dict[str, Any]]) -> None:
+    for cell, variation in zip(cells, variations, strict=True):
+        with cell.container():
+            st.text_area(
+                f"#{variation['index'] + 1} · seed {variation['seed']}",
+                value=variation['text'],
+                height=120,
+                disabled=True,
+                key=f"variation_{variation['seed']}"
+            )
+            if st.button("💾 Save", key=f"save_variation_{variation['seed']}"):
+                try:
+                    _save_to_vault(variation)
+                except Exception as e:
+                    st.error(f"❌ Error saving: {e}")
+                else:
+                    st.session_state.vault_saved = True
+                    st.rerun()
+
+
+def _generate_variations(settings: Dict[str, Any], count: int) -> None:
+    # Workers fill the grid as they finish, all within this one fragment run
+    progress = st.progress(0.0, text=f"Generating {count} variations...")
+    cells = _variation_grid(count)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    variations: List[Optional[Dict[str, Any]]] = [None] * count
+    generated = get_generator().iter_variations(
+        settings['persona'],
+        settings['theme'],
+        settings['mode'],
+        settings['flex_level'],
+        settings['nonsense'],
+        count=count,
+    )
+    for done, variation in enumerate(generated, 1):
+        variations[variation.index] = {
+            'text': variation.text,
+            **settings,
+            'index': variation.index,
+            'seed': variation.seed,
+            'timestamp': timestamp,
+        }
+        cells[variation.index].code(variation.text, language=None)
+        progress.progress(done / count, text=f"Generated {done}/{count} variations")
+    progress.empty()
+    # Every index has been filled by now
+    completed = [variation for variation in variations if variation is not None]
+    st.session_state.variations = completed
+    _variation_cards(cells, completed)
+
+
+@st.fragment
+def render_generation() -> None:
+    """Generate button, the current generation and the history next to it.
+
+    In variations mode one click fills a grid of seeded candidates, each
+    with its own Save button, instead of a single generation.
+
+    Runs as a fragment: generating, downloading or previewing reruns only
+    this section (and the history nested in it), never the vault.
+    """
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.header("🎤 Generated Content")
+
+        variation_count = get_variation_count()
+        generate = st.button("🎵 Generate", type="primary", use_container_width=True)
+
+        if st.session_state.pop('vault_saved', False):
+            st.success("✅ Saved to vault!")
+
+        if variation_count and generate:
+            _generate_variations(get_settings(), variation_count)
+        elif variation_count:
+            variations = st.session_state.get('variations', [])
+            _variation_cards(_variation_grid(len(variations)), variations)
+        elif generate:
+            settings = get_settings()
+            with st.spinner("Generating your bars..."):
+                generated_text = get_generator().generate(
+                    settings['persona'],
+                    settings['theme'],
+                    settings['mode'],
+                    settings['flex_level'],
+                    settings['nonsense'],
+                )
+            st.session_state.current_generation = {
+                'text': generated_text,
+                **settings,
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            st.session_state.generation_history.append(
+                HistoryEntry.from_generation(st.session_state.current_generation)
+            )
+
+        generation = None if variation_count else st.session_state.get('current_generation')
+        if generation is not None:
+            st.markdown('<div class="generated-content">', unsafe_allow_html=True)
+            st.text_area(
+                "Generated Lyrics",
+                value=generation['text'],
+                height=200,
+                disabled=True,
+                key="display_area"
+            )
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            col_d1, col_d2, col_d3 = st.columns(3)
+            with col_d1:
+                slug = f"{generation['persona'].lower().replace(' ', '_')}_{generation['theme'].lower()}"
+                st.download_button(
+                    label="📥 Download TXT",
+                    data=generation['text'],
+                    file_name=f"riff_raff_{slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                    mime="text/plain"
+                )
+            with col_d2:
+                if st.button("💾 Save to Vault"):
+                    try:
+                        _save_to_vault(generation)
+                    except Exception as e:
+                        st.error(f"❌ Error saving: {e}")
+                    else:
+                        # The vault changed, so the vault and export sections rerun too
+                        st.session_state.vault_saved = True
+                        st.rerun()
+            with col_d3:
+                if st.button("📋 Copy"):
+                    st.write("📋 Copied to clipboard!")
+                    st.code(generation['text'])
+
+            # Render the generated MIDI (melody + beat) to audio for in-app preview
+            if MIDO_AVAILABLE and st.button("🎹 Preview as Audio"):
+                _midi_preview(generation['text'])
+
+    with col2:
+        _history()
+
+
+@st.fragment
+def _saved_lyrics() -> None:
+    try:
+        saved_lyrics = load_vault()
+    except Exception as e:
+        st.error(f"Error loading vault: {e}")
+        return
+    if not saved_lyrics:
+        st.info("No saved lyrics in vault yet. Save some generations to see them here!")
+        return
+
+    for i, lyric in enumerate(saved_lyrics):
+        title = f"{lyric.get('timestamp', 'Unknown')} - {lyric.get('persona', 'Unknown')} ({lyric.get('theme', 'Unknown')})"
+        with st.expander(title):
+            st.text_area(
+                f"{lyric.get('mode', 'Unknown')}",
+                value=lyric.get('text', ''),
+                height=100,
+                disabled=True,
+                key=f"vault_{i}"
+            )
+            st.caption(f"Flex: {lyric.get('flex_level', 'N/A')} | Nonsense: {lyric.get('nonsense', 'N/A')}")
+
+            if st.button("🗑️ Delete", key=f"delete_{i}"):
+                delete_lyrics(lyric, VAULT_PATH)
+                st.rerun()  # The export section shows the vault too
+
+
+@st.fragment
+def _export_vault() -> None:
+    try:
+        saved_lyrics = load_vault()
+    except Exception as e:
+        st.error(f"Error exporting vault: {e}")
+        return
+    if not saved_lyrics:
+        st.info("No lyrics to export. Save some generations first!")
+        return
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    st.download_button(
+        label="📥 Export Vault as JSON",
+        data=export_json(saved_lyrics),
+        file_name=f"riff_raff_vault_{stamp}.json",
+        mime="application/json"
+    )
+    st.download_button(
+        label="📥 Export Vault as TXT",
+        data=export_text(saved_lyrics),
+        file_name=f"riff_raff_vault_{stamp}.txt",
+        mime="text/plain"
+    )
+
+
+def render_vault() -> None:
+    """Saved lyrics and vault export, each a fragment of its own."""
+    st.header("🗄️ Vault")
+    tab1, tab2 = st.tabs(["Saved Lyrics", "Export Vault"])
+    with tab1:
+        _saved_lyrics()
+    with tab2:
+        _export_vault()
+
+
+@st.fragment
+def _fx_export_job() -> None:
+    # Full-quality export runs in the background job queue; reruns only poll
+    # the job table, so the session never blocks on processing
+    job_queue = get_job_queue()
+    if st.button("📦 Export Full Mix & Stems"):
+        st.session_state.fx_job = job_queue.submit(
+            st.session_state.fx_graph.source, st.session_state.fx_graph.fx.params()
+        )
+
+    if not st.session_state.get('fx_job'):
+        return
+    job = job_queue.status(st.session_state.fx_job)
+    if job.status == "done":
+        mix_path = Path(job.output_dir) / st.session_state.fx_graph.fx.mix_filename
+        st.download_button("📥 Download Mix", mix_path.read_bytes(), file_name=mix_path.name)
+    elif job.status == "failed":
+        st.error(f"❌ Export failed: {job.error}")
+    elif job.finished:
+        st.info("Export cancelled")
+    else:
+        st.progress(job.progress, text=f"Exporting... ({job.status})")
+        col_j1, col_j2 = st.columns(2)
+        with col_j1:
+            st.button("🔄 Refresh")
+        with col_j2:
+            if st.button("✖️ Cancel Export"):
+                job_queue.cancel(job.id)
+                st.rerun(scope="fragment")
+
+
+def _store_take(name: str, data: bytes) -> str:
+    # One temp directory per session holds the current take and its sidecars;
+    # it is removed when the next take arrives or the session state is dropped
+    previous = st.session_state.get('fx_take_dir')
+    if previous is not None:
+        if st.session_state.get('fx_job'):
+            get_job_queue().cancel(st.session_state.fx_job)  # Its input is about to go
+            st.session_state.fx_job = None
+        previous.cleanup()
+    take_dir = tempfile.TemporaryDirectory(prefix="riff-raff-take-")
+    st.session_state.fx_take_dir = take_dir
+    take_path = Path(take_dir.name) / f"take{Path(name).suffix}"
+    take_path.write_bytes(data)
+    return str(take_path)
+
+
+@st.fragment
+def render_hook_fx() -> None:
+    """Upload a vocal take and tweak the hook FX chain.
+
+    Sliders re-render through the incremental graph, so only the stages
+    downstream of a tweak are recomputed, and only this section reruns.
+    """
+    st.header("🎚️ Hook Vocal FX")
+    take = st.file_uploader("Upload a vocal take", type=["wav", "flac", "ogg", "m4a", "mp3"])
+    if take is None:
+        return
+
+    import numpy as np
+
+    from src.fx.analysis import analyze_file
+    from src.fx.cache import default_cache_dir
+    from src.fx.graph import FXGraph
+    from src.fx.pipeline import DOUBLER_TYPES, REVERB_TYPES, HookFX
+    from src.fx.pitch import KEYS, SCALES
+    from src.hooks.synth import to_wav_bytes
+
+    take_id = f"{take.name}-{take.size}"
+    if st.session_state.get('fx_take_id') != take_id:
+        take_path = _store_take(take.name, take.getvalue())
+        # Decodes are cached, so re-uploads and export jobs skip ffmpeg
+        st.session_state.fx_graph = FXGraph(take_path, HookFX(cache_dir=str(default_cache_dir())))
+        st.session_state.fx_analysis = analyze_file(take_path, st.session_state.fx_graph.fx.cache)
+        st.session_state.fx_take_id = take_id
+
+    analysis = st.session_state.fx_analysis
+    st.caption(
+        f"Detected {analysis.tempo:.0f} BPM, {analysis.key} {analysis.scale} "
+        "(used for the MIDI preview)"
+    )
+
+    fx_col1, fx_col2, fx_col3 = st.columns(3)
+    with fx_col1:
+        fx_key = st.selectbox(
+            "Key", list(KEYS), index=list(KEYS).index(analysis.key), help="Key the vocal is tuned to"
+        )
+        fx_scale = st.selectbox("Scale", list(SCALES), index=list(SCALES).index(analysis.scale))
+        retune_ms = st.slider("Retune Speed (ms)", 0, 200, 40, help="0 = hard-tune effect")
+    with fx_col2:
+        doubler = st.radio("Doubler", DOUBLER_TYPES, horizontal=True)
+        double_level_db = st.slider("Double Level (dB)", -24.0, 0.0, -6.0, 0.5)
+    with fx_col3:
+        reverb = st.radio("Reverb", REVERB_TYPES, horizontal=True)
+        reverb_mix_db = st.slider("Reverb Level (dB)", -30.0, 0.0, -6.0, 0.5)
+
+    try:
+        with st.spinner("Rendering FX..."):
+            fx_result = st.session_state.fx_graph.render(
+                key=fx_key,
+                scale=fx_scale,
+                retune_ms=float(retune_ms),
+                doubler=doubler,
+                double_level_db=double_level_db,
+                reverb=reverb,
+                reverb_mix_db=reverb_mix_db,
+            )
+        st.audio(to_wav_bytes(fx_result.mix, fx_result.sample_rate), format="audio/wav")
+
+        # Plot the min/max envelope and log-mel preview, not the raw samples; the
+        # preview is cached per mix, so zooming only reads another pyramid level
+        preview = st.session_state.fx_graph.preview()
+        length = max(preview.duration, 0.1)
+        start, end = st.slider("Zoom (s)", 0.0, length, (0.0, length), 0.1)
+        envelope, _ = preview.waveform(start, end, width=800)
+        st.area_chart({"min": envelope[:, 0], "max": envelope[:, 1]}, height=150)
+        mel = preview.spectrogram(start, end)
+        if mel.size:
+            st.image(
+                np.flipud((np.clip(mel - mel.max(), -80.0, 0.0) + 80.0) / 80.0),
+                caption="Log-mel spectrogram",
+                use_container_width=True,
+                clamp=True,
+            )
+        last_run = st.session_state.fx_graph.last_run
+        if last_run:
+            st.caption(f"Re-rendered {', '.join(last_run)} in {sum(last_run.values()):.2f}s")
+        else:
+            st.caption("Served from cache")
+    except Exception as e:
+        st.error(f"❌ Error processing take: {e}")
+
+    _fx_export_job()
@@ -1,2 +1,85 @@
 """Page layout & theming for Streamlit UI"""
-# TODO: Implement layout and theming
+import uuid
+
+import streamlit as st
+
+from src.lyrics.history import GenerationHistory, default_spill_dir, prune_spills
+
+PAGE_CSS = """
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        text-align: center;
+        color: #FF6B6B;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        text-align: center;
+        color: #4A4A4A;
+        margin-bottom: 2rem;
+    }
+    .generated-content {
+        background-color: #F8F9FA;
+        padding: 1.5rem;
+        border-radius: 10px;
+        border-left: 5px solid #FF6B6B;
+        margin: 1rem 0;
+    }
+    .download-button {
+        background-color: #28A745;
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 5px;
+        text-decoration: none;
+        display: inline-block;
+        margin: 0.5rem;
+    }
+    .history-item {
+        background-color: #E9ECEF;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 0.5rem 0;
+        border-left: 3px solid #FF6B6B;
+    }
+</style>
+"""
+
+
+def configure_page() -> None:
+    """Set the page config and inject the custom CSS (must run first)."""
+    st.set_page_config(
+        page_title="Riff Raff Generator",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+
+def init_session_state() -> None:
+    """Create the session keys the fragments share."""
+    if 'generation_history' not in st.session_state:
+        # Bounded in memory; older generations spill to a per-session log
+        prune_spills()
+        spill_path = default_spill_dir() / f"{uuid.uuid4().hex}.jsonl"
+        st.session_state.generation_history = GenerationHistory(spill_path)
+
+
+def render_header() -> None:
+    """Title and tagline."""
+    st.markdown('<h1 class="main-header">🎤 Riff Raff Lyric Generator</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Build-a-Bar: Surreal Swag Edition</p>', unsafe_allow_html=True)
+
+
+def render_footer() -> None:
+    """Footer line."""
+    st.markdown("---")
+    st.markdown(
+        """
+        <div style='text-align: center; color: #666;'>
+            <p>🎤 Built with ❤️ for the Riff Raff community | Generate surreal swag bars and hooks</p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
@@ -1,2 +1,147 @@
 """Controls for model selection, sliders"""
-# TODO: Implement sidebar UI
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import streamlit as st
+
+from src.lyrics.generator import MODES
+from src.metrics import enable_metrics, get_metrics, metrics_enabled, prometheus_text, reset_metrics
+from src.profiling import DEFAULT_SAMPLE_RATE, last_profile, profiling_enabled
+from src.utils import Config
+
+PERSONAS = ["Neon Alien", "Beach Riff", "Snakeskin Tycoon", "Retro Arcade Savage"]
+THEMES = ["Fashion", "Flexing", "Snacks", "Sci-Fi", "Random"]
+
+# Session keys of the sidebar widgets, with their defaults
+SETTINGS: Dict[str, Any] = {
+    'persona': PERSONAS[0],
+    'theme': THEMES[0],
+    'mode': MODES[0],
+    'flex_level': 7,
+    'nonsense': 5,
+}
+VARIATION_RANGE = (2, 50)
+DEFAULT_VARIATIONS = 12
+
+
+def get_settings() -> Dict[str, Any]:
+    """Current generation settings, as last set in the sidebar."""
+    return {name: st.session_state.get(name, default) for name, default in SETTINGS.items()}
+
+
+def get_variation_count() -> Optional[int]:
+    """Variations to generate per click, or None for a single generation."""
+    if not st.session_state.get('variations_mode', False):
+        return None
+    return int(st.session_state.get('variation_count', DEFAULT_VARIATIONS))
+
+
+@st.fragment
+def _controls() -> None:
+    # A fragment, so moving a slider reruns only the sidebar; the generation
+    # fragment reads the values from session state when Generate is clicked
+    st.header("🎛️ Controls")
+
+    st.selectbox("Choose your Persona", PERSONAS, key='persona', help="Select your Riff Raff persona style")
+    st.selectbox("Theme", THEMES, key='theme', help="Choose the theme for your lyrics")
+    st.radio("Mode", MODES, key='mode', help="Generate a 4-bar verse or a catchy hook")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.slider("💎 Flex Level", 1, 10, SETTINGS['flex_level'], key='flex_level', help="How hard you're flexing")
+    with col2:
+        st.slider("🌀 Nonsense Juice", 0, 10, SETTINGS['nonsense'], key='nonsense', help="Level of surreal randomness")
+
+    if st.toggle("🎲 Variations Mode", key='variations_mode', help="Generate a grid of seeded candidates per click"):
+        st.slider("Variations", *VARIATION_RANGE, DEFAULT_VARIATIONS, key='variation_count')
+
+
+@st.fragment
+def _debug_panel() -> None:
+    # Metrics are process-wide, so the panel shows every session's calls and
+    # only a change made here switches recording
+    st.session_state.metrics_enabled = metrics_enabled()
+    with st.expander("🔧 Debug: Timings", expanded=False):
+        enabled = st.toggle(
+            "Record timings", key='metrics_enabled',
+            on_change=lambda: enable_metrics(st.session_state.metrics_enabled)
+        )
+
+        metrics = get_metrics()
+        if not metrics:
+            st.caption("Nothing recorded yet." if enabled else "Turn on recording, then generate.")
+            return
+        st.dataframe(
+            [
+                {
+                    "operation": name,
+                    "calls": stats["count"],
+                    "errors": stats["errors"],
+                    **{f"{q} ms": round(stats[q] * 1000, 3) for q in ("mean", "p50", "p95", "p99", "max")},
+                }
+                for name, stats in metrics.items()
+            ],
+            hide_index=True,
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📥 Prometheus", prometheus_text(), file_name="riff_raff_metrics.txt", mime="text/plain")
+        with col2:
+            if st.button("Reset", key='metrics_reset'):
+                reset_metrics()
+                st.rerun(scope="fragment")
+
+
+def _set_profiling(name: str) -> None:
+    Config().set(f"profiling.{name}", st.session_state[f"profiling_{name}"])
+
+
+@st.fragment
+def _profile_panel() -> None:
+    # Profiling settings live in the process-wide Config, like the metrics switch:
+    # show the current values, and write only what this user changes
+    st.session_state.profiling_enabled = profiling_enabled()
+    st.session_state.profiling_sample_rate = float(Config().get("profiling.sample_rate", DEFAULT_SAMPLE_RATE))
+    with st.expander("🔬 Debug: Profiling", expanded=False):
+        st.toggle(
+            "Profile sampled calls", key='profiling_enabled', on_change=_set_profiling, args=("enabled",)
+        )
+        st.number_input(
+            "Sample rate", 0.0, 1.0, step=0.01, format="%.3f", key='profiling_sample_rate',
+            help="Fraction of calls captured", on_change=_set_profiling, args=("sample_rate",)
+        )
+
+        summary = last_profile()
+        if summary is None:
+            st.caption("No profile captured yet.")
+            return
+        st.markdown(
+            f"**{summary.name}** at {summary.timestamp}: {summary.seconds * 1000:.1f} ms, "
+            f"peak {summary.peak_bytes / 1024:.0f} KiB"
+        )
+        st.dataframe(
+            [
+                {"function": name, "calls": calls, "own ms": tottime * 1000, "cumulative ms": cumtime * 1000}
+                for name, calls, tottime, cumtime in summary.functions
+            ],
+            hide_index=True,
+        )
+        st.dataframe(
+            [{"line": line, "KiB": size / 1024, "blocks": count} for line, size, count in summary.allocations],
+            hide_index=True,
+        )
+        try:
+            with open(summary.profile_path, "rb") as f:
+                st.download_button("📥 .prof", f.read(), file_name=Path(summary.profile_path).name)
+        except OSError:
+            st.caption("Profile file rotated away.")
+        if st.button("🔄 Refresh", key='profiling_refresh'):
+            st.rerun(scope="fragment")
+
+
+def render_sidebar() -> None:
+    """Persona, theme, mode and level controls, plus the timings and profiling panels."""
+    with st.sidebar:
+        _controls()
+        _debug_panel()
+        _profile_panel()
@@ -2,14 +2,27 @@
 import json
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Union
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from src.metrics import timed
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(level: Union[int, str] = logging.INFO) -> None:
+    """Send log records to stderr (call once, from an entry point).
+
+    Importing library modules never configures logging; the app, the CLI,
+    the API server and the FX script each call this on startup. Does
+    nothing if the root logger already has handlers.
+
+    Args:
+        level: Root log level (e.g. ``logging.INFO`` or ``"DEBUG"``)
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -24,6 +37,7 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+@timed("utils.load_json_file")
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """Load a JSON file and return its contents.
 
@@ -47,7 +61,7 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
     try:
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        logger.debug(f"Successfully loaded JSON from {file_path}")
+        logger.debug("Successfully loaded JSON from %s", file_path)
         return data
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in {file_path}: {e}")
@@ -71,12 +85,25 @@ def save_json_file(data: Dict[str, Any], file_path: str, indent: int = 2) -> Non
     try:
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=indent, ensure_ascii=False)
-        logger.debug(f"Successfully saved JSON to {file_path}")
+        logger.debug("Successfully saved JSON to %s", file_path)
     except Exception as e:
         logger.error(f"Error saving JSON to {file_path}: {e}")
         raise
 
 
+def user_cache_dir(*parts: str) -> Path:
+    """Per-user cache directory ``$XDG_CACHE_HOME/riff-raff/<parts>`` (``~/.cache`` if unset).
+
+    Args:
+        parts: Subdirectories or file name below the cache root
+
+    Returns:
+        Path (not created)
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root, "riff-raff", *parts)
+
+
 def ensure_directory_exists(directory: str) -> Path:
     """Ensure a directory exists, creating it if necessary.
 
@@ -140,11 +167,30 @@ def sanitize_filename(filename: str, max_length: int = 255) -> str:
     return filename
 
 
+def _freeze(value: Any) -> Any:
+    # Read-only copy of a config tree: dicts become read-only mappings, lists tuples
+    if isinstance(value, MappingProxyType):
+        return value  # Already frozen (a subtree of the previous snapshot)
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
 class Config:
-    """Configuration manager for the application."""
+    """Configuration manager for the application.
+
+    The configuration is published as an immutable snapshot (nested
+    read-only mappings, lists as tuples). ``load_config`` and ``set`` build a new snapshot
+    and swap it in with one attribute assignment, so ``get`` never takes a
+    lock and never sees a half-applied change, even while another thread
+    (another Streamlit session) writes.
+    """
 
     _instance: Optional['Config'] = None
-    _config: Dict[str, Any] = {}
+    _config: Mapping[str, Any] = MappingProxyType({})
+    _write_lock = threading.Lock()  # Serializes writers so no update is lost
 
     def __new__(cls):
         if cls._instance is None:
@@ -158,10 +204,22 @@ class Config:
             config_path: Path to the configuration file
         """
         try:
-            self._config = load_json_file(config_path)
+            config = load_json_file(config_path)
         except FileNotFoundError:
             # Use default configuration if file doesn't exist
-            self._config = self._get_default_config()
+            config = self._get_default_config()
+        with self._write_lock:
+            self._config = _freeze(config)
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """Get the current configuration as one consistent, read-only mapping.
+
+        Use it to read several keys that must agree with each other.
+
+        Returns:
+            The configuration snapshot (later changes don't affect it)
+        """
+        return self._config
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value.
@@ -174,10 +232,10 @@ class Config:
             Configuration value or default
         """
         keys = key.split('.')
-        value = self._config
+        value: Any = self._config  # One read: the rest of the walk sees this snapshot only
 
         for k in keys:
-            if isinstance(value, dict):
+            if isinstance(value, Mapping):
                 value = value.get(k)
             else:
                 return default
@@ -195,14 +253,16 @@ class Config:
             value: Value to set
         """
         keys = key.split('.')
-        config = self._config
 
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
+        def updated(config: Any, depth: int) -> Dict[str, Any]:
+            # Copy only the dicts along the key's path; the rest is shared
+            copy: Dict[str, Any] = dict(config) if isinstance(config, Mapping) else {}
+            k = keys[depth]
+            copy[k] = value if depth == len(keys) - 1 else updated(copy.get(k), depth + 1)
+            return copy
 
-        config[keys[-1]] = value
+        with self._write_lock:
+            self._config = _freeze(updated(self._config, 0))
 
     @staticmethod
     def _get_default_config() -> Dict[str, Any]:
@@ -226,5 +286,12 @@ class Config:
                 "default_nonsense_juice": 5,
                 "max_flex_level": 10,
                 "max_nonsense_juice": 10
+            },
+            "profiling": {
+                "enabled": False,
+                "sample_rate": 0.01,
+                "dir": None,  # $XDG_CACHE_HOME/riff-raff/profiles
+                "keep": 50,
+                "top": 20
             }
         }
@@ -5,6 +5,12 @@ from pathlib import Path
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _user_cache(tmp_path, monkeypatch):
+    """Keep per-user caches (e.g. the default decode cache) out of the home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+
+
 @pytest.fixture
 def sample_persona_data():
     """Provide sample persona data for testing."""
@@ -37,3 +43,26 @@ def sample_lyrics():
             "timestamp": "2024-01-01T00:05:00"
         }
     ]
+
+
+@pytest.fixture
+def vocal_take():
+    """Provide two seconds of a synthetic sung vowel (mono float32, 44.1 kHz)."""
+    import numpy as np
+
+    sr = 44100
+    t = np.arange(2 * sr) / sr
+    f0 = 220.0 * 2 ** (0.3 * np.sin(2 * np.pi * 5 * t) / 12)  # Slight vibrato
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 6))
+    return (0.3 * y * np.hanning(t.size)).astype(np.float32)
+
+
+@pytest.fixture
+def vocal_wav(tmp_path, vocal_take):
+    """Write the synthetic take to a WAV file and return its path."""
+    import soundfile as sf
+
+    path = tmp_path / "take.wav"
+    sf.write(str(path), vocal_take, 44100)
+    return path
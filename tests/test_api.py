@@ -0,0 +1,224 @@
+"""Unit tests for the headless generation API"""
+import asyncio
+import base64
+import json
+
+import pytest
+
+from midi_generator import MIDO_AVAILABLE
+from src.api.batching import MicroBatcher
+from src.api.loadtest import Connection, format_report, run_level
+from src.api.server import GenerationServer
+from src.lyrics.generator import GenerationRequest, LyricGenerator
+from src.metrics import enable_metrics, metrics_enabled
+
+
+def serve(tmp_path, scenario, **options):
+    """Run ``scenario(server, connection)`` against a server on a free port."""
+    async def main():
+        server = GenerationServer(port=0, vault_path=str(tmp_path / "vault.json"), **options)
+        await server.start()
+        connection = Connection(server.host, server.port)
+        try:
+            return await scenario(server, connection)
+        finally:
+            connection.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+class TestMicroBatcher:
+    def test_batches_concurrent_requests(self):
+        """Test requests submitted together share one call, in order."""
+        calls = []
+
+        def double(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+
+        async def main():
+            batcher = MicroBatcher(double, max_batch=8, max_wait=0.05)
+            batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+            finally:
+                await batcher.close()
+
+        results = asyncio.run(main())
+
+        assert results == [i * 2 for i in range(20)]
+        assert [len(call) for call in calls] == [8, 8, 4]
+
+    def test_failure_reaches_every_caller(self):
+        """Test an exception in the batch function is raised to each request."""
+        def fail(items):
+            raise RuntimeError("boom")
+
+        async def main():
+            batcher = MicroBatcher(fail)
+            batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+            finally:
+                await batcher.close()
+
+        assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+    def test_bad_item_fails_only_its_request(self):
+        """Test a batch that raises is retried per item, so only the bad request fails."""
+        calls = []
+
+        def invert(items):
+            calls.append(list(items))
+            return [1 / item for item in items]
+
+        async def main():
+            batcher = MicroBatcher(invert, max_batch=8, max_wait=0.05)
+            batcher.start()
+            try:
+                results = await asyncio.gather(batcher.submit(4), batcher.submit(0), return_exceptions=True)
+                return results, batcher.items
+            finally:
+                await batcher.close()
+
+        (good, bad), items = asyncio.run(main())
+
+        assert good == 0.25
+        assert isinstance(bad, ZeroDivisionError)
+        assert calls == [[4, 0], [4], [0]]
+        assert items == 1
+
+    def test_invalid_max_batch(self):
+        """Test a batch must hold at least one item."""
+        with pytest.raises(ValueError):
+            MicroBatcher(list, max_batch=0)
+
+
+class TestGenerateBatch:
+    def test_matches_single_generation(self):
+        """Test a batch returns what generate() gives for each seed."""
+        generator = LyricGenerator()
+        requests = [
+            GenerationRequest("Neon Alien", "Fashion", "4-Bar Verse", 9, 9, seed=1),
+            GenerationRequest("Beach Riff", "Snacks", "Hook Generator", 9, 9, seed=2),
+            GenerationRequest("Neon Alien", "Sci-Fi", "4-Bar Verse", 3, 2, seed=3),
+        ]
+
+        results = generator.generate_batch(requests)
+
+        assert results == [
+            generator.generate(r.persona, r.theme, r.mode, r.flex, r.chaos, seed=r.seed) for r in requests
+        ]
+
+    def test_invalid_mode(self):
+        """Test one bad request fails the batch before any work."""
+        with pytest.raises(ValueError):
+            LyricGenerator().generate_batch([GenerationRequest("Neon Alien", "Fashion", "Chorus")])
+
+
+class TestGenerationServer:
+    def test_bars_and_hook(self, tmp_path):
+        """Test the single-generation endpoints return seeded JSON."""
+        async def scenario(server, connection):
+            bars = await connection.request("POST", "/bars", {"persona": "Neon Alien", "theme": "Fashion", "seed": 7})
+            hook = await connection.request("POST", "/hook", {"persona": "Beach Riff", "theme": "Snacks"})
+            return bars, hook
+
+        (bars_status, bars), (hook_status, hook) = serve(tmp_path, scenario)
+
+        assert bars_status == hook_status == 200
+        assert bars["text"] == LyricGenerator().generate("Neon Alien", "Fashion", seed=7)
+        assert len(bars["text"].split("\n")) == 4
+        assert hook["mode"] == "Hook Generator" and isinstance(hook["seed"], int)
+
+    def test_concurrent_requests_are_batched(self, tmp_path):
+        """Test concurrent clients share generation batches."""
+        async def scenario(server, connection):
+            result = await run_level(server.host, server.port, concurrency=16, requests=64)
+            return result, server.batcher
+
+        result, batcher = serve(tmp_path, scenario, max_wait=0.01)
+
+        assert result.errors == 0 and len(result.latencies) == 64
+        assert batcher.items == 64
+        assert batcher.batches < 64
+        assert "p99 ms" in format_report([result])
+
+    def test_batch_endpoint(self, tmp_path):
+        """Test /batch answers every request in order."""
+        requests = [
+            {"persona": "Neon Alien", "theme": "Fashion", "mode": "4-Bar Verse", "seed": i} for i in range(5)
+        ] + [{"persona": "Beach Riff", "theme": "Snacks", "mode": "Hook Generator", "seed": 99}]
+
+        async def scenario(server, connection):
+            return await connection.request("POST", "/batch", {"requests": requests})
+
+        status, body = serve(tmp_path, scenario)
+
+        assert status == 200
+        assert [result["seed"] for result in body["results"]] == [0, 1, 2, 3, 4, 99]
+        assert body["results"][-1]["mode"] == "Hook Generator"
+
+    def test_vault_save(self, tmp_path):
+        """Test /vault appends to the vault file, also under concurrency."""
+        entry = {"text": "My drip glows.", "persona": "Neon Alien", "theme": "Fashion"}
+
+        async def scenario(server, connection):
+            others = [Connection(server.host, server.port) for _ in range(5)]
+            try:
+                return await asyncio.gather(*(other.request("POST", "/vault", entry) for other in others))
+            finally:
+                for other in others:
+                    other.close()
+
+        responses = serve(tmp_path, scenario)
+
+        assert all(status == 201 for status, _ in responses)
+        saved = json.loads((tmp_path / "vault.json").read_text())
+        assert len(saved) == 5 and saved[0]["text"] == "My drip glows."
+
+    @pytest.mark.skipif(not MIDO_AVAILABLE, reason="mido not installed")
+    def test_midi(self, tmp_path):
+        """Test /midi returns a base64 standard MIDI file."""
+        async def scenario(server, connection):
+            return await connection.request("POST", "/midi", {"text": "drip drip\nflex", "tempo": 90})
+
+        status, body = serve(tmp_path, scenario)
+
+        assert status == 200
+        assert base64.b64decode(body["midi"]).startswith(b"MThd")
+
+    def test_errors(self, tmp_path):
+        """Test bad input and unknown routes get JSON errors on a live connection."""
+        async def scenario(server, connection):
+            return [
+                await connection.request("POST", "/bars", {"persona": "Neon Alien"}),
+                await connection.request("POST", "/bars", {"persona": "Neon Alien", "theme": "Fashion", "flex": 11}),
+                await connection.request("POST", "/batch", {"requests": []}),
+                await connection.request("GET", "/bars"),
+                await connection.request("GET", "/nope"),
+                await connection.request("GET", "/health"),
+            ]
+
+        responses = serve(tmp_path, scenario)
+
+        assert [status for status, _ in responses] == [400, 400, 400, 405, 404, 200]
+        assert "theme" in responses[0][1]["error"]
+
+    def test_metrics(self, tmp_path):
+        """Test /metrics serves generation timings as Prometheus text."""
+        was_enabled = metrics_enabled()
+        enable_metrics()
+
+        async def scenario(server, connection):
+            await connection.request("POST", "/bars", {"persona": "Neon Alien", "theme": "Fashion"})
+            return await connection.request("GET", "/metrics")
+
+        try:
+            status, text = serve(tmp_path, scenario)
+        finally:
+            enable_metrics(was_enabled)
+
+        assert status == 200
+        assert 'riff_raff_operation_seconds_count{operation="lyrics.generate_batch"}' in text
@@ -0,0 +1,96 @@
+"""Unit tests for the multi-track arrangement engine"""
+import mido
+import pytest
+
+from src.hooks.arrangement import (
+    DEFAULT_PARTS,
+    Arrangement,
+    MidiEvent,
+    generate_arrangement,
+)
+
+HOOK = "Came through drippin' Michelle Obama skittles and drama"
+
+
+class TestArrangementEvents:
+    @pytest.mark.parametrize("part", DEFAULT_PARTS)
+    def test_track_is_time_sorted(self, part):
+        """Test that each part yields events in time order."""
+        events = list(Arrangement(HOOK, repeats=2).track(part))
+        ticks = [e.tick for e in events]
+
+        assert ticks == sorted(ticks)
+        assert all(isinstance(e, MidiEvent) for e in events)
+
+    def test_notes_balanced(self):
+        """Test that every note_on has a matching note_off."""
+        events = list(Arrangement(HOOK).pads())
+        ons = sum(1 for e in events if e.data[0] & 0xF0 == 0x90)
+        offs = sum(1 for e in events if e.data[0] & 0xF0 == 0x80)
+
+        assert ons == offs > 0
+
+    def test_merged_stream_sorted(self):
+        """Test that the heap-merged stream is globally time-sorted."""
+        keys = [(e.tick, e.order) for e in Arrangement(HOOK).events()]
+
+        assert keys == sorted(keys)
+
+    def test_events_are_lazy(self):
+        """Test that long arrangements are not materialized up front."""
+        stream = Arrangement(HOOK, repeats=1_000_000).events()
+        first = next(stream)
+
+        assert first.tick == 0
+
+    def test_unknown_part(self):
+        """Test that an unknown part raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown part"):
+            Arrangement(HOOK).track("kazoo")
+
+
+class TestArrangementWrite:
+    def test_write_type_1(self, tmp_path):
+        """Test writing one track per part plus a conductor track."""
+        output = tmp_path / "arrangement.mid"
+        Arrangement(HOOK).write(str(output), midi_type=1)
+
+        mid = mido.MidiFile(str(output))
+        assert mid.type == 1
+        assert len(mid.tracks) == len(DEFAULT_PARTS) + 1
+        assert [t.name for t in mid.tracks[1:]] == list(DEFAULT_PARTS)
+
+    def test_write_type_0(self, tmp_path):
+        """Test writing a single merged track."""
+        output = tmp_path / "arrangement.mid"
+        Arrangement(HOOK, tempo=90).write(str(output), midi_type=0)
+
+        mid = mido.MidiFile(str(output))
+        assert mid.type == 0
+        assert len(mid.tracks) == 1
+        tempos = [m.tempo for m in mid.tracks[0] if m.type == 'set_tempo']
+        assert tempos == [int(60000000 / 90)]
+
+    def test_type_0_and_1_same_length(self, tmp_path):
+        """Test that both formats describe the same music."""
+        arrangement = Arrangement(HOOK, repeats=3)
+        arrangement.write(str(tmp_path / "t0.mid"), midi_type=0)
+        arrangement.write(str(tmp_path / "t1.mid"), midi_type=1)
+
+        length0 = mido.MidiFile(str(tmp_path / "t0.mid")).length
+        length1 = mido.MidiFile(str(tmp_path / "t1.mid")).length
+        assert length0 == pytest.approx(length1)
+        assert length0 == pytest.approx(arrangement.total_bars * 2.0)
+
+    def test_invalid_midi_type(self, tmp_path):
+        """Test that an unsupported SMF type raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid midi_type"):
+            Arrangement(HOOK).write(str(tmp_path / "bad.mid"), midi_type=2)
+
+    def test_generate_arrangement(self, tmp_path):
+        """Test the convenience function."""
+        output = tmp_path / "nested" / "song.mid"
+        result = generate_arrangement(HOOK, str(output), repeats=2)
+
+        assert result == str(output)
+        assert output.exists()
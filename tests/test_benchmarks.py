@@ -0,0 +1,103 @@
+"""Unit tests for the benchmark harness and its command line"""
+import json
+
+import pytest
+
+from benchmarks import harness
+from benchmarks.__main__ import main
+from benchmarks.suite import query_vault, vault_entries
+
+
+def results(path, **medians):
+    """Write a results file with the given per-call seconds."""
+    timings = [harness.Timing(name, "test", 1, [seconds]) for name, seconds in medians.items()]
+    return harness.save_results(timings, path)
+
+
+class TestHarness:
+    def test_measure_calibrates_loops(self):
+        """Test fast calls are looped until a sample takes min_time."""
+        calls = []
+
+        loops, samples = harness.measure(lambda: calls.append(1), min_time=0.01, repeat=3)
+
+        assert loops > 1 and len(samples) == 3
+        assert len(calls) >= 3 * loops
+        assert all(sample < 0.01 for sample in samples)
+
+    def test_select_brackets_are_literal(self):
+        """Test a glob with a size in brackets selects that size only."""
+        names = [bench.name for bench in harness.select(["vault.*[1000]"])]
+
+        assert names == ["vault.save[1000]", "vault.load[1000]", "vault.query[1000]"]
+
+    def test_quick_skips_slow(self):
+        """Test quick selection leaves out the 1M-entry vault."""
+        assert not any("1000000" in bench.name for bench in harness.select(quick=True))
+        assert any("1000000" in bench.name for bench in harness.select())
+
+    def test_skipped_setup(self):
+        """Test a setup raising SkipBenchmark is reported, not timed."""
+        def setup():
+            raise harness.SkipBenchmark("no mido")
+
+        skipped = []
+        bench = harness.Benchmark("skip", setup, "test")
+
+        assert list(harness.run([bench], skipped=lambda b, reason: skipped.append(reason))) == []
+        assert skipped == ["no mido"]
+
+    def test_results_round_trip(self, tmp_path):
+        """Test saved results load back with their statistics and run metadata."""
+        path = results(tmp_path / "run.json", a=0.5)
+
+        assert harness.load_results(path)["a"]["median"] == 0.5
+        assert "python" in json.loads(path.read_text())
+
+    def test_compare(self):
+        """Test slowdowns beyond the threshold are regressions and speedups are marked."""
+        baseline = {name: {"min": 1.0} for name in ("same", "slower", "faster", "gone")}
+        current = {"same": {"min": 1.05}, "slower": {"min": 1.2}, "faster": {"min": 0.5}, "added": {"min": 1.0}}
+
+        statuses = {c.name: c.status for c in harness.compare(baseline, current, threshold=0.1)}
+
+        assert statuses == {
+            "same": "ok", "slower": "REGRESSION", "faster": "faster", "gone": "missing", "added": "new"
+        }
+
+    def test_compare_invalid_stat(self):
+        """Test unknown statistics are rejected."""
+        with pytest.raises(ValueError):
+            harness.compare({}, {}, stat="p99")
+
+
+class TestSuite:
+    def test_vault_query(self):
+        """Test the vault query filters by persona and text, case-insensitively."""
+        entries = vault_entries(200)
+
+        matches = query_vault(entries, "Neon Alien", "MY")
+
+        assert matches and all(entry['persona'] == "Neon Alien" for entry in matches)
+        assert len(entries) == 200
+
+
+class TestCommandLine:
+    def test_run(self, tmp_path, capsys):
+        """Test run times the selected benchmarks and saves them."""
+        output = tmp_path / "latest.json"
+
+        assert main(["run", "--quick", "-k", "personas.*", "-o", str(output)]) == 0
+
+        assert set(harness.load_results(output)) == {"personas.load_persona[cold]", "personas.load_persona[warm]"}
+        assert "personas.load_persona[warm]" in capsys.readouterr().out
+
+    def test_compare_exit_status(self, tmp_path, capsys):
+        """Test compare exits non-zero only when something regressed."""
+        baseline = results(tmp_path / "baseline.json", a=1.0, b=1.0)
+        ok = results(tmp_path / "ok.json", a=1.02, b=0.9)
+        slow = results(tmp_path / "slow.json", a=1.5, b=1.0)
+
+        assert main(["compare", str(ok), "--baseline", str(baseline)]) == 0
+        assert main(["compare", str(slow), "--baseline", str(baseline), "--threshold", "0.2"]) == 1
+        assert "1 regression(s) over 20%: a" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+"""Unit tests for the riff-raff command line and its startup cost"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.cli import main
+from src.lyrics.generator import LyricGenerator
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORT_BUDGET = 0.5  # Seconds to import the CLI and generate once, cold
+HEAVY_MODULES = ("numpy", "scipy", "mido", "librosa", "soundfile", "pydub", "streamlit")
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+import src.cli
+from src.lyrics.generator import LyricGenerator
+LyricGenerator().generate("Neon Alien", "Fashion", seed=1)
+import midi_generator, vault_manager
+elapsed = time.perf_counter() - start
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[1:]))
+print(json.dumps({"seconds": elapsed, "heavy": heavy, "handlers": len(__import__("logging").root.handlers)}))
+"""
+
+
+class TestColdStart:
+    def test_text_path_import_budget(self):
+        """Test a fresh interpreter imports the text path fast, without heavy modules or logging setup."""
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_START, *HEAVY_MODULES],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        report = json.loads(result.stdout)
+
+        assert report["heavy"] == []
+        assert report["handlers"] == 0
+        assert result.stderr == ""  # No import-time warnings or prints
+        assert report["seconds"] < IMPORT_BUDGET
+
+
+class TestCLI:
+    def test_bars_is_seeded(self, capsys):
+        """Test bars output matches the generator for the same seed."""
+        main(["bars", "--persona", "Beach Riff", "--theme", "Snacks", "--seed", "5"])
+
+        assert capsys.readouterr().out.strip() == LyricGenerator().generate("Beach Riff", "Snacks", seed=5)
+
+    def test_hook_variations(self, capsys):
+        """Test -n prints one seeded hook per variation."""
+        main(["hook", "--seed", "10", "-n", "3"])
+
+        out = capsys.readouterr().out
+        assert [line for line in out.splitlines() if line.startswith("# seed")] == [
+            "# seed 10", "# seed 11", "# seed 12"
+        ]
+
+    def test_personas(self, capsys):
+        """Test personas lists the persona files."""
+        main(["personas"])
+
+        assert "Neon Alien" in capsys.readouterr().out.splitlines()
+
+    def test_midi(self, tmp_path):
+        """Test midi writes a MIDI file from a lyrics file."""
+        pytest.importorskip("mido")
+        lyrics = tmp_path / "bars.txt"
+        lyrics.write_text("My drip glows on the runway.")
+
+        main(["midi", str(lyrics), "-o", str(tmp_path / "bars.mid")])
+
+        assert (tmp_path / "bars.mid").read_bytes().startswith(b"MThd")
+
+    def test_delegates_arguments(self, mocker):
+        """Test tool subcommands pass every argument through, options first included."""
+        serve = mocker.patch("src.api.server.main")
+
+        main(["serve", "--port", "9000"])
+
+        serve.assert_called_once_with(["--port", "9000"])
+
+    def test_unknown_option(self):
+        """Test unknown options of built-in commands are rejected."""
+        with pytest.raises(SystemExit):
+            main(["bars", "--bogus"])
@@ -0,0 +1,101 @@
+"""Unit tests for tempo and key analysis of takes"""
+import json
+
+import numpy as np
+import pytest
+
+from src.fx.analysis import TakeAnalysis, analysis_path, analyze, analyze_file
+from src.fx.cache import DecodeCache
+
+SR = 44100
+
+
+def riff(bpm: float, notes, seconds: float = 12.0) -> np.ndarray:
+    """Plucked harmonic notes, one per beat."""
+    y = np.zeros(int(seconds * SR), dtype=np.float32)
+    t = np.arange(int(0.25 * SR)) / SR
+    for i, beat in enumerate(np.arange(0.0, seconds - 0.3, 60.0 / bpm)):
+        f0 = 440.0 * 2 ** ((notes[i % len(notes)] - 69) / 12)
+        tone = np.exp(-12 * t) * sum(np.sin(2 * np.pi * k * f0 * t) / k for k in (1, 2, 3))
+        start = int(beat * SR)
+        y[start:start + tone.size] += 0.3 * tone
+    return y
+
+
+A_MINOR = [57, 60, 64, 62, 59, 65, 67, 69]
+D_MAJOR = [62, 66, 69, 67, 64, 73, 71, 74]
+
+
+class TestAnalyze:
+    @pytest.mark.parametrize("bpm,notes,key,scale", [
+        (100, A_MINOR, "A", "minor"),
+        (90, D_MAJOR, "D", "major"),
+        (128, [60, 64, 67, 65, 62, 71, 69, 72], "C", "major"),
+    ])
+    def test_tempo_and_key(self, bpm, notes, key, scale):
+        """Test the beat tempo and the key of a riff are recovered."""
+        result = analyze(riff(bpm, notes), SR)
+
+        assert result.tempo == pytest.approx(bpm, rel=0.01)
+        assert (result.key, result.scale) == (key, scale)
+        assert result.duration == pytest.approx(12.0)
+
+    def test_silence(self):
+        """Test silence has no tempo."""
+        assert analyze(np.zeros(SR * 2, dtype=np.float32), SR).tempo == 0.0
+
+    def test_midi_parameters(self):
+        """Test the key maps to a base note near middle C and scale degrees."""
+        a_minor = TakeAnalysis(tempo=100.0, key="A", scale="minor", key_confidence=0.9, duration=1.0)
+        d_major = TakeAnalysis(tempo=100.0, key="D", scale="major", key_confidence=0.9, duration=1.0)
+
+        assert a_minor.base_note == 57
+        assert d_major.base_note == 62
+        assert a_minor.scale_intervals == (0, 2, 3, 5, 7, 8, 10)
+
+
+class TestAnalyzeFile:
+    @pytest.fixture
+    def take(self, tmp_path):
+        import soundfile as sf
+
+        path = tmp_path / "take.wav"
+        sf.write(str(path), riff(100, A_MINOR), SR)
+        return path
+
+    def test_cached_next_to_take(self, take, tmp_path, mocker):
+        """Test the analysis is stored beside the take and reused without decoding."""
+        first = analyze_file(take, DecodeCache(tmp_path / "cache"))
+        assert analysis_path(take).exists()
+
+        decode = mocker.patch("src.fx.analysis.load_audio")
+        spectral = mocker.patch("src.fx.analysis.spectral_features")
+        second = analyze_file(take)
+
+        decode.assert_not_called()
+        spectral.assert_not_called()
+        assert second == first
+
+    def test_shares_decode_cache(self, take, tmp_path):
+        """Test analysis decodes through the decode cache."""
+        cache = DecodeCache(tmp_path / "cache")
+        analyze_file(take, cache)
+
+        assert cache.get(take, SR) is not None
+
+    def test_changed_take_is_reanalyzed(self, take):
+        """Test a stale sidecar is ignored once the take changes."""
+        import soundfile as sf
+
+        analyze_file(take)
+        sf.write(str(take), riff(90, D_MAJOR), SR)
+
+        result = analyze_file(take)
+
+        assert (result.key, result.scale) == ("D", "major")
+        assert json.loads(analysis_path(take).read_text())["analysis"]["key"] == "D"
+
+    def test_missing_take(self, tmp_path):
+        """Test analyzing a file that doesn't exist."""
+        with pytest.raises(FileNotFoundError):
+            analyze_file(tmp_path / "missing.wav")
@@ -0,0 +1,97 @@
+"""Unit tests for parallel batch processing of takes"""
+import os
+
+import pytest
+
+from src.fx.batch import find_takes, is_up_to_date, output_dir_for, process_batch
+from src.fx.pipeline import INTERMEDIATE_FILENAMES, MIX_FILENAME, STEM_FILENAMES
+
+
+@pytest.fixture
+def takes_dir(tmp_path, vocal_take):
+    """Folder with three short takes and one non-audio file."""
+    import soundfile as sf
+
+    folder = tmp_path / "takes"
+    folder.mkdir()
+    for i in range(3):
+        sf.write(str(folder / f"take_{i}.wav"), vocal_take[: 22050 * (i + 1)], 44100)
+    (folder / "notes.txt").write_text("session notes")
+    return folder
+
+
+class TestBatch:
+    def test_find_takes(self, takes_dir):
+        """Test that only audio files are picked up."""
+        assert [p.name for p in find_takes(str(takes_dir))] == [
+            "take_0.wav", "take_1.wav", "take_2.wav"
+        ]
+
+    def test_process_batch(self, takes_dir, tmp_path):
+        """Test processing every take into its own directory."""
+        out = tmp_path / "out"
+        summary = process_batch(str(takes_dir), str(out), workers=2)
+
+        assert len(summary.processed) == 3
+        assert summary.audio_seconds == pytest.approx(0.5 + 1.0 + 1.5)
+        assert summary.throughput > 0
+        for take in find_takes(str(takes_dir)):
+            assert (output_dir_for(take, str(out)) / MIX_FILENAME).exists()
+        # No staging directories left behind
+        assert sorted(p.name for p in out.iterdir()) == ["take_0", "take_1", "take_2"]
+
+    def test_skips_up_to_date(self, takes_dir, tmp_path):
+        """Test that takes with newer outputs are skipped."""
+        out = tmp_path / "out"
+        process_batch(str(takes_dir), str(out), workers=1, stream=True)
+        assert all(is_up_to_date(take, str(out)) for take in find_takes(str(takes_dir)))
+
+        stale = takes_dir / "take_1.wav"
+        future = stale.stat().st_mtime + 60
+        os.utime(stale, (future, future))
+        summary = process_batch(str(takes_dir), str(out), workers=1, stream=True)
+
+        assert summary.processed == [str(stale)]
+        assert len(summary.skipped) == 2
+
+    def test_force(self, takes_dir, tmp_path):
+        """Test that force reprocesses everything."""
+        out = tmp_path / "out"
+        process_batch(str(takes_dir), str(out), workers=1, stream=True)
+        summary = process_batch(str(takes_dir), str(out), workers=1, stream=True, force=True)
+
+        assert len(summary.processed) == 3
+
+    def test_failed_take(self, takes_dir, tmp_path):
+        """Test that a broken take is reported without stopping the batch."""
+        (takes_dir / "broken.wav").write_bytes(b"not really audio")
+        summary = process_batch(str(takes_dir), str(tmp_path / "out"), workers=2, stream=True)
+
+        assert len(summary.processed) == 3
+        assert [take for take, _ in summary.failed] == [str(takes_dir / "broken.wav")]
+        assert "failed 1" in summary.format()
+
+    def test_clashing_output_dirs(self, takes_dir, tmp_path):
+        """Test takes sharing a name but not an extension fail instead of overwriting each other."""
+        import shutil
+
+        shutil.copy(takes_dir / "take_0.wav", takes_dir / "take_0.flac")
+        summary = process_batch(str(takes_dir), str(tmp_path / "out"), workers=2)
+
+        assert sorted(take for take, _ in summary.failed) == [
+            str(takes_dir / "take_0.flac"), str(takes_dir / "take_0.wav")
+        ]
+        assert "take_0.wav" in dict(summary.failed)[str(takes_dir / "take_0.flac")]
+        assert len(summary.processed) == 2
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_output_options(self, takes_dir, tmp_path, stream):
+        """Test intermediates and stems are written or skipped as asked."""
+        out = tmp_path / "out"
+        process_batch(
+            str(takes_dir), str(out), workers=1, stream=stream, write_intermediates=True, export_stems=False
+        )
+
+        written = {p.name for p in (out / "take_0").iterdir()}
+        assert written == {MIX_FILENAME, *INTERMEDIATE_FILENAMES.values()}
+        assert not written & set(STEM_FILENAMES.values())
@@ -0,0 +1,102 @@
+"""Unit tests for the decoded-audio cache"""
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from src.fx.cache import DecodeCache
+from src.fx.pipeline import HookFX
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Provide an empty cache in a temporary directory."""
+    return DecodeCache(tmp_path / "cache")
+
+
+class TestDecodeCache:
+    def test_miss_then_hit(self, cache, vocal_wav, mocker):
+        """Test the second load is served from the memory map without decoding."""
+        first = cache.load(vocal_wav)
+        decode = mocker.patch("src.fx.cache.load_audio")
+        second = cache.load(vocal_wav)
+
+        decode.assert_not_called()
+        assert isinstance(second, np.memmap)
+        assert second.dtype == np.float32
+        np.testing.assert_array_equal(first, second)
+
+    def test_keyed_by_content(self, cache, vocal_wav, tmp_path):
+        """Test that a renamed copy hits and an edited file misses."""
+        copy = tmp_path / "renamed.wav"
+        shutil.copy(vocal_wav, copy)
+        assert cache.key(copy) == cache.key(vocal_wav)
+
+        with open(copy, 'ab') as f:
+            f.write(b"\x00\x00")
+        assert cache.key(copy) != cache.key(vocal_wav)
+
+    def test_keyed_by_sample_rate(self, cache, vocal_wav):
+        """Test each target sample rate gets its own entry."""
+        assert cache.load(vocal_wav, 22050).size == 44100
+        assert cache.load(vocal_wav, 44100).size == 88200
+        assert len(cache.entries()) == 2
+
+    def test_lru_eviction(self, cache):
+        """Test the least recently used entry goes first when over the bound."""
+        entry_bytes = 4000 * 4 + 128
+        cache.max_bytes = 2 * entry_bytes
+        cache.put("a", np.zeros(4000))
+        cache.put("b", np.zeros(4000))
+        past = os.stat(cache.entry_path("b")).st_mtime - 10
+        os.utime(cache.entry_path("a"), (past, past))  # "a" used long ago
+
+        cache.put("c", np.zeros(4000))
+
+        assert sorted(p.stem for p in cache.entries()) == ["b", "c"]
+        assert cache.size() <= cache.max_bytes
+
+    def test_missing_file(self, cache, tmp_path):
+        """Test a clear error for a missing take."""
+        with pytest.raises(FileNotFoundError):
+            cache.load(tmp_path / "nope.wav")
+
+
+class TestHookFXCache:
+    def test_rerun_skips_decoding(self, vocal_wav, tmp_path, mocker):
+        """Test re-running FX with new settings on a known take reuses the decode."""
+        cache_dir = str(tmp_path / "cache")
+        HookFX(cache_dir=cache_dir).process_file(str(vocal_wav), None)
+
+        decode = mocker.patch("src.fx.cache.load_audio")
+        result = HookFX(reverb="convolution", cache_dir=cache_dir).process_file(str(vocal_wav), None)
+
+        decode.assert_not_called()
+        assert result.duration == pytest.approx(2.0)
+
+    def test_stream_reads_cached_decode(self, vocal_wav, tmp_path, mocker):
+        """Test streaming a cached take reads the memory map instead of the file."""
+        cache_dir = str(tmp_path / "cache")
+        HookFX(cache_dir=cache_dir).process_file(str(vocal_wav), None)
+
+        read = mocker.patch("src.fx.pipeline.iter_blocks")
+        result = HookFX(cache_dir=cache_dir).process_stream(str(vocal_wav), str(tmp_path / "out"))
+
+        read.assert_not_called()
+        assert result.duration == pytest.approx(2.0)
+
+    def test_cache_disabled(self, vocal_wav, tmp_path, monkeypatch):
+        """Test the cache is off by default and nothing is written to the working directory."""
+        monkeypatch.chdir(tmp_path)
+        fx = HookFX()
+        fx.process_file(str(vocal_wav), None)
+
+        assert fx.cache is None
+        assert not (tmp_path / ".cache").exists()
+
+    def test_default_directory_is_per_user(self, tmp_path, monkeypatch):
+        """Test the default cache lives under XDG_CACHE_HOME, not the working directory."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+
+        assert DecodeCache().directory == tmp_path / "xdg" / "riff-raff" / "decoded"
@@ -0,0 +1,114 @@
+"""Unit tests for single-pass stem export"""
+import numpy as np
+import pytest
+
+from src.fx.export import StemExporter, with_format
+from src.fx.pipeline import STEMS_CHANNELS, HookFX
+
+
+@pytest.fixture
+def outputs(vocal_take):
+    """Stage outputs of one in-memory run."""
+    return HookFX().process(vocal_take).intermediates
+
+
+class TestStemExporter:
+    def test_with_format(self):
+        """Test the extension is swapped for the export format."""
+        assert with_format("stem_dry.wav", "flac") == "stem_dry.flac"
+
+    def test_files(self, outputs, tmp_path):
+        """Test every target is written from one block of outputs."""
+        import soundfile as sf
+
+        targets = [("mix.wav", ("master",)), ("dry.wav", ("pitch",))]
+        with StemExporter(tmp_path, targets, 44100) as exporter:
+            exporter.write(outputs)
+
+        assert sorted(exporter.paths) == ["dry", "mix"]
+        dry, _ = sf.read(exporter.paths["dry"], dtype='float32')
+        np.testing.assert_allclose(dry, np.clip(outputs["pitch"], -1, 1), atol=1e-4)
+
+    def test_multichannel(self, outputs, tmp_path):
+        """Test several stages are interleaved into one file in target order."""
+        import soundfile as sf
+
+        with StemExporter(tmp_path, [("stems.wav", ("master", "reverb"))], 44100) as exporter:
+            exporter.write(outputs)
+
+        data, _ = sf.read(exporter.paths["stems"], dtype='float32')
+        assert data.shape == (outputs["master"].size, 2)
+        np.testing.assert_allclose(data[:, 1], np.clip(outputs["reverb"], -1, 1), atol=1e-4)
+
+    def test_multichannel_uneven_blocks(self, outputs, tmp_path):
+        """Test channels arriving in blocks of different lengths still line up."""
+        import soundfile as sf
+
+        master, reverb = outputs["master"], outputs["reverb"]
+        with StemExporter(tmp_path, [("stems.wav", ("master", "reverb"))], 44100) as exporter:
+            exporter.write({"master": master[:1000], "reverb": reverb[:3000]})
+            exporter.write({"master": master[1000:], "reverb": reverb[3000:]})
+
+        data, _ = sf.read(exporter.paths["stems"], dtype='float32')
+        assert data.shape == (master.size, 2)
+        np.testing.assert_allclose(data[:, 0], np.clip(master, -1, 1), atol=1e-4)
+        np.testing.assert_allclose(data[:, 1], np.clip(reverb, -1, 1), atol=1e-4)
+
+    def test_flac_is_lossless_and_smaller(self, outputs, tmp_path):
+        """Test FLAC decodes to the same 16-bit samples as WAV in less space."""
+        import soundfile as sf
+
+        paths = {}
+        for audio_format in ("wav", "flac"):
+            with StemExporter(tmp_path, [("mix.wav", ("master",))], 44100, audio_format) as exporter:
+                exporter.write(outputs)
+            paths[audio_format] = exporter.paths["mix"]
+
+        assert paths["flac"].endswith(".flac")
+        # libsndfile rounds float -> PCM differently per format: at most 1 LSB
+        np.testing.assert_allclose(sf.read(paths["flac"])[0], sf.read(paths["wav"])[0], atol=2 ** -15)
+        assert (tmp_path / "mix.flac").stat().st_size < (tmp_path / "mix.wav").stat().st_size
+
+    def test_invalid_format(self, tmp_path):
+        """Test an unknown format is rejected."""
+        with pytest.raises(ValueError, match="Invalid export format"):
+            StemExporter(tmp_path, [("mix.wav", ("master",))], 44100, "mp3")
+
+
+class TestHookFXExport:
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_multichannel_layout(self, vocal_wav, tmp_path, stream):
+        """Test the multichannel layout holds the mix and stems in one file."""
+        import soundfile as sf
+
+        fx = HookFX(export_layout="multichannel", export_format="flac")
+        offline = fx.process_file(str(vocal_wav), None)
+        out = tmp_path / "out"
+        if stream:
+            fx.process_stream(str(vocal_wav), str(out), blocksize=3000)
+        else:
+            fx.process_file(str(vocal_wav), str(out))
+
+        assert [p.name for p in out.iterdir()] == [fx.mix_filename]
+        data, _ = sf.read(str(out / fx.mix_filename), dtype='float32')
+        assert data.shape[1] == len(STEMS_CHANNELS)
+        np.testing.assert_allclose(data[:, 0], np.clip(offline.mix, -1, 1), atol=2e-4)
+        np.testing.assert_allclose(data[:, 1], np.clip(offline.stems["dry"], -1, 1), atol=2e-4)
+
+    def test_streamed_multichannel_with_master(self, vocal_wav, tmp_path):
+        """Test streaming the multichannel layout through the limiter matches process_file."""
+        import soundfile as sf
+
+        fx = HookFX(export_layout="multichannel", master=True, cache_dir=None)
+        fx.process_file(str(vocal_wav), str(tmp_path / "file"))
+        fx.process_stream(str(vocal_wav), str(tmp_path / "stream"), blocksize=3000)
+
+        offline, _ = sf.read(str(tmp_path / "file" / fx.mix_filename), dtype='float32')
+        streamed, _ = sf.read(str(tmp_path / "stream" / fx.mix_filename), dtype='float32')
+        assert streamed.shape == offline.shape
+        np.testing.assert_allclose(streamed, offline, atol=2e-4)
+
+    def test_invalid_layout(self):
+        """Test an unknown layout is rejected."""
+        with pytest.raises(ValueError, match="Invalid export layout"):
+            HookFX(export_layout="zip")
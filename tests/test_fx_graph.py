@@ -0,0 +1,102 @@
+"""Unit tests for the incremental FX graph"""
+import numpy as np
+import pytest
+
+from src.fx import graph as graph_module
+from src.fx.graph import FXGraph
+from src.fx.pipeline import HookFX
+
+
+class TestFXGraph:
+    @pytest.mark.parametrize("options", [{}, {"reverb": "convolution", "doubler": "chorus"}])
+    def test_matches_pipeline(self, vocal_take, options):
+        """Test a graph render produces the same audio as the straight chain."""
+        expected = HookFX(**options).process(vocal_take)
+        result = FXGraph(vocal_take, HookFX(**options)).render()
+
+        np.testing.assert_allclose(result.mix, expected.mix, atol=1e-6)
+        for name in expected.stems:
+            np.testing.assert_allclose(result.stems[name], expected.stems[name], atol=1e-6)
+
+    @pytest.mark.parametrize("change,recomputed", [
+        ({"reverb_mix_db": -3.0}, ["mix", "master"]),
+        ({"reverb_wet_db": -6.0, "reverb": "convolution"}, ["reverb", "mix", "master"]),
+        ({"double_level_db": -9.0}, ["double", "mix", "master"]),
+        ({"retune_ms": 0.0}, ["pitch", "double", "reverb", "mix", "master"]),
+        ({"headroom_db": 1.0}, ["normalize", "pitch", "double", "reverb", "mix", "master"]),
+        ({"master": True}, ["master"]),
+    ])
+    def test_recomputes_only_downstream(self, vocal_take, change, recomputed):
+        """Test a tweak recomputes the changed stage and its dependents only."""
+        graph = FXGraph(vocal_take)
+        graph.render()
+        assert list(graph.last_run) == ["normalize", "pitch", "double", "reverb", "mix", "master"]
+
+        result = graph.render(**change)
+
+        assert list(graph.last_run) == recomputed
+        expected = HookFX(**change).process(vocal_take)
+        np.testing.assert_allclose(result.mix, expected.mix, atol=1e-6)
+
+    def test_unchanged_render_is_free(self, vocal_take):
+        """Test rendering again, or reverting a tweak, hits the cache."""
+        graph = FXGraph(vocal_take)
+        first = graph.render()
+        graph.render(reverb_mix_db=-3.0)
+
+        reverted = graph.render(reverb_mix_db=-6.0)
+
+        assert graph.last_run == {}
+        assert reverted.mix is first.mix
+
+    def test_outputs_are_read_only(self, vocal_take):
+        """Test cached stage outputs cannot be modified by callers."""
+        result = FXGraph(vocal_take).render()
+
+        with pytest.raises(ValueError):
+            result.mix[0] = 1.0
+
+    def test_bounded_entries(self, vocal_take):
+        """Test old stage outputs are evicted beyond max_entries."""
+        graph = FXGraph(vocal_take, max_entries=7)
+        for db in (-1.0, -2.0, -3.0, -4.0):
+            graph.render(reverb_mix_db=db)
+
+        assert len(graph._outputs) == 7
+
+    def test_preview_cached_per_mix(self, vocal_take, mocker):
+        """Test the preview is built once per distinct mix, however often it is asked for."""
+        graph = FXGraph(vocal_take)
+        with pytest.raises(RuntimeError):
+            graph.preview()
+        build = mocker.spy(graph_module, "build_preview")
+
+        graph.render()
+        first = graph.preview()
+        graph.render(reverb_mix_db=-3.0)
+        graph.preview()
+        graph.render(reverb_mix_db=-6.0)
+
+        assert graph.preview() is first
+        assert build.call_count == 2
+        assert first.duration == pytest.approx(len(graph.render().mix) / graph.fx.sample_rate)
+
+    def test_invalid_params(self, vocal_take):
+        """Test unknown parameters and invalid values are rejected."""
+        graph = FXGraph(vocal_take)
+
+        with pytest.raises(ValueError, match="Unknown FX parameter"):
+            graph.render(reverb_size=3)
+        with pytest.raises(ValueError, match="Invalid reverb"):
+            graph.render(reverb="plate")
+
+    def test_file_source(self, vocal_wav, tmp_path, mocker):
+        """Test a file source is decoded once per sample rate."""
+        graph = FXGraph(str(vocal_wav), HookFX(cache_dir=str(tmp_path / "cache")))
+        graph.render()
+        decode = mocker.patch("src.fx.cache.load_audio")
+
+        result = graph.render(double_level_db=-3.0)
+
+        decode.assert_not_called()
+        assert result.duration == pytest.approx(2.0)
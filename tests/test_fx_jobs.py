@@ -0,0 +1,121 @@
+"""Unit tests for the background FX job queue"""
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.fx.jobs import CANCELLED, DONE, FAILED, JobQueue, _run_job
+from src.fx.pipeline import HookFX
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Job queue with one worker, isolated in tmp_path."""
+    job_queue = JobQueue(str(tmp_path / "jobs.sqlite3"), str(tmp_path / "out"), workers=1)
+    yield job_queue
+    job_queue.shutdown()
+
+
+@pytest.fixture
+def fx_options(tmp_path):
+    """HookFX options with a private decode cache."""
+    return {"cache_dir": str(tmp_path / "cache")}
+
+
+class TestJobQueue:
+    def test_runs_job(self, queue, vocal_wav, fx_options):
+        """Test a submitted take is processed and its outputs recorded."""
+        job = queue.submit(str(vocal_wav), fx_options)
+
+        state = queue.wait(job, timeout=60)
+
+        assert state.status == DONE
+        assert state.progress == 1.0
+        assert state.duration == pytest.approx(2.0)
+        assert "Z_Cavaricci_Hook_Stylized" in state.paths
+        assert all(path.startswith(state.output_dir) for path in state.paths.values())
+
+    def test_deduplicates(self, queue, vocal_wav, fx_options):
+        """Test identical submissions share one job, different settings don't."""
+        first = queue.submit(str(vocal_wav), fx_options)
+        queue.wait(first, timeout=60)
+
+        assert queue.submit(str(vocal_wav), fx_options) == first
+        assert queue.status(first).status == DONE
+        assert queue.submit(str(vocal_wav), {**fx_options, "reverb": "convolution"}) != first
+
+    def test_cancel_before_start(self, queue, vocal_wav, fx_options, mocker):
+        """Test a cancelled queued job is never run."""
+        mocker.patch.object(queue, "_executor")  # Keep the job queued
+        job = queue.submit(str(vocal_wav), fx_options)
+
+        assert queue.cancel(job)
+        _run_job(queue.db_path, job)
+
+        assert queue.status(job).status == CANCELLED
+        assert not queue.cancel(job)
+
+    def test_cancel_while_running(self, queue, vocal_wav, fx_options, mocker):
+        """Test a running job stops at its next progress report and leaves no output."""
+        mocker.patch.object(queue, "_executor")
+        job = queue.submit(str(vocal_wav), fx_options)
+        process_stream = HookFX.process_stream
+
+        def cancelled_midway(fx, input_path, output_dir, progress=None, **kwargs):
+            def report(fraction):
+                queue.cancel(job)
+                progress(fraction)
+            return process_stream(fx, input_path, output_dir, progress=report, **kwargs)
+
+        mocker.patch.object(HookFX, "process_stream", cancelled_midway)
+        _run_job(queue.db_path, job)
+
+        state = queue.status(job)
+        assert state.status == CANCELLED
+        assert not Path(state.output_dir).exists()
+        assert not list(Path(queue.output_root).glob(".*partial*"))
+
+    def test_failure_is_recorded(self, queue, tmp_path, fx_options):
+        """Test a job that raises is marked failed with the error."""
+        bad = tmp_path / "take.m4a"
+        bad.write_bytes(b"\x00" * 64)
+
+        job = queue.submit(str(bad), {"cache_dir": None})
+        state = queue.wait(job, timeout=60)
+
+        assert state.status == FAILED
+        assert "soundfile-readable" in state.error
+
+    def test_interrupted_jobs_are_failed(self, tmp_path, vocal_wav, fx_options, mocker):
+        """Test jobs left active by a dead process are failed on reopen."""
+        db = str(tmp_path / "jobs.sqlite3")
+        first = JobQueue(db, str(tmp_path / "out"))
+        mocker.patch.object(first, "_executor")
+        job = first.submit(str(vocal_wav), fx_options)
+        with sqlite3.connect(db) as conn:
+            conn.execute("UPDATE jobs SET owner = ? WHERE id = ?", (2 ** 22 + 1, job))
+
+        state = JobQueue(db, str(tmp_path / "out")).status(job)
+
+        assert state.status == FAILED
+        assert state.error == "Interrupted"
+
+    def test_unknown_job(self, queue):
+        """Test status of a job that was never submitted."""
+        with pytest.raises(KeyError):
+            queue.status("nope")
+
+    def test_missing_take(self, queue, tmp_path):
+        """Test submitting a file that doesn't exist."""
+        with pytest.raises(FileNotFoundError):
+            queue.submit(str(tmp_path / "missing.wav"))
+
+    def test_default_db_is_per_user(self, tmp_path, monkeypatch):
+        """Test the job table defaults to the user's cache, not the working directory."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.chdir(tmp_path)
+
+        JobQueue(output_root=str(tmp_path / "out")).shutdown()
+
+        assert (tmp_path / "cache" / "riff-raff" / "jobs.sqlite3").exists()
+        assert not (tmp_path / ".cache").exists()
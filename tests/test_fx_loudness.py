@@ -0,0 +1,143 @@
+"""Unit tests for loudness metering, normalization and true-peak limiting"""
+import numpy as np
+import pytest
+
+from src.fx.effects import db_to_gain
+from src.fx.loudness import (
+    LoudnessMeter,
+    LoudnessNormalize,
+    TruePeakLimiter,
+    integrated_loudness,
+    true_peak,
+)
+from src.fx.pipeline import HookFX
+
+SR = 48000
+
+
+def sine(seconds: float = 5.0, level_db: float = 0.0, freq: float = 997.0, sr: int = SR) -> np.ndarray:
+    t = np.arange(int(seconds * sr)) / sr
+    return (db_to_gain(level_db) * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def blockwise(effect, x: np.ndarray, blocksize: int) -> np.ndarray:
+    out = [effect.process(x[i:i + blocksize]) for i in range(0, x.size, blocksize)]
+    return np.concatenate(out + [effect.flush()])
+
+
+class TestLoudnessMeter:
+    @pytest.mark.parametrize("sr", [48000, 44100])
+    def test_reference_sine(self, sr):
+        """Test a full-scale 997 Hz sine reads -3.01 LUFS (BS.1770 calibration)."""
+        assert integrated_loudness(sine(sr=sr), sr) == pytest.approx(-3.01, abs=0.02)
+
+    def test_level_tracks_gain(self):
+        """Test loudness follows gain dB for dB."""
+        assert integrated_loudness(sine(level_db=-20.0), SR) == pytest.approx(-23.01, abs=0.02)
+
+    def test_gating_ignores_silence(self):
+        """Test silence between phrases does not drag the loudness down."""
+        gapped = np.concatenate([sine(2.0, -20.0), np.zeros(SR * 6, dtype=np.float32), sine(2.0, -20.0)])
+
+        # Ungated, 6 s of silence in 10 s would read 4 dB lower; only the
+        # gating blocks straddling the edges count
+        assert integrated_loudness(gapped, SR) == pytest.approx(-23.01, abs=0.5)
+
+    def test_silence(self):
+        """Test silence and too-short input have no loudness."""
+        assert integrated_loudness(np.zeros(SR, dtype=np.float32), SR) == float('-inf')
+        assert integrated_loudness(sine(0.2), SR) == float('-inf')
+
+    def test_blockwise_equals_offline(self, vocal_take):
+        """Test metering block by block gives the whole-take reading."""
+        meter = LoudnessMeter(44100)
+        for i in range(0, vocal_take.size, 3001):
+            meter.process(vocal_take[i:i + 3001])
+
+        assert meter.integrated() == pytest.approx(integrated_loudness(vocal_take, 44100), abs=1e-9)
+
+
+class TestLoudnessNormalize:
+    def test_hits_target(self, vocal_take):
+        """Test the take is gained to the target loudness."""
+        out = LoudnessNormalize(-20.0, 44100).process(vocal_take)
+
+        assert integrated_loudness(out, 44100) == pytest.approx(-20.0, abs=0.01)
+
+    def test_silence_unchanged(self):
+        """Test silence is not amplified."""
+        silence = np.zeros(44100, dtype=np.float32)
+
+        np.testing.assert_array_equal(LoudnessNormalize().process(silence), silence)
+
+
+class TestTruePeakLimiter:
+    def test_holds_ceiling(self):
+        """Test intersample peaks are held under the ceiling."""
+        hot = np.random.default_rng(0).normal(0.0, 0.5, SR * 2).astype(np.float32)
+        assert true_peak(hot) > 1.0
+
+        limiter = TruePeakLimiter(-1.0, SR)
+        out = np.concatenate([limiter.process(hot), limiter.flush()])
+
+        assert out.size == hot.size
+        assert true_peak(out) <= db_to_gain(-1.0) * 1.001
+
+    def test_quiet_signal_untouched(self):
+        """Test audio under the ceiling passes through unchanged."""
+        quiet = sine(1.0, -12.0)
+        limiter = TruePeakLimiter(-1.0, SR)
+
+        np.testing.assert_array_equal(np.concatenate([limiter.process(quiet), limiter.flush()]), quiet)
+
+    def test_blockwise_equals_offline(self):
+        """Test block-by-block limiting matches one whole-signal call."""
+        x = sine(2.0, 6.0) * np.linspace(0.2, 1.0, SR * 2, dtype=np.float32)
+        offline = blockwise(TruePeakLimiter(-1.0, SR), x, x.size)
+
+        np.testing.assert_allclose(blockwise(TruePeakLimiter(-1.0, SR), x, 1000), offline, atol=1e-6)
+
+    def test_holds_back_latency(self):
+        """Test the look-ahead is held back until flush."""
+        limiter = TruePeakLimiter(-1.0, SR)
+
+        assert limiter.process(sine(0.5)).size == SR // 2 - limiter.latency
+        assert limiter.flush().size == limiter.latency
+
+
+class TestHookFXLoudness:
+    def test_loudness_normalize(self, vocal_take):
+        """Test the normalize stage can target integrated loudness."""
+        result = HookFX(normalize="loudness", target_lufs=-20.0).process(vocal_take)
+
+        assert integrated_loudness(result.intermediates["normalize"], 44100) == pytest.approx(-20.0, abs=0.01)
+
+    def test_master(self, vocal_take):
+        """Test the master stage sets the mix loudness under a true-peak ceiling."""
+        result = HookFX(master=True, master_lufs=-12.0, ceiling_dbtp=-1.0).process(vocal_take)
+
+        assert result.mix.size == result.intermediates["mix"].size
+        assert integrated_loudness(result.mix, 44100) == pytest.approx(-12.0, abs=0.5)
+        assert true_peak(result.mix) <= db_to_gain(-1.0) * 1.001
+
+    def test_master_bypassed_by_default(self, vocal_take):
+        """Test the mix is unchanged when mastering is off."""
+        result = HookFX().process(vocal_take)
+
+        np.testing.assert_array_equal(result.mix, result.intermediates["mix"])
+
+    def test_invalid_normalize(self):
+        """Test an unknown normalize mode is rejected."""
+        with pytest.raises(ValueError, match="Invalid normalize"):
+            HookFX(normalize="rms")
+
+    def test_stream_matches_offline(self, vocal_wav, tmp_path):
+        """Test loudness normalization and mastering stream like whole-take processing."""
+        import soundfile as sf
+
+        fx = HookFX(normalize="loudness", master=True)
+        offline = fx.process_file(str(vocal_wav), None)
+        result = fx.process_stream(str(vocal_wav), str(tmp_path / "out"), blocksize=3000)
+
+        streamed, _ = sf.read(result.paths["Z_Cavaricci_Hook_Stylized"], dtype='float32')
+        np.testing.assert_allclose(streamed, np.clip(offline.mix, -1, 1), atol=2e-4)
@@ -0,0 +1,231 @@
+"""Unit tests for the in-memory hook FX pipeline"""
+import numpy as np
+import pytest
+
+from src.fx.effects import (
+    ChorusDoubler,
+    ConvolutionReverb,
+    Doubler,
+    EchoReverb,
+    PeakNormalize,
+    db_to_gain,
+    generate_impulse_response,
+)
+from src.fx.pipeline import (
+    INTERMEDIATE_FILENAMES,
+    MIX_FILENAME,
+    STEM_FILENAMES,
+    HookFX,
+)
+
+
+class TestEffects:
+    def test_peak_normalize(self, vocal_take):
+        """Test normalizing to the headroom below full scale."""
+        out = PeakNormalize(headroom_db=1.0).process(vocal_take)
+
+        assert np.abs(out).max() == pytest.approx(db_to_gain(-1.0), rel=1e-5)
+        assert out.dtype == np.float32
+
+    def test_doubler_matches_overlay(self):
+        """Test that doubling adds a delayed copy at the given level."""
+        x = np.zeros(100, dtype=np.float32)
+        x[0] = 1.0
+        out = Doubler(delay_ms=1.0, level_db=-6.0, sample_rate=10000).process(x)
+
+        assert out[0] == 1.0
+        assert out[10] == pytest.approx(db_to_gain(-6.0))
+        assert out.size == x.size
+
+    def test_delay_blockwise_equals_offline(self, vocal_take):
+        """Test that processing in blocks matches one-shot processing."""
+        offline = EchoReverb().process(vocal_take)
+        node = EchoReverb()
+        blocks = [node.process(b) for b in np.array_split(vocal_take, 7)]
+
+        np.testing.assert_allclose(np.concatenate(blocks), offline, atol=1e-6)
+
+
+class TestConvolutionReverb:
+    def test_matches_direct_convolution(self, vocal_take):
+        """Test that partitioned convolution equals np.convolve."""
+        ir = np.random.default_rng(0).standard_normal(3000).astype(np.float32) * 0.01
+        out = ConvolutionReverb(ir, wet_db=0.0, block_size=512).process(vocal_take)
+
+        expected = vocal_take + np.convolve(vocal_take, ir)[:vocal_take.size]
+        np.testing.assert_allclose(out, expected, atol=1e-4)
+
+    def test_blockwise_equals_offline(self, vocal_take):
+        """Test that arbitrary block lengths give sample-aligned output."""
+        offline = ConvolutionReverb(block_size=1024).process(vocal_take)
+        node = ConvolutionReverb(block_size=1024)
+        blocks = [node.process(b) for b in np.array_split(vocal_take, 13)]
+
+        np.testing.assert_allclose(np.concatenate(blocks), offline, atol=1e-4)
+
+    def test_generated_impulse_response(self):
+        """Test the generated IR has unit energy and the requested length."""
+        ir = generate_impulse_response(8000, decay_seconds=0.5, predelay_ms=0.0)
+
+        assert ir.size == 4000
+        assert np.sum(ir.astype(np.float64) ** 2) == pytest.approx(1.0, rel=1e-4)
+
+
+class TestChorusDoubler:
+    def test_blockwise_equals_offline(self, vocal_take):
+        """Test that LFO phase and delay lines carry across blocks."""
+        offline = ChorusDoubler().process(vocal_take)
+        node = ChorusDoubler()
+        blocks = [node.process(b) for b in np.array_split(vocal_take, 9)]
+
+        np.testing.assert_allclose(np.concatenate(blocks), offline, atol=1e-5)
+
+    def test_silence_stays_silent(self):
+        """Test that the doubler adds nothing to silence."""
+        out = ChorusDoubler(voices=4).process(np.zeros(1000, dtype=np.float32))
+
+        assert not out.any()
+
+    @pytest.mark.parametrize("delay_ms", [0.0, 1.0, 2.9])
+    def test_delay_shorter_than_depth(self, vocal_take, delay_ms):
+        """Test that a base delay under the modulation depth is clamped instead of failing."""
+        node = ChorusDoubler(delay_ms=delay_ms, depth_ms=3.0)
+
+        out = node.process(vocal_take)
+
+        assert out.shape == vocal_take.shape
+        assert np.isfinite(out).all()
+        assert (node.base_delays > node.depth).all()
+
+
+class TestHookFX:
+    def test_process_in_memory(self, vocal_take):
+        """Test processing an array returns mix and stems."""
+        result = HookFX().process(vocal_take)
+
+        assert result.mix.shape == vocal_take.shape
+        assert set(result.stems) == set(STEM_FILENAMES)
+        assert result.duration == pytest.approx(2.0)
+
+    def test_process_file_writes_outputs(self, vocal_wav, tmp_path):
+        """Test that only the mix and stems are written by default."""
+        out = tmp_path / "out"
+        HookFX().process_file(str(vocal_wav), str(out))
+
+        written = {p.name for p in out.iterdir()}
+        assert written == {MIX_FILENAME, *STEM_FILENAMES.values()}
+
+    def test_process_file_intermediates(self, vocal_wav, tmp_path):
+        """Test writing intermediates on request."""
+        out = tmp_path / "out"
+        HookFX().process_file(str(vocal_wav), str(out), write_intermediates=True)
+
+        for filename in INTERMEDIATE_FILENAMES.values():
+            assert (out / filename).exists()
+
+    def test_process_file_in_memory_only(self, vocal_wav, tmp_path):
+        """Test that output_dir=None writes nothing."""
+        result = HookFX().process_file(str(vocal_wav), None)
+
+        assert result.mix.size > 0
+        assert list(tmp_path.iterdir()) == [vocal_wav]
+
+    @pytest.mark.parametrize("reverb,doubler", [("convolution", "chorus"), ("echo", "chorus")])
+    def test_selectable_nodes(self, vocal_take, reverb, doubler):
+        """Test selecting the convolution reverb and chorus doubler."""
+        default = HookFX().process(vocal_take)
+        result = HookFX(reverb=reverb, doubler=doubler).process(vocal_take)
+
+        assert result.mix.shape == vocal_take.shape
+        assert not np.allclose(result.stems["doubled"], default.stems["doubled"])
+
+    def test_invalid_node(self):
+        """Test that unknown node types raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid reverb"):
+            HookFX(reverb="plate")
+
+    def test_missing_input(self, tmp_path):
+        """Test that a missing take raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            HookFX().process_file(str(tmp_path / "missing.wav"))
+
+    def test_normalizes_after_resampling(self, tmp_path, vocal_take):
+        """Test that the peak is set on the resampled mono take the chain processes."""
+        import soundfile as sf
+
+        path = tmp_path / "take_22k.wav"
+        stereo = np.stack([vocal_take[::2], 0.5 * vocal_take[::2]], axis=1)
+        sf.write(str(path), stereo, 22050)
+
+        result = HookFX(headroom_db=0.1).process_file(str(path), None)
+
+        peak = np.abs(result.intermediates["normalize"]).max()
+        assert peak == pytest.approx(db_to_gain(-0.1), rel=1e-5)
+
+
+class TestHookFXStreaming:
+    @pytest.mark.parametrize("reverb,doubler", [("echo", "slapback"), ("convolution", "chorus")])
+    def test_stream_matches_offline(self, vocal_wav, tmp_path, reverb, doubler):
+        """Test that block-streamed output matches whole-take processing."""
+        import soundfile as sf
+
+        fx = HookFX(reverb=reverb, doubler=doubler)
+        offline = fx.process_file(str(vocal_wav), None)
+        result = fx.process_stream(str(vocal_wav), str(tmp_path / "out"), blocksize=3000)
+
+        streamed, sr = sf.read(result.paths["Z_Cavaricci_Hook_Stylized"], dtype='float32')
+        assert sr == 44100
+        assert result.duration == pytest.approx(offline.duration)
+        np.testing.assert_allclose(streamed, np.clip(offline.mix, -1, 1), atol=2e-4)
+
+    def test_stream_resamples(self, tmp_path, vocal_take):
+        """Test streaming an input at a different sample rate."""
+        import soundfile as sf
+
+        path = tmp_path / "take_22k.wav"
+        sf.write(str(path), vocal_take[::2], 22050)
+        result = HookFX().process_stream(str(path), str(tmp_path / "out"), blocksize=4096)
+
+        assert result.duration == pytest.approx(2.0, abs=0.01)
+        assert len(result.paths) == 4
+
+    def test_stream_resampled_matches_offline(self, tmp_path, vocal_take):
+        """Test that a resampled take is peak-normalized like whole-take processing."""
+        import soundfile as sf
+
+        path = tmp_path / "take_22k.wav"
+        sf.write(str(path), vocal_take[::2], 22050)
+        fx = HookFX(reverb="echo", doubler="slapback")
+        offline = fx.process_file(str(path), None)
+        result = fx.process_stream(str(path), str(tmp_path / "out"), blocksize=3000)
+
+        streamed, _ = sf.read(result.paths["Z_Cavaricci_Hook_Stylized"], dtype='float32')
+        assert streamed.shape == offline.mix.shape
+        np.testing.assert_allclose(streamed, np.clip(offline.mix, -1, 1), atol=2e-4)
+
+    def test_stream_memory_bounded(self, tmp_path):
+        """Test that peak memory does not scale with recording length."""
+        import tracemalloc
+
+        import soundfile as sf
+
+        path = tmp_path / "long.wav"
+        noise = np.random.default_rng(0).uniform(-0.5, 0.5, 44100 * 60).astype(np.float32)
+        sf.write(str(path), noise, 44100, subtype='PCM_16')
+        del noise
+
+        tracemalloc.start()
+        HookFX().process_stream(str(path), str(tmp_path / "out"), export_stems=False, blocksize=8192)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # The decoded take alone would be 10.6 MB of float32
+        assert peak < 2 * 1024 * 1024
+
+    def test_stream_rejects_unreadable_format(self, tmp_path):
+        """Test a clear error for formats soundfile can't stream."""
+        path = tmp_path / "take.m4a"
+        path.write_bytes(b"\x00" * 64)
+
+        with pytest.raises(ValueError, match="soundfile-readable"):
+            HookFX().process_stream(str(path), str(tmp_path / "out"))
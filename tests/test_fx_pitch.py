@@ -0,0 +1,137 @@
+"""Unit tests for the vectorized pitch correction stage"""
+import numpy as np
+import pytest
+
+from src.fx.pipeline import HookFX
+from src.fx.pitch import (
+    PitchCorrector,
+    correct_pitch,
+    estimate_f0,
+    hz_to_midi,
+    snap_to_scale,
+)
+
+SR = 44100
+
+
+def sung_note(midi_note: float, seconds: float = 1.0) -> np.ndarray:
+    """A harmonic tone at a (fractional) MIDI pitch."""
+    t = np.arange(int(seconds * SR)) / SR
+    f0 = 440.0 * 2 ** ((midi_note - 69) / 12)
+    return (0.4 * np.sin(2 * np.pi * f0 * t) + 0.2 * np.sin(4 * np.pi * f0 * t)).astype(np.float32)
+
+
+def median_pitch(y: np.ndarray) -> float:
+    f0, voiced = estimate_f0(y, SR)
+    return float(np.median(hz_to_midi(f0[voiced])))
+
+
+class TestPitchTracking:
+    def test_estimate_f0(self):
+        """Test YIN finds the pitch of a harmonic tone."""
+        f0, voiced = estimate_f0(sung_note(57.0), SR)
+
+        assert voiced.mean() > 0.95
+        assert np.median(f0[voiced]) == pytest.approx(220.0, rel=1e-3)
+
+    def test_silence_is_unvoiced(self):
+        """Test that silence and low-level noise are not tracked."""
+        _, voiced = estimate_f0(np.zeros(SR, dtype=np.float32), SR)
+
+        assert not voiced.any()
+
+    @pytest.mark.parametrize("note,key,scale,expected", [
+        (60.4, "C", "chromatic", 60),
+        (60.6, "C", "chromatic", 61),
+        (60.9, "C", "major", 60),
+        (61.6, "C", "major", 62),
+        (66.2, "G", "major", 66),
+        (63.9, "A", "minor", 64),
+    ])
+    def test_snap_to_scale(self, note, key, scale, expected):
+        """Test snapping to the nearest scale degree across keys and octaves."""
+        assert snap_to_scale(np.array([note]), key, scale)[0] == expected
+
+    def test_invalid_scale(self):
+        """Test unknown keys and scales are rejected."""
+        with pytest.raises(ValueError, match="Invalid scale"):
+            PitchCorrector(scale="lydian-ish")
+        with pytest.raises(ValueError, match="Invalid key"):
+            snap_to_scale(np.zeros(1), key="H")
+
+
+class TestPitchCorrector:
+    def test_corrects_sharp_note(self):
+        """Test a note 40 cents sharp is pulled onto the semitone."""
+        out = correct_pitch(sung_note(57.4), SR, retune_ms=0)
+
+        assert median_pitch(out) == pytest.approx(57.0, abs=0.05)
+        assert out.size == SR
+
+    def test_snaps_to_scale(self):
+        """Test C# is pulled to the nearest C-major note."""
+        out = correct_pitch(sung_note(61.3), SR, key="C", scale="major", retune_ms=0)
+
+        assert median_pitch(out) == pytest.approx(62.0, abs=0.05)
+
+    def test_retune_speed_glides(self):
+        """Test a slow retune reaches the target later than a fast one."""
+        y = sung_note(57.4)
+        early = slice(4096, 8192)
+
+        fast = median_pitch(correct_pitch(y, SR, retune_ms=0)[early])
+        slow = median_pitch(correct_pitch(y, SR, retune_ms=400)[early])
+
+        assert abs(fast - 57.0) < abs(slow - 57.0)
+
+    def test_in_tune_note_unchanged(self):
+        """Test an in-tune note passes through with its pitch and level intact."""
+        y = sung_note(57.0)
+        out = correct_pitch(y, SR)
+
+        assert median_pitch(out) == pytest.approx(57.0, abs=0.02)
+        assert np.std(out) == pytest.approx(np.std(y), rel=0.02)
+
+    def test_blockwise_equals_offline(self, vocal_take):
+        """Test that block boundaries do not change the output."""
+        node = PitchCorrector()
+        offline = np.concatenate([node.process(vocal_take), node.flush()])
+
+        node.reset()
+        blocks = [node.process(b) for b in np.array_split(vocal_take, 11)]
+
+        np.testing.assert_allclose(np.concatenate(blocks + [node.flush()]), offline, atol=1e-6)
+
+    def test_holds_back_latency(self):
+        """Test only the last ``latency`` samples wait for the flush."""
+        node = PitchCorrector()
+        y = sung_note(57.0, 0.5)
+        head = node.process(y)
+        tail = node.flush()
+
+        assert head.size == y.size - node.latency
+        assert tail.size == node.latency
+        np.testing.assert_allclose(np.concatenate([head, tail]), correct_pitch(y, SR), atol=1e-6)
+
+
+class TestHookFXPitch:
+    def test_pitch_stage_aligned(self):
+        """Test the corrected stage lines up with the normalized input."""
+        y = np.concatenate([np.zeros(SR // 4, dtype=np.float32), sung_note(57.0, 0.5)])
+        result = HookFX().process(y)
+        normalized, corrected = result.intermediates["normalize"], result.intermediates["pitch"]
+
+        onset = np.flatnonzero(np.abs(corrected) > 1e-3)[0]
+        assert corrected.size == y.size
+        assert abs(onset - np.flatnonzero(np.abs(normalized) > 1e-3)[0]) < 256
+
+    def test_bypass(self, vocal_take):
+        """Test disabling the stage passes the normalized take through."""
+        result = HookFX(pitch_correction=False).process(vocal_take)
+
+        np.testing.assert_array_equal(result.intermediates["pitch"], result.intermediates["normalize"])
+
+    def test_invalid_key(self):
+        """Test an unknown key is rejected when building the pipeline."""
+        with pytest.raises(ValueError, match="Invalid key"):
+            HookFX(key="H")
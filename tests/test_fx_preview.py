@@ -0,0 +1,90 @@
+"""Unit tests for waveform/spectrogram preview sidecars"""
+import numpy as np
+import pytest
+
+from src.fx.pipeline import HookFX
+from src.fx.preview import (
+    MEL_BANDS,
+    PEAK_BASE,
+    PEAK_FACTOR,
+    PreviewBuilder,
+    build_preview,
+    load_preview,
+    preview_paths,
+)
+
+
+class TestPreview:
+    def test_peak_pyramid(self, vocal_take):
+        """Test every level holds the min/max of its bins."""
+        preview = build_preview(vocal_take, 44100)
+
+        finest = preview.level(0)
+        assert len(finest) == -(-vocal_take.size // PEAK_BASE)
+        np.testing.assert_allclose(finest[3], [vocal_take[768:1024].min(), vocal_take[768:1024].max()], atol=1e-3)
+        for i in range(1, len(preview.levels)):
+            coarse = preview.level(i)
+            assert preview.levels[i]["samples_per_bin"] == PEAK_BASE * PEAK_FACTOR ** i
+            assert coarse[:, 0].min() == preview.level(i - 1)[:, 0].min()
+            assert coarse[:, 1].max() == preview.level(i - 1)[:, 1].max()
+
+    def test_spectrogram(self, vocal_take):
+        """Test the log-mel has energy where the vowel's fundamental is."""
+        mel = build_preview(vocal_take, 44100).spectrogram()
+
+        assert mel.shape[0] == MEL_BANDS
+        assert mel.shape[1] == pytest.approx(vocal_take.size / 2048, abs=1)
+        assert np.argmax(mel.mean(axis=1)) < MEL_BANDS // 4
+
+    def test_blockwise_equals_offline(self, vocal_take):
+        """Test a preview built from blocks matches a whole-signal one."""
+        offline = build_preview(vocal_take, 44100)
+        builder = PreviewBuilder(44100)
+        for i in range(0, vocal_take.size, 3001):
+            builder.process(vocal_take[i:i + 3001])
+        streamed = builder.finish()
+
+        assert streamed.levels == offline.levels
+        np.testing.assert_array_equal(streamed.peaks, offline.peaks)
+        np.testing.assert_allclose(streamed.mel.astype(np.float32), offline.mel.astype(np.float32), atol=0.1)
+
+    def test_waveform_zoom(self, vocal_take):
+        """Test zooming in picks a finer level with about the requested width."""
+        preview = build_preview(vocal_take, 44100)
+
+        whole, whole_per_bin = preview.waveform(width=50)
+        zoomed, zoomed_per_bin = preview.waveform(0.5, 1.5, width=50)
+
+        assert zoomed_per_bin < whole_per_bin
+        assert len(whole) >= 50 and len(zoomed) >= 50
+
+    def test_save_and_load(self, vocal_take, tmp_path):
+        """Test sidecars round-trip memory-mapped and stay small."""
+        audio = tmp_path / "mix.wav"
+        build_preview(vocal_take, 44100).save(audio)
+
+        preview = load_preview(audio)
+
+        assert isinstance(preview.peaks, np.memmap)
+        assert preview.duration == pytest.approx(2.0)
+        total = sum(path.stat().st_size for path in preview_paths(audio).values())
+        assert total < vocal_take.nbytes / 10
+
+    def test_missing_preview(self, tmp_path):
+        """Test loading a preview that was never written."""
+        with pytest.raises(FileNotFoundError):
+            load_preview(tmp_path / "mix.wav")
+
+
+class TestHookFXPreviews:
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_writes_mix_preview(self, vocal_wav, tmp_path, stream):
+        """Test previews of the mix are written next to it on request."""
+        fx = HookFX()
+        if stream:
+            fx.process_stream(str(vocal_wav), str(tmp_path / "out"), previews=True)
+        else:
+            fx.process_file(str(vocal_wav), str(tmp_path / "out"), previews=True)
+
+        preview = load_preview(tmp_path / "out" / fx.mix_filename)
+        assert preview.duration == pytest.approx(2.0)
@@ -1,7 +1,11 @@
 """Unit tests for lyric generator"""
+import random
+
 import pytest
 
-from src.lyrics.generator import LyricGenerator, generate_bars, generate_hook
+from src.lyrics.generator import MODES, LyricGenerator, generate_bars, generate_hook
+from src.personas import vocab_loader
+from src.personas.vocab_loader import PersonaVocabLoader
 
 
 class TestLyricGenerator:
@@ -107,6 +111,65 @@ class TestLyricGenerator:
             assert isinstance(result, str)
             assert len(result) > 0
 
+    def test_shared_vocab_loader(self, mocker):
+        """Test generators sharing a loader read each persona file once."""
+        loader = PersonaVocabLoader()
+        load_json = mocker.spy(vocab_loader, "load_json_file")
+
+        for _ in range(3):
+            LyricGenerator(vocab_loader=loader).generate_bars("Neon Alien", "Fashion")
+
+        assert load_json.call_count == 2  # base.json and neon_alien.json
+
+
+class TestVariations:
+    def test_seed_is_reproducible(self):
+        """Test the same seed gives the same lyrics."""
+        generator = LyricGenerator()
+
+        for mode in MODES:
+            first = generator.generate("Neon Alien", "Fashion", mode, flex=9, chaos=9, seed=42)
+            assert generator.generate("Neon Alien", "Fashion", mode, flex=9, chaos=9, seed=42) == first
+
+    def test_unseeded_follows_global_seed(self):
+        """Test unseeded generations use the global generator, so random.seed() reproduces them."""
+        generator = LyricGenerator()
+
+        for mode in MODES:
+            random.seed(7)
+            first = generator.generate("Neon Alien", "Fashion", mode, flex=9, chaos=9)
+            random.seed(7)
+            assert generator.generate("Neon Alien", "Fashion", mode, flex=9, chaos=9) == first
+
+    def test_variations_match_seeds(self):
+        """Test each variation can be regenerated from its seed."""
+        generator = LyricGenerator()
+
+        variations = generator.generate_variations("Beach Riff", "Snacks", count=20, seed=100)
+
+        assert [variation.index for variation in variations] == list(range(20))
+        assert [variation.seed for variation in variations] == list(range(100, 120))
+        for variation in variations:
+            assert variation.text == generator.generate("Beach Riff", "Snacks", seed=variation.seed)
+        assert len({variation.text for variation in variations}) > 1
+
+    def test_iter_variations_yields_all(self):
+        """Test the streaming form yields every variation exactly once."""
+        generator = LyricGenerator()
+
+        streamed = list(generator.iter_variations("Neon Alien", "Sci-Fi", "Hook Generator", count=50, workers=4))
+
+        assert sorted(variation.index for variation in streamed) == list(range(50))
+
+    def test_invalid_variations(self):
+        """Test invalid modes and counts are rejected before any work starts."""
+        generator = LyricGenerator()
+
+        with pytest.raises(ValueError):
+            generator.generate_variations("Neon Alien", "Fashion", mode="Chorus")
+        with pytest.raises(ValueError):
+            generator.generate_variations("Neon Alien", "Fashion", count=0)
+
 
 class TestConvenienceFunctions:
     def test_generate_bars_function(self):
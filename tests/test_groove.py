@@ -0,0 +1,159 @@
+"""Unit tests for groove ingestion and indexing"""
+import mido
+import numpy as np
+import pytest
+
+from midi_generator import create_simple_beat, generate_midi
+from src.hooks.groove import (
+    Groove,
+    GrooveIndex,
+    extract_groove,
+    generate_midi_from_groove,
+    parse_midi_bytes,
+)
+
+# Kick on every beat, snare on 2 and 4, 16th-note hats
+FOUR_ON_FLOOR = {
+    36: [100, 0, 0, 0] * 4,
+    38: [0, 0, 0, 0, 90, 0, 0, 0] * 2,
+    42: [80] * 16,
+}
+
+
+def write_beat(path, tempo, pattern=None, num_bars=4):
+    """Write a drum-only MIDI file."""
+    mid = mido.MidiFile()
+    mid.tracks.append(create_simple_beat(tempo, num_bars, pattern))
+    mid.save(str(path))
+    return path
+
+
+@pytest.fixture
+def grooves_dir(tmp_path):
+    """Folder of reference grooves."""
+    folder = tmp_path / "grooves"
+    folder.mkdir()
+    write_beat(folder / "basic_120.mid", 120)
+    write_beat(folder / "basic_96.mid", 96)
+    write_beat(folder / "floor_128.mid", 128, FOUR_ON_FLOOR)
+    (folder / "notes.txt").write_text("not midi")
+    return folder
+
+
+class TestParseMidiBytes:
+    def test_parse_tempo_and_notes(self, tmp_path):
+        """Test that the fast parser matches mido on tempo and note count."""
+        path = write_beat(tmp_path / "beat.mid", 100)
+        division, tempo, notes = parse_midi_bytes(path.read_bytes())
+
+        mid = mido.MidiFile(str(path))
+        expected = sum(1 for m in mid.tracks[0] if m.type == 'note_on' and m.velocity > 0)
+        assert division == mid.ticks_per_beat
+        assert tempo == int(60000000 / 100)
+        assert len(notes) == expected
+
+    def test_parse_invalid(self):
+        """Test that non-MIDI data raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_midi_bytes(b"RIFF....")
+
+    def test_parse_zero_division(self, tmp_path):
+        """Test that a header with zero ticks per beat raises ValueError."""
+        data = bytearray(write_beat(tmp_path / "beat.mid", 100).read_bytes())
+        data[12:14] = b"\x00\x00"
+        with pytest.raises(ValueError, match="time division"):
+            parse_midi_bytes(bytes(data))
+
+
+class TestExtractGroove:
+    def test_basic_beat_pattern(self, tmp_path):
+        """Test quantizing the default beat."""
+        groove = extract_groove(write_beat(tmp_path / "beat.mid", 120))
+
+        kick, snare, hat = groove.pattern
+        assert groove.tempo == pytest.approx(120, abs=0.01)
+        assert np.flatnonzero(kick).tolist() == [0, 8]
+        assert np.flatnonzero(snare).tolist() == [4, 12]
+        assert np.flatnonzero(hat).tolist() == [0, 4, 8, 12]
+        assert groove.density == pytest.approx(8)
+
+    def test_melody_counts_towards_density(self, tmp_path):
+        """Test that melody notes contribute to note density."""
+        path = generate_midi("one two three four five six seven eight", str(tmp_path / "song.mid"))
+        groove = extract_groove(path)
+
+        assert groove.density > 8
+
+    def test_beat_pattern_round_trip(self, tmp_path):
+        """Test that an extracted pattern regenerates the same groove."""
+        original = extract_groove(write_beat(tmp_path / "a.mid", 128, FOUR_ON_FLOOR))
+        copy = extract_groove(write_beat(tmp_path / "b.mid", 128, original.beat_pattern()))
+
+        np.testing.assert_array_equal(original.pattern, copy.pattern)
+
+
+class TestGrooveIndex:
+    def test_build_and_load(self, grooves_dir, tmp_path):
+        """Test building an index and loading it back."""
+        index_path = tmp_path / "index.npz"
+        built = GrooveIndex.build(str(grooves_dir), str(index_path))
+        loaded = GrooveIndex.load(str(index_path))
+
+        assert len(built) == len(loaded) == 3
+        assert "floor_128" in loaded
+        np.testing.assert_array_equal(built.patterns, loaded.patterns)
+
+    def test_rebuild_skips_unchanged(self, grooves_dir, mocker):
+        """Test that unchanged files are not re-parsed."""
+        GrooveIndex.build(str(grooves_dir))
+        spy = mocker.patch("src.hooks.groove.extract_groove")
+
+        index = GrooveIndex.build(str(grooves_dir))
+
+        spy.assert_not_called()
+        assert len(index) == 3
+
+    def test_like(self, grooves_dir):
+        """Test that the most similar groove shares the pattern."""
+        index = GrooveIndex.build(str(grooves_dir))
+        match = index.like("basic_120")[0]
+
+        assert match.name == "basic_96"
+
+    def test_closest_tempo(self, grooves_dir):
+        """Test lookup by tempo."""
+        index = GrooveIndex.build(str(grooves_dir))
+
+        assert index.closest_tempo(130).name == "floor_128"
+
+    def test_missing_groove(self, grooves_dir):
+        """Test that unknown names raise KeyError."""
+        index = GrooveIndex.build(str(grooves_dir))
+
+        with pytest.raises(KeyError):
+            index.get("nope")
+
+    def test_load_missing_index(self, tmp_path):
+        """Test loading a nonexistent index."""
+        with pytest.raises(FileNotFoundError):
+            GrooveIndex.load(str(tmp_path / "missing.npz"))
+
+    def test_empty_index(self, tmp_path):
+        """Test an empty folder produces an empty index."""
+        index = GrooveIndex.build(str(tmp_path))
+
+        assert len(index) == 0
+        with pytest.raises(LookupError):
+            index.closest_tempo(120)
+
+
+class TestGenerateMidiFromGroove:
+    def test_tempo_and_beat_follow_groove(self, grooves_dir, tmp_path):
+        """Test that generated MIDI uses the groove's tempo and pattern."""
+        groove = GrooveIndex.build(str(grooves_dir)).get("floor_128")
+        output = generate_midi_from_groove("a b c d e f g h", groove, str(tmp_path / "out.mid"))
+
+        result = extract_groove(output)
+        assert result.tempo == pytest.approx(128, abs=0.01)
+        np.testing.assert_array_equal(result.pattern, groove.pattern)
+        assert isinstance(groove, Groove)
@@ -0,0 +1,132 @@
+"""Unit tests for the bounded generation history"""
+import os
+import time
+
+import pytest
+
+from src.lyrics.history import GenerationHistory, HistoryEntry, default_spill_dir, prune_spills
+
+
+def make_entry(i):
+    """History entry numbered i."""
+    return HistoryEntry(
+        text=f"My drip number {i} glows.",
+        persona="Neon Alien",
+        theme="Fashion",
+        mode="4-Bar Verse",
+        flex_level=7,
+        nonsense=5,
+        timestamp=f"2024-01-01 00:00:{i:02d}",
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    """History keeping 4 entries in memory."""
+    return GenerationHistory(tmp_path / "history" / "session.jsonl", capacity=4)
+
+
+class TestGenerationHistory:
+    def test_memory_is_bounded(self, history):
+        """Test only `capacity` entries stay in memory, the rest spill."""
+        for i in range(10):
+            history.append(make_entry(i))
+
+        assert len(history) == 10
+        assert history.spilled == 6
+        assert len(history._recent) == 4
+        assert sum(1 for _ in open(history.spill_path)) == 6
+
+    def test_no_spill_file_until_full(self, history):
+        """Test a short history never touches disk."""
+        for i in range(4):
+            history.append(make_entry(i))
+
+        assert history.spilled == 0
+        assert not history.spill_path.exists()
+
+    def test_full_history_is_browsable(self, history):
+        """Test spilled and in-memory entries read back in order."""
+        for i in range(10):
+            history.append(make_entry(i))
+
+        assert [entry.text for entry in history.entries(0, 10)] == [make_entry(i).text for i in range(10)]
+        assert history[2] == make_entry(2)
+        assert history[-1] == make_entry(9)
+        with pytest.raises(IndexError):
+            history[10]
+
+    def test_pages(self, history):
+        """Test pages run newest first and the last one is partial."""
+        for i in range(12):
+            history.append(make_entry(i))
+
+        assert history.latest(3) == [make_entry(11), make_entry(10), make_entry(9)]
+        assert history.pages(5) == 3
+        assert history.page(1, 5) == [make_entry(i) for i in range(6, 1, -1)]
+        assert history.page(2, 5) == [make_entry(1), make_entry(0)]
+        assert history.page(3, 5) == []
+
+    def test_from_generation(self):
+        """Test extra keys of a generation dict are dropped."""
+        generation = {
+            'text': "Yuh!", 'persona': "Beach Riff", 'theme': "Snacks", 'mode': "Hook Generator",
+            'flex_level': 3, 'nonsense': 9, 'timestamp': "now", 'seed': 42,
+        }
+
+        entry = HistoryEntry.from_generation(generation)
+
+        assert entry.persona == "Beach Riff"
+        assert not hasattr(entry, "__dict__")
+
+    def test_clear(self, history):
+        """Test clearing removes the spill file."""
+        for i in range(6):
+            history.append(make_entry(i))
+
+        history.clear()
+
+        assert len(history) == 0
+        assert not history.spill_path.exists()
+
+    def test_invalid_capacity(self, tmp_path):
+        """Test a history must hold at least one entry."""
+        with pytest.raises(ValueError):
+            GenerationHistory(tmp_path / "history.jsonl", capacity=0)
+
+    def test_spill_is_capped(self, tmp_path):
+        """Test reaching max_spilled drops the oldest half from disk and the offsets."""
+        history = GenerationHistory(tmp_path / "session.jsonl", capacity=2, max_spilled=6)
+        for i in range(12):
+            history.append(make_entry(i))
+
+        # 10 spills: the 7th dropped entries 0-2, the 10th dropped 3-5
+        assert history.spilled == 4
+        assert len(history._offsets) == 4
+        assert sum(1 for _ in open(history.spill_path)) == 4
+        assert [entry.text for entry in history.entries(0, len(history))] == [
+            make_entry(i).text for i in range(6, 12)
+        ]
+        assert history.latest(1)[0] == make_entry(11)
+
+    def test_invalid_max_spilled(self, tmp_path):
+        """Test max_spilled must be positive."""
+        with pytest.raises(ValueError):
+            GenerationHistory(tmp_path / "history.jsonl", max_spilled=0)
+
+    def test_prune_spills(self, tmp_path):
+        """Test only spill files idle for longer than max_age are removed."""
+        stale, fresh = tmp_path / "stale.jsonl", tmp_path / "fresh.jsonl"
+        stale.write_text("{}\n")
+        fresh.write_text("{}\n")
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+
+        assert prune_spills(tmp_path, max_age=60) == 1
+        assert not stale.exists() and fresh.exists()
+
+    def test_default_spill_dir_is_per_user(self, tmp_path, monkeypatch):
+        """Test spill files default to the user's cache, not the working directory."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+        assert default_spill_dir() == tmp_path / "cache" / "riff-raff" / "history"
@@ -0,0 +1,131 @@
+"""Unit tests for the timing metrics"""
+import threading
+
+import pytest
+
+from src import metrics
+from src.lyrics.generator import LyricGenerator
+from src.metrics import BUCKET_BOUNDS, SUB_BUCKETS, get_metrics, prometheus_text, record, timed
+
+
+@pytest.fixture
+def enabled():
+    """Record metrics for one test, starting and ending empty."""
+    was_enabled = metrics.metrics_enabled()
+    metrics.reset_metrics()
+    metrics.enable_metrics()
+    yield
+    metrics.enable_metrics(was_enabled)
+    metrics.reset_metrics()
+
+
+class TestTimers:
+    def test_context_manager(self, enabled):
+        """Test a timed block counts one call and its time."""
+        with timed("block"):
+            pass
+
+        stats = get_metrics()["block"]
+        assert stats["count"] == 1 and stats["errors"] == 0
+        assert 0 <= stats["p50"] <= stats["max"] == stats["total"]
+
+    def test_decorator(self, enabled):
+        """Test a timed function keeps its name and result and counts each call."""
+        @timed("double")
+        def double(x):
+            """Double x."""
+            return x * 2
+
+        assert [double(i) for i in range(3)] == [0, 2, 4]
+        assert double.__name__ == "double" and double.__doc__ == "Double x."
+        assert get_metrics()["double"]["count"] == 3
+
+    def test_errors_are_counted(self, enabled):
+        """Test calls that raise are recorded as errors and still raise."""
+        @timed("fail")
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            fail()
+        with pytest.raises(KeyError):
+            with timed("fail"):
+                raise KeyError("boom")
+
+        assert get_metrics()["fail"]["errors"] == 2
+
+    def test_disabled_records_nothing(self):
+        """Test nothing is recorded while metrics are off."""
+        metrics.enable_metrics(False)
+        metrics.reset_metrics()
+
+        with timed("off"):
+            pass
+        timed("off")(len)("abc")
+        record("off", 1.0)
+
+        assert get_metrics() == {}
+
+    def test_threads(self, enabled):
+        """Test concurrent recording loses no calls."""
+        def work():
+            for _ in range(1000):
+                record("shared", 0.001)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert get_metrics()["shared"]["count"] == 8000
+
+
+class TestHistogram:
+    def test_percentiles_within_one_bucket(self, enabled):
+        """Test percentiles land within one bucket width above the true value."""
+        for i in range(1, 101):
+            record("latency", i / 1000)  # 1..100 ms
+
+        stats = get_metrics()["latency"]
+        width = 2 ** (1 / SUB_BUCKETS)
+        for q, truth in ((50, 0.050), (95, 0.095), (99, 0.099)):
+            assert truth <= stats[f"p{q}"] <= truth * width
+        assert stats["max"] == 0.1
+        assert stats["mean"] == pytest.approx(0.0505)
+
+    def test_overflow(self, enabled):
+        """Test calls slower than the last bucket report the measured maximum."""
+        record("slow", BUCKET_BOUNDS[-1] * 2)
+
+        assert get_metrics()["slow"]["p99"] == BUCKET_BOUNDS[-1] * 2
+
+    def test_prometheus_text(self, enabled):
+        """Test the Prometheus dump has cumulative buckets, sum, count and errors."""
+        record("op", 0.001)
+        record("op", 0.5, error=True)
+
+        lines = prometheus_text().splitlines()
+        buckets = [line for line in lines if line.startswith('riff_raff_operation_seconds_bucket{operation="op"')]
+        counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+
+        assert len(buckets) == len(BUCKET_BOUNDS) + 1
+        assert counts == sorted(counts) and counts[-1] == 2
+        assert buckets[-1].startswith('riff_raff_operation_seconds_bucket{operation="op",le="+Inf"}')
+        assert 'riff_raff_operation_seconds_count{operation="op"} 2' in lines
+        assert 'riff_raff_operation_errors_total{operation="op"} 1' in lines
+        assert "# TYPE riff_raff_operation_seconds histogram" in lines
+
+
+class TestInstrumentation:
+    def test_generation_is_timed(self, enabled):
+        """Test generation and persona loading record their operations."""
+        generator = LyricGenerator()
+        generator.generate("Neon Alien", "Fashion", seed=1)
+        generator.generate("Neon Alien", "Fashion", "Hook Generator", seed=1)
+
+        recorded = get_metrics()
+        assert recorded["lyrics.generate_bars"]["count"] == 1
+        assert recorded["lyrics.generate_hook"]["count"] == 1
+        assert recorded["personas.load_persona"]["count"] == 1
+        assert recorded["utils.load_json_file"]["count"] >= 1
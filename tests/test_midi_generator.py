@@ -3,6 +3,7 @@ import pytest
 
 from midi_generator import (
     generate_midi,
+    generate_midi_for_take,
     generate_midi_from_bars,
     get_note_from_word,
 )
@@ -38,6 +39,12 @@ class TestGetNoteFromWord:
         
         assert 48 <= note <= 59
 
+    def test_get_note_in_scale(self):
+        """Test notes stay on the given scale degrees."""
+        minor = (0, 2, 3, 5, 7, 8, 10)
+        for word in ["ice", "drip", "flex", "swag", "matrix"]:
+            assert get_note_from_word(word, base_note=57, scale=minor) - 57 in minor
+
 
 class TestGenerateMidi:
     def test_generate_midi_basic(self, tmp_path):
@@ -61,3 +68,19 @@ class TestGenerateMidi:
         result = generate_midi_from_bars(bars, str(output))
         
         assert isinstance(result, str)
+
+    def test_generate_midi_for_take(self, tmp_path, monkeypatch, mocker):
+        """Test the take's tempo and key drive the MIDI."""
+        from src.fx.analysis import TakeAnalysis
+
+        monkeypatch.chdir(tmp_path)
+        analysis = TakeAnalysis(tempo=96.0, key="A", scale="minor", key_confidence=0.9, duration=8.0)
+        mocker.patch("src.fx.analysis.analyze_file", return_value=analysis)
+        generate = mocker.patch("midi_generator.generate_midi", return_value="out.mid")
+
+        generate_midi_for_take("My ice glows", "take.wav", "out.mid")
+
+        _, kwargs = generate.call_args
+        assert kwargs["tempo"] == 96.0
+        assert kwargs["base_note"] == 57
+        assert kwargs["scale"] == (0, 2, 3, 5, 7, 8, 10)
@@ -1,5 +1,6 @@
 """Unit tests for persona vocab loader"""
 import json
+import threading
 from pathlib import Path
 
 import pytest
@@ -69,6 +70,78 @@ class TestPersonaVocabLoader:
         assert is_valid is True
 
 
+class TestPersonaVocabLoaderConcurrency:
+    def test_reload_under_concurrent_loads(self, tmp_path):
+        """Test loads racing reloads always get one consistent version of the vocab."""
+        def write_version(version):
+            # Swap the file in whole, like a deploy, so readers never parse a half-written one
+            staged = tmp_path / "base.json.tmp"
+            staged.write_text(json.dumps({"vocab": [f"v{version}"], "styles": [f"v{version}"]}))
+            staged.replace(tmp_path / "base.json")
+
+        write_version(0)
+        loader = PersonaVocabLoader(str(tmp_path))
+        loader.load_persona("Stress")
+        stop = threading.Event()
+        results, errors = [], []
+
+        def load():
+            while not stop.is_set():
+                try:
+                    results.append(loader.load_persona("Stress"))
+                except Exception as e:
+                    errors.append(e)
+
+        readers = [threading.Thread(target=load) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        for version in range(1, 30):
+            write_version(version)
+            loader.reload()
+            if version % 10 == 0:
+                loader.clear_cache()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        assert errors == []
+        assert results and all(vocab == styles for vocab, styles in results)
+        assert loader.load_persona("Stress") == (["v29"], ["v29"])
+
+    def test_concurrent_first_loads_share_one_result(self):
+        """Test threads loading an uncached persona at once all get the cached entry."""
+        loader = PersonaVocabLoader()
+        barrier = threading.Barrier(8)
+        results = []
+
+        def load():
+            barrier.wait()
+            results.append(loader.load_persona("Neon Alien"))
+
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        vocab, styles = loader._cache["Neon Alien"]
+        assert all(result == (list(vocab), list(styles)) for result in results)
+        assert list(loader._cache) == ["Neon Alien"]
+
+    def test_returned_vocab_is_a_copy(self):
+        """Test a caller mutating its vocab doesn't change what other callers get."""
+        loader = PersonaVocabLoader()
+        vocab, styles = loader.load_persona("Neon Alien")
+        vocab.append("corrupted")
+        styles.clear()
+
+        fresh_vocab, fresh_styles = loader.load_persona("Neon Alien")
+        assert "corrupted" not in fresh_vocab
+        assert fresh_styles
+        with pytest.raises(TypeError):
+            loader._cache["Other"] = ((), ())  # type: ignore[index]
+
+
 class TestLoadPersonaFunction:
     def test_load_persona_function(self):
         """Test the convenience load_persona function."""
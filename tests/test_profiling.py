@@ -0,0 +1,91 @@
+"""Unit tests for sampled profiling"""
+import pstats
+
+import pytest
+
+from src import profiling
+from src.lyrics.generator import LyricGenerator
+from src.profiling import last_profile, profiled
+from src.utils import Config
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    """Profile every call into a temporary directory, restoring the config afterwards."""
+    config = Config()
+    saved = config.snapshot()
+    config.load_config("nonexistent.json")
+    config.set("profiling.enabled", True)
+    config.set("profiling.sample_rate", 1.0)
+    config.set("profiling.dir", str(tmp_path / "profiles"))
+    yield tmp_path / "profiles"
+    config._config = saved
+
+
+class TestProfiled:
+    def test_capture_writes_profile_and_report(self, profile_dir):
+        """Test a sampled call writes a loadable .prof and an allocation report."""
+        text = LyricGenerator().generate_bars("Neon Alien", "Fashion", seed=3)
+
+        summary = last_profile()
+        assert summary is not None
+        assert summary.name == "lyrics.generate_bars"
+        assert text == LyricGenerator().generate_bars("Neon Alien", "Fashion", seed=3)
+        assert pstats.Stats(summary.profile_path).total_calls > 0  # type: ignore[attr-defined]
+        assert any("_bars" in function for function, *_ in summary.functions)
+        report = open(summary.report_path).read()
+        assert "lyrics.generate_bars" in report and "allocations" in report
+
+    def test_disabled(self, profile_dir):
+        """Test nothing is captured when profiling is off or nothing is sampled."""
+        Config().set("profiling.enabled", False)
+        LyricGenerator().generate_hook("Beach Riff", "Snacks", seed=1)
+        Config().set("profiling.enabled", True)
+        Config().set("profiling.sample_rate", 0.0)
+        LyricGenerator().generate_hook("Beach Riff", "Snacks", seed=1)
+
+        assert not profile_dir.exists()
+
+    def test_rotation(self, profile_dir):
+        """Test only the newest profiling.keep captures are kept."""
+        Config().set("profiling.keep", 3)
+        generator = LyricGenerator()
+        for seed in range(5):
+            generator.generate_hook("Beach Riff", "Snacks", seed=seed)
+
+        assert len(list(profile_dir.glob("*.prof"))) == 3
+        assert len(list(profile_dir.glob("*.txt"))) == 3
+
+    def test_nested_calls_share_one_capture(self, profile_dir):
+        """Test profiled calls inside a capture don't start their own."""
+        @profiled("test.outer")
+        def outer():
+            return LyricGenerator().generate_hook("Beach Riff", "Snacks", seed=1)
+
+        outer()
+
+        assert [path.name.endswith("test.outer.prof") for path in profile_dir.glob("*.prof")] == [True]
+
+    def test_exception_still_profiled(self, profile_dir):
+        """Test a call that raises is captured and the error propagates."""
+        @profiled("test.fail")
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            fail()
+
+        summary = last_profile()
+        assert summary is not None and summary.name == "test.fail"
+        assert not profiling.tracemalloc.is_tracing()
+
+    def test_default_dir_is_per_user(self, profile_dir, tmp_path, monkeypatch):
+        """Test captures default to the user's cache, not the working directory."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.chdir(tmp_path)
+        Config().set("profiling.dir", None)
+
+        profiled("test.default")(lambda: None)()
+
+        assert list((tmp_path / "cache" / "riff-raff" / "profiles").glob("*.prof"))
+        assert not (tmp_path / ".cache").exists()
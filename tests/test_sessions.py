@@ -0,0 +1,22 @@
+"""Unit tests for the concurrent app-session load harness"""
+import pytest
+
+from benchmarks import sessions
+
+
+class TestSessions:
+    @pytest.mark.parametrize("mode", sessions.SESSION_MODES)
+    def test_run_keeps_vault_intact(self, mode, tmp_path):
+        """Test concurrent sessions save every entry exactly once without torn reads."""
+        report = sessions.run(4, iterations=3, mode=mode, initial=20, work_dir=str(tmp_path))
+
+        assert report.integrity_errors == 0
+        assert report.completed == report.saves == 12
+        assert report.final_size == 32
+        assert all(report.errors[op] == 0 for op in sessions.OPERATIONS)
+        assert len(report.to_dict()["operations"]) == len(sessions.OPERATIONS)
+
+    def test_invalid_mode(self):
+        """Test unknown session modes are rejected."""
+        with pytest.raises(ValueError):
+            sessions.run(1, iterations=1, mode="fiber")
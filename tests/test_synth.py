@@ -0,0 +1,92 @@
+"""Unit tests for the offline MIDI synthesizer"""
+import time
+
+import numpy as np
+import pytest
+
+from midi_generator import generate_midi
+from src.hooks.synth import (
+    DRUM_CHANNEL,
+    KICK,
+    NoteEvent,
+    extract_note_events,
+    render_events,
+    render_midi,
+    render_midi_to_wav,
+    to_wav_bytes,
+)
+
+
+@pytest.fixture
+def hook_midi(tmp_path):
+    """Generate a 4-bar hook MIDI file."""
+    lyrics = "Came through drippin' Michelle Obama " * 4
+    return generate_midi(lyrics, str(tmp_path / "hook.mid"))
+
+
+class TestExtractNoteEvents:
+    def test_extracts_melody_and_drums(self, hook_midi):
+        """Test that both melody and drum notes are extracted."""
+        events = extract_note_events(hook_midi)
+
+        channels = {e.channel for e in events}
+        assert DRUM_CHANNEL in channels
+        assert 0 in channels
+        assert all(e.duration >= 0 for e in events)
+
+    def test_events_sorted(self, hook_midi):
+        """Test that events are sorted by start time."""
+        events = extract_note_events(hook_midi)
+        starts = [e.start for e in events]
+
+        assert starts == sorted(starts)
+
+
+class TestRenderEvents:
+    def test_render_empty(self):
+        """Test rendering no events produces a short silent buffer."""
+        audio = render_events([])
+
+        assert audio.dtype == np.float32
+        assert not audio.any()
+
+    def test_render_normalized(self):
+        """Test that rendered audio peaks at the requested gain."""
+        events = [
+            NoteEvent(0.0, 0.25, 60, 100, 0),
+            NoteEvent(0.0, 0.1, KICK, 100, DRUM_CHANNEL),
+        ]
+        audio = render_events(events, sample_rate=8000, gain=0.5)
+
+        assert np.isclose(np.abs(audio).max(), 0.5)
+
+    def test_render_length_covers_events(self):
+        """Test that the buffer covers the last note."""
+        events = [NoteEvent(1.0, 0.5, 64, 90, 0)]
+        audio = render_events(events, sample_rate=8000)
+
+        assert audio.size >= int(1.5 * 8000)
+
+
+class TestRenderMidi:
+    def test_render_midi_faster_than_real_time(self, hook_midi):
+        """Test that a 4-bar hook renders well under its duration."""
+        start = time.perf_counter()
+        audio = render_midi(hook_midi, sample_rate=22050)
+        elapsed = time.perf_counter() - start
+
+        assert audio.size > 0
+        assert elapsed < audio.size / 22050
+
+    def test_render_midi_to_wav(self, hook_midi):
+        """Test rendering straight to WAV bytes."""
+        data = render_midi_to_wav(hook_midi)
+
+        assert data[:4] == b"RIFF"
+        assert data[8:12] == b"WAVE"
+
+    def test_to_wav_bytes_length(self):
+        """Test WAV payload size matches 16-bit mono samples."""
+        data = to_wav_bytes(np.zeros(100, dtype=np.float32), 8000)
+
+        assert len(data) == 44 + 200
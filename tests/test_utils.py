@@ -1,5 +1,6 @@
 """Unit tests for shared utilities"""
 import json
+import threading
 from pathlib import Path
 
 import pytest
@@ -143,6 +144,61 @@ class TestConfig:
         config.set("test.key", "test_value")
         assert config.get("test.key") == "test_value"
 
+    def test_snapshot_is_read_only(self):
+        """Test snapshots can't be mutated and aren't affected by later writes."""
+        config = Config()
+        config.load_config("nonexistent.json")
+        snapshot = config.snapshot()
+
+        config.set("app.name", "Renamed")
+
+        with pytest.raises(TypeError):
+            snapshot["app"]["name"] = "Mutated"
+        assert snapshot["app"]["name"] == "Riff Raff Generator"
+        assert config.get("app.name") == "Renamed"
+        assert config.get("app.version") == "1.0.0"
+
+    def test_snapshot_freezes_lists(self):
+        """Test list values are stored as tuples so the snapshot can't be mutated."""
+        config = Config()
+        config.load_config("nonexistent.json")
+        config.set("app.tags", ["a", {"b": ["c"]}])
+
+        tags = config.get("app.tags")
+        assert tags == ("a", {"b": ("c",)})
+        with pytest.raises(TypeError):
+            tags[1]["b"] = []
+
+    def test_concurrent_readers_and_writers(self):
+        """Test readers never see a torn config and concurrent writers lose no update."""
+        config = Config()
+        config.load_config("nonexistent.json")
+        writers, rounds = 4, 300
+        torn = []
+
+        def write(n):
+            for i in range(rounds):
+                config.set("stress.pair", {"a": i, "b": i})  # One key, swapped as a whole
+                config.set(f"stress.writer{n}", i)
+
+        def read():
+            for _ in range(rounds * 4):
+                pair = config.get("stress.pair")
+                if pair is not None and pair["a"] != pair["b"]:
+                    torn.append(dict(pair))
+                if config.get("app.name") != "Riff Raff Generator":
+                    torn.append({"app.name": config.get("app.name")})
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert torn == []
+        assert [config.get(f"stress.writer{n}") for n in range(writers)] == [rounds - 1] * writers
+
 
 class TestUtilsEdgeCases:
     def test_save_json_error_handling(self, tmp_path):
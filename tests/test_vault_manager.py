@@ -1,10 +1,11 @@
 """Unit tests for vault manager"""
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
-from vault_manager import load_lyrics, save_lyrics
+from vault_manager import append_lyrics, delete_lyrics, export_json, export_text, load_lyrics, save_lyrics
 
 
 class TestVaultManager:
@@ -47,3 +48,51 @@ class TestVaultManager:
         # Should have second set
         loaded = load_lyrics(str(test_file))
         assert loaded == lyrics2
+
+    def test_exports(self, sample_lyrics):
+        """Test the JSON export round-trips and the text export has one block per entry."""
+        text = export_text(sample_lyrics)
+
+        assert json.loads(export_json(sample_lyrics)) == sample_lyrics
+        assert text.startswith("=== Neon Alien - Sci-Fi ===\nMode: 4-Bar Verse\nFlex: 7 | Nonsense: 5\n")
+        assert text.count("===\n") == 2
+        assert export_text([{}]) == (
+            "=== Unknown - Unknown ===\nMode: Unknown\nFlex: N/A | Nonsense: N/A\nTimestamp: Unknown\n\n\n\n"
+        )
+
+    def test_append_concurrent(self, tmp_path):
+        """Test appends from many threads all land in the vault and no temp files are left."""
+        test_file = tmp_path / "vault.json"
+        save_lyrics([{'text': 'seed'}], str(test_file))
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda i: append_lyrics({'text': str(i)}, str(test_file)), range(64)))
+
+        texts = [entry['text'] for entry in load_lyrics(str(test_file))]
+        assert sorted(texts) == sorted(['seed'] + [str(i) for i in range(64)])
+        assert not list(tmp_path.glob(".vault-*"))
+
+    def test_delete_keeps_concurrent_appends(self, tmp_path, sample_lyrics):
+        """Test deleting an entry re-reads the vault, so entries saved meanwhile survive."""
+        test_file = str(tmp_path / "vault.json")
+        save_lyrics(sample_lyrics, test_file)
+        shown = load_lyrics(test_file)  # What the session rendered
+        append_lyrics({'text': 'from another session'}, test_file)
+
+        assert delete_lyrics(shown[0], test_file) is True
+        assert delete_lyrics(shown[0], test_file) is False
+        assert load_lyrics(test_file) == [sample_lyrics[1], {'text': 'from another session'}]
+
+    def test_save_keeps_file_mode(self, tmp_path):
+        """Test a save neither narrows a new vault to 0600 nor changes an existing mode."""
+        test_file = tmp_path / "vault.json"
+        plain_file = tmp_path / "plain.json"
+        plain_file.write_text("[]")  # Gets the default mode under the current umask
+        save_lyrics([], str(test_file))
+        new_mode = test_file.stat().st_mode & 0o777
+        test_file.chmod(0o640)
+        save_lyrics([{'text': 'x'}], str(test_file))
+
+        assert new_mode == plain_file.stat().st_mode & 0o777
+        assert test_file.stat().st_mode & 0o777 == 0o640
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["plain.json", "vault.json"]
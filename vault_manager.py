@@ -1,14 +1,106 @@
 # Save/load/export lyrics/hooks
 
 import json
+import os
+import stat
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict
 
+try:
+    import fcntl
+except ImportError:  # Windows: threads in one process are still serialized
+    fcntl = None  # type: ignore[assignment]
+
+from src.metrics import timed
+from src.profiling import profiled
+
+def _existing_mode(file_path):
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return None
+
+@timed("vault.save_lyrics")
+@profiled("vault.save_lyrics")
 def save_lyrics(lyrics, file_path="data/saved_lyrics.json"):
-    with open(file_path, "w") as f:
-        json.dump(lyrics, f)
+    # Write a temp file and swap it in, so concurrent loads never see a half-written vault
+    directory = os.path.dirname(os.path.abspath(file_path))
+    tmp_path = os.path.join(directory, f".vault-{uuid.uuid4().hex}.tmp")
+    # A new vault gets open()'s default mode (0o666 less the umask); an existing one keeps its mode
+    fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+    try:
+        with os.fdopen(fd, "w") as f:
+            mode = _existing_mode(file_path)
+            if mode is not None:
+                os.chmod(tmp_path, mode)
+            json.dump(lyrics, f)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
+@timed("vault.load_lyrics")
+@profiled("vault.load_lyrics")
 def load_lyrics(file_path="data/saved_lyrics.json"):
     try:
         with open(file_path, "r") as f:
             return json.load(f)
     except FileNotFoundError:
         return []
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+@contextmanager
+def vault_lock(file_path="data/saved_lyrics.json"):
+    # Serializes read-modify-write of one vault across threads and processes
+    key = os.path.abspath(file_path)
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        # The vault itself is replaced on every save, so lock a sidecar file
+        with open(key + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def append_lyrics(entry, file_path="data/saved_lyrics.json"):
+    # Load, append and save as one step, so concurrent saves don't drop entries
+    with vault_lock(file_path):
+        lyrics = load_lyrics(file_path)
+        lyrics = lyrics if isinstance(lyrics, list) else []
+        lyrics.append(entry)
+        save_lyrics(lyrics, file_path)
+    return len(lyrics)
+
+def delete_lyrics(entry, file_path="data/saved_lyrics.json"):
+    # Re-read under the lock and drop the first entry equal to the one shown,
+    # so entries saved or deleted meanwhile by other sessions are kept
+    with vault_lock(file_path):
+        lyrics = load_lyrics(file_path)
+        if not isinstance(lyrics, list) or entry not in lyrics:
+            return False
+        lyrics.remove(entry)
+        save_lyrics(lyrics, file_path)
+    return True
+
+def export_json(lyrics):
+    return json.dumps(lyrics, indent=2)
+
+def export_text(lyrics):
+    # One block per entry: header lines, then the lyrics
+    return "".join(
+        f"=== {lyric.get('persona', 'Unknown')} - {lyric.get('theme', 'Unknown')} ===\n"
+        f"Mode: {lyric.get('mode', 'Unknown')}\n"
+        f"Flex: {lyric.get('flex_level', 'N/A')} | Nonsense: {lyric.get('nonsense', 'N/A')}\n"
+        f"Timestamp: {lyric.get('timestamp', 'Unknown')}\n\n"
+        f"{lyric.get('text', '')}\n\n"
+        for lyric in lyrics
+    )
@@ -1,43 +1,112 @@
+"""Z Cavaricci stylized hook vocal FX.
 
-import librosa
-import soundfile as sf
-from pydub import AudioSegment, effects
-import os
+Runs a recording through the in-memory HookFX chain
+(normalize -> pitch -> double -> reverb -> mix -> master) and exports the final mix
+and stems. Importing this module does no processing.
 
-# === CONFIGURATION ===
-input_path = "your_recording.m4a"
-output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
+Usage:
+    python z_cavaricci_hook_fx.py your_recording.m4a --output-dir output
+    python z_cavaricci_hook_fx.py session_takes/ --output-dir output --workers 8
+"""
+import argparse
+from pathlib import Path
+from typing import List, Optional
 
-# === STEP 1: Load + Normalize with Pydub ===
-raw = AudioSegment.from_file(input_path)
-normalized = effects.normalize(raw)
-normalized.export(f"{output_dir}/01_normalized.wav", format="wav")
+from src.utils import configure_logging
 
-# === STEP 2: Convert to 44.1kHz Mono for processing ===
-y, sr = librosa.load(f"{output_dir}/01_normalized.wav", sr=44100, mono=True)
-sf.write(f"{output_dir}/02_librosa_clean.wav", y, sr)
 
-# === STEP 3: Pitch correction (Mock-up: plug in real autotune externally)
-sf.write(f"{output_dir}/03_pitch_corrected.wav", y, sr)
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    # The FX chain (numpy, scipy) is imported here, not at module load
+    from src.fx.batch import process_batch
+    from src.fx.cache import default_cache_dir
+    from src.fx.pipeline import DOUBLER_TYPES, NORMALIZE_TYPES, REVERB_TYPES, HookFX
+    from src.fx.pitch import KEYS, SCALES
 
-# === STEP 4: Stereo doubling with pydub ===
-clean = AudioSegment.from_wav(f"{output_dir}/03_pitch_corrected.wav")
-double = clean.overlay(clean - 6, delay=20)
-double.export(f"{output_dir}/04_doubled.wav", format="wav")
+    parser = argparse.ArgumentParser(description="Z Cavaricci stylized hook vocal FX")
+    parser.add_argument("input_path", nargs="?", default="your_recording.m4a",
+                        help="Recording to process, or a folder of takes for batch mode")
+    parser.add_argument("--output-dir", default="output", help="Where to write the results")
+    parser.add_argument("--intermediates", action="store_true",
+                        help="Also write each stage's output (01_..05_ files)")
+    parser.add_argument("--no-stems", action="store_true", help="Skip dry/doubled/reverb stems")
+    parser.add_argument("--reverb", choices=REVERB_TYPES, default="echo", help="Reverb node")
+    parser.add_argument("--doubler", choices=DOUBLER_TYPES, default="slapback", help="Doubler node")
+    parser.add_argument("--ir", help="Impulse response file for --reverb convolution")
+    parser.add_argument("--key", choices=KEYS, default="C", help="Key to correct the vocal to")
+    parser.add_argument("--scale", choices=SCALES, default="chromatic", help="Scale to correct the vocal to")
+    parser.add_argument("--retune-ms", type=float, default=40.0,
+                        help="Pitch correction glide time (0 = hard-tune effect)")
+    parser.add_argument("--no-pitch", action="store_true", help="Bypass pitch correction")
+    parser.add_argument("--normalize", choices=NORMALIZE_TYPES, default="peak",
+                        help="Normalize the take by peak or by integrated loudness")
+    parser.add_argument("--target-lufs", type=float, default=-16.0,
+                        help="Loudness target for --normalize loudness")
+    parser.add_argument("--master", action="store_true",
+                        help="Master the mix: loudness to --master-lufs, true-peak limited to --ceiling")
+    parser.add_argument("--master-lufs", type=float, default=-14.0, help="Loudness of the master")
+    parser.add_argument("--ceiling", type=float, default=-1.0, help="True-peak ceiling of the master (dBTP)")
+    parser.add_argument("--multichannel", action="store_true",
+                        help="Export the mix and stems as the channels of one file")
+    parser.add_argument("--previews", action="store_true",
+                        help="Write waveform/spectrogram preview sidecars next to the mix")
+    parser.add_argument("--flac", action="store_true", help="Export FLAC instead of WAV")
+    parser.add_argument("--cache-dir", default=str(default_cache_dir()),
+                        help="Decoded-audio cache; re-running a take skips decoding (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="Always decode from scratch")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process block by block with bounded memory (WAV/FLAC/OGG input)")
+    parser.add_argument("--workers", type=int, help="Batch mode worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true",
+                        help="Batch mode: reprocess takes whose outputs are up to date")
+    args = parser.parse_args(argv)
+    configure_logging()
 
-# === STEP 5: Add basic reverb by overlaying echoes ===
-reverb = clean.overlay(clean - 12, delay=100)
-reverb = reverb.overlay(clean - 18, delay=200)
-reverb.export(f"{output_dir}/05_fx_reverb.wav", format="wav")
+    fx_options = {
+        "reverb": args.reverb,
+        "doubler": args.doubler,
+        "ir_path": args.ir,
+        "pitch_correction": not args.no_pitch,
+        "key": args.key,
+        "scale": args.scale,
+        "retune_ms": args.retune_ms,
+        "normalize": args.normalize,
+        "target_lufs": args.target_lufs,
+        "master": args.master,
+        "master_lufs": args.master_lufs,
+        "ceiling_dbtp": args.ceiling,
+        "export_layout": "multichannel" if args.multichannel else "files",
+        "export_format": "flac" if args.flac else "wav",
+        "cache_dir": None if args.no_cache else args.cache_dir,
+    }
+    if Path(args.input_path).is_dir():
+        summary = process_batch(
+            args.input_path,
+            args.output_dir,
+            workers=args.workers,
+            fx_options=fx_options,
+            stream=args.stream,
+            force=args.force,
+            previews=args.previews,
+            write_intermediates=args.intermediates,
+            export_stems=not args.no_stems,
+        )
+        print(f"✅ {summary.format()}")
+        for take, error in summary.failed:
+            print(f"❌ {take}: {error}")
+        return
 
-# === STEP 6: Final stylized mix ===
-final = double.overlay(reverb - 6)
-final.export(f"{output_dir}/Z_Cavaricci_Hook_Stylized.wav", format="wav")
+    fx = HookFX(**fx_options)
+    process = fx.process_stream if args.stream else fx.process_file
+    process(
+        args.input_path,
+        args.output_dir,
+        write_intermediates=args.intermediates,
+        export_stems=not args.no_stems,
+        previews=args.previews,
+    )
+    print("✅ Stylized vocal processed and exported to:", args.output_dir)
 
-# === Optional: Export stems ===
-clean.export(f"{output_dir}/stem_dry.wav", format="wav")
-double.export(f"{output_dir}/stem_doubled.wav", format="wav")
-reverb.export(f"{output_dir}/stem_reverb.wav", format="wav")
 
-print("✅ Stylized vocal processed and exported to:", output_dir)
+if __name__ == "__main__":
+    main()